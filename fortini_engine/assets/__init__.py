@@ -1,5 +1,15 @@
 """Assets module initialization."""
 
 from fortini_engine.assets.manager import Mesh, Material, AssetManager
+from fortini_engine.assets.optimize import (
+    compute_acmr, optimize_vertex_cache, optimize_vertex_fetch, narrow_indices,
+)
+from fortini_engine.assets.texture import (
+    TextureAtlas, AtlasRegion, MipChainFile, decode_image, generate_mipmaps, write_mip_chain, cook_texture,
+)
 
-__all__ = ["Mesh", "Material", "AssetManager"]
+__all__ = [
+    "Mesh", "Material", "AssetManager", "TextureAtlas", "AtlasRegion", "MipChainFile",
+    "decode_image", "generate_mipmaps", "write_mip_chain", "cook_texture",
+    "compute_acmr", "optimize_vertex_cache", "optimize_vertex_fetch", "narrow_indices",
+]
@@ -1,7 +1,16 @@
 """Asset management system."""
 
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from fortini_engine.assets.simplify import simplify
+from fortini_engine.assets.optimize import (
+    compute_acmr, optimize_vertex_cache, optimize_vertex_fetch, narrow_indices,
+)
+from fortini_engine.utils.logger import Logger
+
+# Projected size (fraction of screen height) below which each generated LOD
+# level is used; level k gets DEFAULT_LOD_SCREEN_SIZE * 0.5 ** (k - 1)
+DEFAULT_LOD_SCREEN_SIZE = 0.25
 
 
 class Mesh:
@@ -16,6 +25,17 @@ class Mesh:
         self.vao = None  # Vertex Array Object (OpenGL)
         self.vbo = None  # Vertex Buffer Object (OpenGL)
         self.ebo = None  # Element Buffer Object (OpenGL)
+        self.gpu_allocation = None  # Range inside the renderer's geometry arena
+
+        self._bounds = None
+        self._bounds_vertices = None  # vertices array the cached bounds belong to
+        self._optimized_indices = None  # indices array produced by the last optimize()
+
+        # Simplified versions, finest first, and the projected size (fraction of
+        # screen height) below which each one is drawn
+        self.lods: List["Mesh"] = []
+        self.lod_screen_sizes: List[float] = []
+        self._lod_thresholds = None  # (sizes tuple, array) cached by get_lod_thresholds
 
     def add_cube(self, size: float = 1.0) -> None:
         """Add a cube mesh."""
@@ -79,6 +99,8 @@ class Mesh:
 
         self.vertices = np.array(vertices, dtype=np.float32)
         self.indices = np.array(indices, dtype=np.uint32)
+        # The generated order walks whole stacks, too far apart for the vertex cache
+        self.optimize()
 
     def add_pyramid(self, size: float = 1.0) -> None:
         """Add a pyramid mesh."""
@@ -101,6 +123,110 @@ class Mesh:
             3, 4, 0,            # Left
         ], dtype=np.uint32)
 
+    def get_bounds(self) -> Tuple[np.ndarray, np.ndarray, float]:
+        """Get local-space bounds as (center, half_extents, radius).
+
+        The AABB center and half extents, plus the radius of a sphere around the
+        same center. Cached until `vertices` is replaced.
+        """
+        if self._bounds is None or self._bounds_vertices is not self.vertices:
+            vertices = self.vertices.reshape(-1, 3)
+            if len(vertices) == 0:
+                center = np.zeros(3, dtype=np.float32)
+                half_extents = np.zeros(3, dtype=np.float32)
+                radius = 0.0
+            else:
+                lo = vertices.min(axis=0)
+                hi = vertices.max(axis=0)
+                center = ((lo + hi) * 0.5).astype(np.float32)
+                half_extents = ((hi - lo) * 0.5).astype(np.float32)
+                radius = float(np.sqrt(((vertices - center) ** 2).sum(axis=1).max()))
+            self._bounds = (center, half_extents, radius)
+            self._bounds_vertices = self.vertices
+        return self._bounds
+
+    def invalidate_bounds(self) -> None:
+        """Drop cached bounds after modifying `vertices` in place."""
+        self._bounds = None
+
+    def get_lod(self, level: int) -> "Mesh":
+        """Get the mesh for an LOD level (0 = this mesh)."""
+        if level <= 0 or not self.lods:
+            return self
+        return self.lods[min(level, len(self.lods)) - 1]
+
+    def get_lod_thresholds(self) -> np.ndarray:
+        """Screen sizes of the LOD levels as an array, cached until `lods` or `lod_screen_sizes` change."""
+        sizes = tuple(self.lod_screen_sizes[:len(self.lods)])
+        if self._lod_thresholds is None or self._lod_thresholds[0] != sizes:
+            self._lod_thresholds = (sizes, np.asarray(sizes, dtype=np.float32))
+        return self._lod_thresholds[1]
+
+    def generate_lods(self, levels: int = 3, ratio: float = 0.5, max_error: float = 0.05,
+                      screen_size: float = DEFAULT_LOD_SCREEN_SIZE) -> None:
+        """Build `levels` simplified meshes by quadric-error edge collapse.
+
+        Level k keeps about `ratio ** k` of the triangles. `max_error` is the
+        largest allowed surface deviation as a fraction of the bounding radius;
+        generation stops early once a level can no longer be reduced within it.
+        """
+        self.lods = []
+        self.lod_screen_sizes = []
+        self._lod_thresholds = None
+        triangles = len(self.indices) // 3
+        radius = self.get_bounds()[2]
+        if triangles == 0 or radius == 0.0:
+            return
+
+        previous = triangles
+        for level in range(1, levels + 1):
+            target = int(triangles * ratio ** level)
+            vertices, indices, normals, uvs, _error = simplify(
+                self.vertices, self.indices, target,
+                normals=self.normals if len(self.normals) else None,
+                uvs=self.uv_coords if len(self.uv_coords) else None,
+                max_error=max_error * radius,
+            )
+            # Not worth a level unless it removes a meaningful share of triangles
+            if len(indices) // 3 > previous * (1.0 + ratio) / 2:
+                break
+            lod = Mesh(f"{self.name}_LOD{level}")
+            lod.vertices = vertices
+            lod.indices = indices
+            if normals is not None:
+                lod.normals = normals
+            if uvs is not None:
+                lod.uv_coords = uvs
+            self.lods.append(lod)
+            self.lod_screen_sizes.append(screen_size * 0.5 ** (level - 1))
+            previous = len(indices) // 3
+
+    def optimize(self) -> Tuple[float, float]:
+        """Reorder triangles and vertices for the vertex caches and narrow indices.
+
+        Triangles are ordered for post-transform cache re-use, then vertices
+        (and their normals and UVs) for fetch locality; indices become uint16
+        when the vertex count allows. LODs are optimized too. Returns the ACMR
+        before and after; a mesh already optimized is left as it is.
+        """
+        for lod in self.lods:
+            lod.optimize()
+        acmr = compute_acmr(self.indices)
+        if self._optimized_indices is self.indices or len(self.indices) < 3:
+            return acmr, acmr
+
+        vertex_count = len(self.vertices)
+        indices = optimize_vertex_cache(self.indices, vertex_count)
+        indices, order = optimize_vertex_fetch(indices, vertex_count)
+        self.vertices = self.vertices[order]
+        if len(self.normals) == vertex_count:
+            self.normals = self.normals[order]
+        if len(self.uv_coords) == vertex_count:
+            self.uv_coords = self.uv_coords[order]
+        self.indices = narrow_indices(indices, vertex_count)
+        self._optimized_indices = self.indices
+        return acmr, compute_acmr(self.indices)
+
     def calculate_normals(self) -> None:
         """Calculate vertex normals."""
         if len(self.normals) == 0:
@@ -140,7 +266,7 @@ class Material:
         self.diffuse = [0.8, 0.8, 0.8]
         self.specular = [1.0, 1.0, 1.0]
         self.shininess = 32.0
-        self.texture = None  # Texture path or ID
+        self.texture = None  # Texture, name, file path or GL id
         self.shader = None   # Shader program
 
     def __repr__(self) -> str:
@@ -157,11 +283,21 @@ class AssetManager:
             cls._instance = super(AssetManager, cls).__new__(cls)
             cls._instance._meshes: Dict[str, Mesh] = {}
             cls._instance._materials: Dict[str, Material] = {}
-            cls._instance._textures: Dict[str, int] = {}  # name -> texture ID
+            cls._instance._textures: Dict[str, Any] = {}  # name -> Texture or GL id
+            cls._instance.logger = Logger().get_logger(cls.__name__)
         return cls._instance
 
-    def register_mesh(self, name: str, mesh: Mesh) -> None:
-        """Register a mesh."""
+    def register_mesh(self, name: str, mesh: Mesh, lod_levels: int = 0, optimize: bool = True) -> None:
+        """Register a mesh, optionally generating `lod_levels` simplified LODs.
+
+        With `optimize`, the mesh and its LODs are reordered for the vertex
+        caches first (see Mesh.optimize).
+        """
+        if lod_levels > 0:
+            mesh.generate_lods(lod_levels)
+        if optimize:
+            before, after = mesh.optimize()
+            self.logger.debug(f"Mesh '{name}': ACMR {before:.3f} -> {after:.3f}")
         self._meshes[name] = mesh
 
     def get_mesh(self, name: str) -> Optional[Mesh]:
@@ -176,12 +312,12 @@ class AssetManager:
         """Get a material by name."""
         return self._materials.get(name)
 
-    def register_texture(self, name: str, texture_id: int) -> None:
-        """Register a texture."""
-        self._textures[name] = texture_id
+    def register_texture(self, name: str, texture) -> None:
+        """Register a texture (a renderer Texture or a GL id)."""
+        self._textures[name] = texture
 
-    def get_texture(self, name: str) -> Optional[int]:
-        """Get a texture ID by name."""
+    def get_texture(self, name: str):
+        """Get a texture by name."""
         return self._textures.get(name)
 
     def create_default_assets(self) -> None:
@@ -194,7 +330,7 @@ class AssetManager:
         # Default sphere mesh
         sphere_mesh = Mesh("DefaultSphere")
         sphere_mesh.add_sphere(1.0)
-        self.register_mesh("sphere", sphere_mesh)
+        self.register_mesh("sphere", sphere_mesh, lod_levels=3)
 
         # Default pyramid mesh
         pyramid_mesh = Mesh("DefaultPyramid")
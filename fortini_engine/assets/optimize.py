@@ -0,0 +1,124 @@
+"""Index and vertex order optimization for the GPU's vertex caches.
+
+`optimize_vertex_cache` reorders triangles with Tipsify (Sander, Nehab and
+Barczak 2007): it fans around one vertex at a time and picks the next fan
+vertex among those still in a simulated FIFO cache, so the post-transform
+cache re-uses shaded vertices. The algorithm is linear in the triangle count.
+`optimize_vertex_fetch` then renumbers vertices in the order the triangles
+first use them, so vertex fetch streams through memory. `narrow_indices`
+stores indices as uint16 whenever the vertex count allows it.
+
+ACMR (average cache miss ratio) is the number of vertices shaded per
+triangle under a FIFO cache: 3.0 is the worst case, about 0.5 to 0.7 is
+typical for an optimized regular mesh.
+"""
+
+from typing import Tuple
+import numpy as np
+
+# Post-transform cache size assumed when ordering triangles and measuring ACMR
+VERTEX_CACHE_SIZE = 16
+
+
+def compute_acmr(indices: np.ndarray, cache_size: int = VERTEX_CACHE_SIZE) -> float:
+    """Average vertex shader invocations per triangle under a FIFO cache of `cache_size`."""
+    flat = np.asarray(indices, dtype=np.int64).ravel()
+    triangles = len(flat) // 3
+    if triangles == 0:
+        return 0.0
+    # A vertex hits while fewer than cache_size misses happened since it was loaded
+    loaded = {}
+    misses = 0
+    for v in flat.tolist():
+        stamp = loaded.get(v)
+        if stamp is None or misses - stamp >= cache_size:
+            loaded[v] = misses
+            misses += 1
+    return misses / triangles
+
+
+def optimize_vertex_cache(indices: np.ndarray, vertex_count: int,
+                          cache_size: int = VERTEX_CACHE_SIZE) -> np.ndarray:
+    """Reorder triangles (Tipsify) for post-transform cache re-use; returns flat indices."""
+    faces = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+    triangle_count = len(faces)
+    if triangle_count == 0:
+        return np.asarray(indices, dtype=np.uint32).ravel()
+
+    # Vertex -> triangle adjacency, as CSR offsets into a triangle list
+    flat = faces.ravel()
+    live = np.bincount(flat, minlength=vertex_count)
+    offsets = np.concatenate(([0], np.cumsum(live))).tolist()
+    adjacency = (np.argsort(flat, kind="stable") // 3).tolist()
+    live = live.tolist()
+    triangles = faces.tolist()
+
+    timestamps = [-cache_size - 1] * vertex_count
+    emitted = [False] * triangle_count
+    dead_end = []
+    output = []
+    stamp = 0      # misses so far, as in compute_acmr
+    cursor = 0     # next vertex to try once the dead-end stack runs out
+    fan = int(flat[0])
+
+    while fan >= 0:
+        candidates = []
+        for t in adjacency[offsets[fan]:offsets[fan + 1]]:
+            if emitted[t]:
+                continue
+            emitted[t] = True
+            for v in triangles[t]:
+                output.append(v)
+                dead_end.append(v)
+                candidates.append(v)
+                live[v] -= 1
+                if stamp - timestamps[v] >= cache_size:
+                    timestamps[v] = stamp
+                    stamp += 1
+
+        # Next fan: the cached candidate whose remaining triangles still fit, oldest first
+        fan = -1
+        best = -1
+        for v in candidates:
+            if live[v] > 0:
+                age = stamp - timestamps[v]
+                priority = age if age + 2 * live[v] <= cache_size else 0
+                if priority > best:
+                    best = priority
+                    fan = v
+        if fan < 0:
+            while dead_end:
+                v = dead_end.pop()
+                if live[v] > 0:
+                    fan = v
+                    break
+        if fan < 0:
+            while cursor < vertex_count:
+                if live[cursor] > 0:
+                    fan = cursor
+                    break
+                cursor += 1
+
+    return np.array(output, dtype=np.uint32)
+
+
+def optimize_vertex_fetch(indices: np.ndarray, vertex_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Number vertices in first-use order; returns (indices, order) with `order` old ids by new id.
+
+    Unreferenced vertices keep their relative order after the used ones, so
+    the vertex count does not change. Apply `order` to every vertex attribute.
+    """
+    flat = np.asarray(indices, dtype=np.int64).ravel()
+    used, first = np.unique(flat, return_index=True)
+    order = used[np.argsort(first)]
+    unused = np.setdiff1d(np.arange(vertex_count), used, assume_unique=True)
+    order = np.concatenate((order, unused))
+    remap = np.empty(vertex_count, dtype=np.int64)
+    remap[order] = np.arange(vertex_count)
+    return remap[flat].astype(np.uint32), order
+
+
+def narrow_indices(indices: np.ndarray, vertex_count: int) -> np.ndarray:
+    """Indices as uint16 when every vertex is addressable with 16 bits, else uint32."""
+    dtype = np.uint16 if vertex_count <= 0x10000 else np.uint32
+    return np.asarray(indices).ravel().astype(dtype, copy=False)
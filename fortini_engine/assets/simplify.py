@@ -0,0 +1,189 @@
+"""Quadric-error mesh simplification.
+
+Garland-Heckbert edge collapse, done in vectorized passes: every pass scores
+all edges against the accumulated vertex quadrics, picks an independent set
+of cheap edges (each one the cheapest edge of both its endpoints) and
+collapses them all at once. Boundary edges get extra constraint planes so
+open borders and UV seams keep their shape.
+"""
+
+from typing import Optional, Tuple
+import numpy as np
+
+# Weight of the planes that pin boundary edges in place
+BOUNDARY_WEIGHT = 100.0
+
+# Collapse positions tried along each edge (0 = keep the first vertex)
+_PLACEMENTS = np.array([0.0, 0.5, 1.0])
+
+
+def simplify(vertices: np.ndarray, indices: np.ndarray, target_triangles: int,
+             normals: Optional[np.ndarray] = None, uvs: Optional[np.ndarray] = None,
+             max_error: float = np.inf) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray], Optional[np.ndarray], float]:
+    """Collapse edges until at most `target_triangles` triangles remain.
+
+    Collapses whose error (area-weighted RMS distance to the original surface
+    planes around the edge) would exceed `max_error` are never made, so the result can stay above the
+    target. Returns (vertices, indices, normals, uvs, error) with unused
+    vertices removed; `indices` is flat like Mesh.indices and `error` is the
+    largest error of any collapse made.
+    """
+    positions = np.asarray(vertices, dtype=np.float64).reshape(-1, 3).copy()
+    faces = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+    has_normals = normals is not None and len(normals) == len(positions)
+    has_uvs = uvs is not None and len(uvs) == len(positions)
+    normals = np.asarray(normals, dtype=np.float64).reshape(-1, 3).copy() if has_normals else None
+    uvs = np.asarray(uvs, dtype=np.float64).reshape(-1, 2).copy() if has_uvs else None
+
+    # Weld exact duplicates (e.g. sphere poles and seams without UVs) so they
+    # are not mistaken for open borders; vertices differing in any attribute stay split
+    rows = [positions] + ([normals] if has_normals else []) + ([uvs] if has_uvs else [])
+    _, first, inverse = np.unique(np.concatenate(rows, axis=1), axis=0, return_index=True, return_inverse=True)
+    faces = first[inverse.ravel()][faces]
+
+    faces = faces[_valid_faces(faces)]
+    quadrics, areas = _vertex_quadrics(positions, faces)
+    error = 0.0
+
+    vertex_count = len(positions)
+    blocked = np.zeros(0, dtype=np.int64)  # edge keys whose collapse flipped a triangle
+    while len(faces) > target_triangles:
+        keys = np.unique(_edge_keys(faces, vertex_count))
+        keys = keys[~np.isin(keys, blocked)]
+        edges = np.stack((keys // vertex_count, keys % vertex_count), axis=1)
+        cost, placement = _edge_costs(positions, quadrics, edges)
+        # Area-weighted RMS distance to the planes merged into the edge
+        cost = np.sqrt(cost / np.maximum(areas[edges[:, 0]] + areas[edges[:, 1]], 1e-30))
+        allowed = np.flatnonzero(cost <= max_error)
+        if not allowed.size:
+            break
+
+        # Each collapse removes about two triangles
+        wanted = max(1, (len(faces) - target_triangles + 1) // 2)
+        order = allowed[np.argsort(cost[allowed], kind="stable")][:wanted]
+        chosen = _independent_edges(edges, order, vertex_count)
+
+        while chosen.size:
+            keep, drop = edges[chosen, 0], edges[chosen, 1]
+            t = placement[chosen][:, None]
+            new_faces, flipped = _collapse(positions, faces, keep, drop, t)
+            if not flipped.size:
+                positions[keep] = positions[keep] * (1.0 - t) + positions[drop] * t
+                if has_normals:
+                    blended = normals[keep] * (1.0 - t) + normals[drop] * t
+                    normals[keep] = blended / np.maximum(np.linalg.norm(blended, axis=1, keepdims=True), 1e-12)
+                if has_uvs:
+                    uvs[keep] = uvs[keep] * (1.0 - t) + uvs[drop] * t
+                quadrics[keep] += quadrics[drop]
+                areas[keep] += areas[drop]
+                error = max(error, float(cost[chosen].max()))
+                faces = new_faces
+                break
+            # Skip collapses that would turn a triangle over and retry the rest
+            rejected = np.isin(keep, flipped)
+            blocked = np.concatenate([blocked, keys[chosen[rejected]]])
+            chosen = chosen[~rejected]
+
+    used, faces = np.unique(faces, return_inverse=True)
+    faces = faces.reshape(-1, 3)
+    return (
+        positions[used].astype(np.float32),
+        faces.astype(np.uint32).ravel(),
+        normals[used].astype(np.float32) if has_normals else None,
+        uvs[used].astype(np.float32) if has_uvs else None,
+        error,
+    )
+
+
+def _valid_faces(faces: np.ndarray) -> np.ndarray:
+    """Mask of triangles with three distinct vertices."""
+    return (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 2] != faces[:, 0])
+
+
+def _edge_keys(faces: np.ndarray, vertex_count: int) -> np.ndarray:
+    """Undirected edges of all triangles encoded as low * vertex_count + high."""
+    edges = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    return edges[:, 0] * vertex_count + edges[:, 1]
+
+
+def _face_normals(positions: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """Unnormalized triangle normals."""
+    v0, v1, v2 = positions[faces[:, 0]], positions[faces[:, 1]], positions[faces[:, 2]]
+    return np.cross(v1 - v0, v2 - v0)
+
+
+def _plane_quadrics(normals: np.ndarray, points: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """(N, 4, 4) quadrics of planes through `points` with unit `normals`."""
+    planes = np.concatenate([normals, -np.sum(normals * points, axis=1, keepdims=True)], axis=1)
+    return weights[:, None, None] * planes[:, :, None] * planes[:, None, :]
+
+
+def _vertex_quadrics(positions: np.ndarray, faces: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Area-weighted face-plane (and boundary-plane) quadrics and face area around every vertex."""
+    quadrics = np.zeros((len(positions), 4, 4))
+    areas = np.zeros(len(positions))
+    normals = _face_normals(positions, faces)
+    length = np.linalg.norm(normals, axis=1)
+    valid = length > 1e-12
+    unit = normals[valid] / length[valid, None]
+    face_area = 0.5 * length[valid]
+    face_q = _plane_quadrics(unit, positions[faces[valid, 0]], face_area)
+    for corner in range(3):
+        np.add.at(quadrics, faces[valid, corner], face_q)
+        np.add.at(areas, faces[valid, corner], face_area)
+
+    # Boundary edges belong to a single triangle; pin them with a plane
+    # through the edge, perpendicular to that triangle
+    directed = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    _, first, counts = np.unique(_edge_keys(faces, len(positions)), return_index=True, return_counts=True)
+    boundary = first[counts == 1]
+    boundary = boundary[valid[boundary // 3]]
+    if boundary.size:
+        a, b = positions[directed[boundary, 0]], positions[directed[boundary, 1]]
+        face_normal = normals[boundary // 3] / length[boundary // 3, None]
+        side = np.cross(b - a, face_normal)
+        side_length = np.linalg.norm(side, axis=1)
+        keep = side_length > 1e-12
+        edge_q = _plane_quadrics(
+            side[keep] / side_length[keep, None], a[keep], BOUNDARY_WEIGHT * side_length[keep] ** 2,
+        )
+        for column in range(2):
+            np.add.at(quadrics, directed[boundary[keep], column], edge_q)
+    return quadrics, areas
+
+
+def _edge_costs(positions: np.ndarray, quadrics: np.ndarray, edges: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Cheapest collapse quadric cost and its placement (0, 0.5 or 1) for every edge."""
+    q = quadrics[edges[:, 0]] + quadrics[edges[:, 1]]
+    a, b = positions[edges[:, 0]], positions[edges[:, 1]]
+    points = a[:, None, :] * (1.0 - _PLACEMENTS[None, :, None]) + b[:, None, :] * _PLACEMENTS[None, :, None]
+    homogeneous = np.concatenate([points, np.ones(points.shape[:2] + (1,))], axis=2)
+    costs = np.einsum("epi,eij,epj->ep", homogeneous, q, homogeneous)
+    best = np.argmin(costs, axis=1)
+    return np.maximum(costs[np.arange(len(edges)), best], 0.0), _PLACEMENTS[best]
+
+
+def _independent_edges(edges: np.ndarray, candidates: np.ndarray, vertex_count: int) -> np.ndarray:
+    """Candidates (cheapest first) that are the first candidate at both endpoints."""
+    rank = np.arange(len(candidates))
+    first = np.full(vertex_count, len(candidates))
+    np.minimum.at(first, edges[candidates, 0], rank)
+    np.minimum.at(first, edges[candidates, 1], rank)
+    mine = (first[edges[candidates, 0]] == rank) & (first[edges[candidates, 1]] == rank)
+    return candidates[mine]
+
+
+def _collapse(positions: np.ndarray, faces: np.ndarray, keep: np.ndarray, drop: np.ndarray, t: np.ndarray):
+    """Faces after merging `drop` into `keep`, and the keep vertices of flipped faces."""
+    remap = np.arange(len(positions))
+    remap[drop] = keep
+    moved = positions.copy()
+    moved[keep] = positions[keep] * (1.0 - t) + positions[drop] * t
+
+    new_faces = remap[faces]
+    valid = _valid_faces(new_faces)
+    before = _face_normals(positions, faces[valid])
+    after = _face_normals(moved, new_faces[valid])
+    flipped = (np.sum(before * after, axis=1) <= 0.0) & (np.sum(before * before, axis=1) > 1e-24)
+    flipped &= np.any(np.isin(new_faces[valid], keep), axis=1)
+    return new_faces[valid], np.intersect1d(new_faces[valid][flipped], keep)
@@ -0,0 +1,281 @@
+"""Texture pixel data: decoding, mipmaps, mip-chain files and atlas packing.
+
+Everything here works on NumPy RGBA8 arrays and needs no GL context, so it can
+run on worker threads. Pixel arrays are stored bottom row first, the order
+OpenGL expects, so v = 0 is the bottom of an image.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import struct
+import numpy as np
+
+# Mip-chain files (.ftex): a header, a (offset, size) table with one entry per
+# level, then raw RGBA8 levels stored coarsest first, so the small tail that
+# is always resident is one contiguous read at the start of the data
+MIP_CHAIN_SUFFIX = ".ftex"
+MIP_CHAIN_MAGIC = b"FTEX"
+MIP_CHAIN_VERSION = 1
+_HEADER = struct.Struct("<4sHHIIH")  # magic, version, flags, width, height, levels
+_LEVEL_ENTRY = struct.Struct("<QQ")  # byte offset, byte size
+
+
+def decode_image(path) -> np.ndarray:
+    """Load an image file into an (H, W, 4) uint8 RGBA array, bottom row first.
+
+    `.npy` files are read directly as pixel arrays; anything else goes
+    through pygame's image loader.
+    """
+    path = Path(path)
+    if path.suffix == ".npy":
+        return _as_rgba(np.load(path))
+
+    import pygame
+
+    surface = pygame.image.load(str(path))
+    width, height = surface.get_size()
+    data = pygame.image.tobytes(surface, "RGBA", True)
+    return np.frombuffer(data, dtype=np.uint8).reshape(height, width, 4).copy()
+
+
+def generate_mipmaps(image: np.ndarray) -> List[np.ndarray]:
+    """Return the full mip chain of an RGBA8 image, level 0 first.
+
+    Each level halves both dimensions (rounding down, minimum 1) like GL mip
+    levels, averaging 2x2 blocks of the previous one.
+    """
+    levels = [_as_rgba(image)]
+    while levels[-1].shape[0] > 1 or levels[-1].shape[1] > 1:
+        levels.append(_downsample(levels[-1]))
+    return levels
+
+
+def mip_chain_bytes(width: int, height: int, levels: int) -> int:
+    """Size in bytes of an RGBA8 mip chain with `levels` levels."""
+    total = 0
+    for level in range(levels):
+        total += max(1, width >> level) * max(1, height >> level) * 4
+    return total
+
+
+def write_mip_chain(path, levels: List[np.ndarray]) -> None:
+    """Write a full RGBA8 mip chain (level 0 first) as a mip-chain file."""
+    levels = [_as_rgba(level) for level in levels]
+    height, width = levels[0].shape[:2]
+    offset = _HEADER.size + _LEVEL_ENTRY.size * len(levels)
+    table = [None] * len(levels)
+    for level in reversed(range(len(levels))):
+        table[level] = (offset, levels[level].nbytes)
+        offset += levels[level].nbytes
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MIP_CHAIN_MAGIC, MIP_CHAIN_VERSION, 0, width, height, len(levels)))
+        for entry in table:
+            f.write(_LEVEL_ENTRY.pack(*entry))
+        for level in reversed(levels):
+            f.write(level.tobytes())
+
+
+def cook_texture(source, destination=None) -> Path:
+    """Decode an image, build its mip chain and write it next to it as a mip-chain file."""
+    source = Path(source)
+    destination = Path(destination) if destination else source.with_suffix(MIP_CHAIN_SUFFIX)
+    write_mip_chain(destination, generate_mipmaps(decode_image(source)))
+    return destination
+
+
+class MipChainFile:
+    """Reads individual levels of a mip-chain file without loading the rest."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            magic, version, _flags, width, height, levels = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != MIP_CHAIN_MAGIC or version != MIP_CHAIN_VERSION:
+                raise ValueError(f"{self.path} is not a version {MIP_CHAIN_VERSION} mip-chain file")
+            self.table = [_LEVEL_ENTRY.unpack(f.read(_LEVEL_ENTRY.size)) for _ in range(levels)]
+        self.width = width
+        self.height = height
+        self.levels = levels
+
+    def level_size(self, level: int) -> Tuple[int, int]:
+        """(width, height) of a level."""
+        return max(1, self.width >> level), max(1, self.height >> level)
+
+    def read_levels(self, first: int, last: Optional[int] = None) -> List[np.ndarray]:
+        """Read levels first..last (default: to the end of the chain), finest first."""
+        last = self.levels - 1 if last is None else last
+        result = []
+        with open(self.path, "rb") as f:
+            for level in range(first, last + 1):
+                offset, size = self.table[level]
+                f.seek(offset)
+                width, height = self.level_size(level)
+                result.append(np.frombuffer(f.read(size), dtype=np.uint8).reshape(height, width, 4))
+        return result
+
+    def __repr__(self) -> str:
+        return f"MipChainFile('{self.path}', size=({self.width}, {self.height}), levels={self.levels})"
+
+
+def _as_rgba(image: np.ndarray) -> np.ndarray:
+    """Convert a gray, RGB or RGBA array to contiguous RGBA8."""
+    image = np.asarray(image)
+    if image.dtype != np.uint8:
+        image = (np.clip(image, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+    if image.ndim == 2:
+        image = image[:, :, None]
+    channels = image.shape[2]
+    if channels == 4:
+        return np.ascontiguousarray(image)
+    rgba = np.full(image.shape[:2] + (4,), 255, dtype=np.uint8)
+    if channels == 1:
+        rgba[..., :3] = image
+    else:
+        rgba[..., :channels] = image[..., :3]
+    return rgba
+
+
+def _downsample(image: np.ndarray) -> np.ndarray:
+    """Box-filter an RGBA8 image to the next mip level size."""
+    height, width = image.shape[:2]
+    new_h, new_w = max(1, height // 2), max(1, width // 2)
+    pixels = image.astype(np.uint16)
+    # A dimension of 1 is averaged with itself; odd leftovers are dropped
+    rows = pixels[:new_h * 2] if height > 1 else np.concatenate([pixels, pixels])
+    cols = rows[:, :new_w * 2] if width > 1 else np.concatenate([rows, rows], axis=1)
+    blocks = cols.reshape(new_h, 2, new_w, 2, 4)
+    return ((blocks.sum(axis=(1, 3)) + 2) // 4).astype(np.uint8)
+
+
+class AtlasRegion:
+    """Placement of one image inside an atlas page."""
+
+    __slots__ = ("page", "x", "y", "width", "height", "uv")
+
+    def __init__(self, page: int, x: int, y: int, width: int, height: int, page_size: int):
+        self.page = page
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        # (u0, v0, u1, v1); v grows upwards like the page pixels
+        self.uv = (x / page_size, y / page_size, (x + width) / page_size, (y + height) / page_size)
+
+    def __repr__(self) -> str:
+        return f"AtlasRegion(page={self.page}, x={self.x}, y={self.y}, size=({self.width}, {self.height}))"
+
+
+class AtlasPage:
+    """One square atlas texture, packed with a skyline."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.pixels = np.zeros((size, size, 4), dtype=np.uint8)
+        self.skyline: List[Tuple[int, int, int]] = [(0, 0, size)]  # (x, y, width) segments
+        self.dirty = True
+        self.version = 0  # bumped on every change, for texture re-uploads
+        self.texture = None  # GPU texture, set by the texture manager
+
+    def find(self, width: int, height: int) -> Optional[Tuple[int, int]]:
+        """Lowest (then leftmost) position where a width x height block fits."""
+        best = None
+        for i, (x, _y, _w) in enumerate(self.skyline):
+            if x + width > self.size:
+                break
+            # The block rests on the highest segment it spans
+            top, covered, j = 0, 0, i
+            while covered < width:
+                seg_x, seg_y, seg_w = self.skyline[j]
+                top = max(top, seg_y)
+                covered = seg_x + seg_w - x
+                j += 1
+            if top + height <= self.size and (best is None or (top, x) < (best[1], best[0])):
+                best = (x, top)
+        return best
+
+    def place(self, x: int, y: int, width: int, height: int) -> None:
+        """Raise the skyline over [x, x + width) to y + height."""
+        right = x + width
+        updated = []
+        for seg_x, seg_y, seg_w in self.skyline:
+            seg_right = seg_x + seg_w
+            if seg_right <= x or seg_x >= right:
+                updated.append((seg_x, seg_y, seg_w))
+                continue
+            if seg_x < x:
+                updated.append((seg_x, seg_y, x - seg_x))
+            if seg_right > right:
+                updated.append((right, seg_y, seg_right - right))
+        updated.append((x, y + height, width))
+        updated.sort()
+
+        # Merge neighbours at the same height
+        merged = [updated[0]]
+        for seg in updated[1:]:
+            last = merged[-1]
+            if last[1] == seg[1] and last[0] + last[2] == seg[0]:
+                merged[-1] = (last[0], last[1], last[2] + seg[2])
+            else:
+                merged.append(seg)
+        self.skyline = merged
+
+
+class TextureAtlas:
+    """Packs small images (sprites, UI, glyphs) into shared square pages."""
+
+    def __init__(self, page_size: int = 1024, padding: int = 1):
+        self.page_size = page_size
+        self.padding = padding
+        self.pages: List[AtlasPage] = []
+        self.regions: Dict[str, AtlasRegion] = {}
+
+    def add(self, name: str, image: np.ndarray) -> AtlasRegion:
+        """Pack an image (bottom row first) and return its region; re-adding a name returns the old region."""
+        region = self.regions.get(name)
+        if region is not None:
+            return region
+
+        image = _as_rgba(image)
+        height, width = image.shape[:2]
+        padded_w, padded_h = width + 2 * self.padding, height + 2 * self.padding
+        if padded_w > self.page_size or padded_h > self.page_size:
+            raise ValueError(f"Image '{name}' ({width}x{height}) does not fit in a {self.page_size} atlas page")
+
+        for index, page in enumerate(self.pages):
+            spot = page.find(padded_w, padded_h)
+            if spot is not None:
+                break
+        else:
+            self.pages.append(AtlasPage(self.page_size))
+            index, page = len(self.pages) - 1, self.pages[-1]
+            spot = page.find(padded_w, padded_h)
+
+        x, y = spot
+        page.place(x, y, padded_w, padded_h)
+        px, py = x + self.padding, y + self.padding
+        page.pixels[py:py + height, px:px + width] = image
+        if self.padding:
+            # Repeat the border pixels into the padding so filtering does not bleed
+            page.pixels[py:py + height, x:px] = image[:, :1]
+            page.pixels[py:py + height, px + width:px + width + self.padding] = image[:, -1:]
+            page.pixels[y:py, x:x + padded_w] = page.pixels[py:py + 1, x:x + padded_w]
+            page.pixels[py + height:py + height + self.padding, x:x + padded_w] = page.pixels[py + height - 1:py + height, x:x + padded_w]
+        page.dirty = True
+        page.version += 1
+
+        region = AtlasRegion(index, px, py, width, height, self.page_size)
+        self.regions[name] = region
+        return region
+
+    def add_many(self, images: Dict[str, np.ndarray]) -> Dict[str, AtlasRegion]:
+        """Pack several images, tallest first for tighter pages."""
+        order = sorted(images, key=lambda name: (-np.asarray(images[name]).shape[0], name))
+        return {name: self.add(name, images[name]) for name in order}
+
+    def get(self, name: str) -> Optional[AtlasRegion]:
+        """Get the region of a packed image."""
+        return self.regions.get(name)
+
+    def __repr__(self) -> str:
+        return f"TextureAtlas(pages={len(self.pages)}, regions={len(self.regions)})"
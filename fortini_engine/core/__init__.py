@@ -1,14 +1,22 @@
 """Core engine module initialization."""
 
 from fortini_engine.core.transform import Transform
+from fortini_engine.core.transform_store import TransformStore
 from fortini_engine.core.game_object import GameObject
 from fortini_engine.core.scene import Scene
+from fortini_engine.core.light import Light
+from fortini_engine.core.particles import ParticleEmitter
+from fortini_engine.core.sprite import Sprite
 from fortini_engine.core.camera import Camera, PerspectiveCamera, OrthographicCamera
 
 __all__ = [
     "Transform",
+    "TransformStore",
     "GameObject",
     "Scene",
+    "Light",
+    "ParticleEmitter",
+    "Sprite",
     "Camera",
     "PerspectiveCamera",
     "OrthographicCamera",
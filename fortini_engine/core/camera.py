@@ -1,6 +1,6 @@
 """Camera system for 3D rendering."""
 
-import numpy as np
+import math
 from fortini_engine.core.game_object import GameObject
 from fortini_engine.utils.math_utils import Vector3, Matrix4
 
@@ -14,6 +14,9 @@ class Camera(GameObject):
         self.far_plane = 1000.0
         self.projection_matrix = None
         self.view_matrix = None
+        # Reused every frame instead of allocating new matrices
+        self._view_buffer = Matrix4()
+        self._projection_buffer = Matrix4()
 
     def get_view_matrix(self) -> Matrix4:
         """Get view matrix."""
@@ -21,7 +24,7 @@ class Camera(GameObject):
             eye = self.transform.position
             center = eye + Vector3(0, 0, -1)
             up = Vector3(0, 1, 0)
-            self.view_matrix = Matrix4.look_at(eye, center, up)
+            self.view_matrix = Matrix4.look_at(eye, center, up, out=self._view_buffer)
         return self.view_matrix
 
     def get_projection_matrix(self) -> Matrix4:
@@ -32,7 +35,7 @@ class Camera(GameObject):
         """Point camera at a target."""
         eye = self.transform.position
         up = Vector3(0, 1, 0)
-        self.view_matrix = Matrix4.look_at(eye, target, up)
+        self.view_matrix = Matrix4.look_at(eye, target, up, out=self._view_buffer)
 
     def update(self, delta_time: float) -> None:
         """Update camera."""
@@ -51,8 +54,10 @@ class PerspectiveCamera(Camera):
 
     def get_projection_matrix(self) -> Matrix4:
         """Get perspective projection matrix."""
-        fov_rad = np.radians(self.fov)
-        return Matrix4.perspective(fov_rad, self.aspect, self.near_plane, self.far_plane)
+        fov_rad = math.radians(self.fov)
+        return Matrix4.perspective(
+            fov_rad, self.aspect, self.near_plane, self.far_plane, out=self._projection_buffer
+        )
 
     def set_viewport(self, width: int, height: int) -> None:
         """Update aspect ratio based on viewport size."""
@@ -77,7 +82,8 @@ class OrthographicCamera(Camera):
     def get_projection_matrix(self) -> Matrix4:
         """Get orthographic projection matrix."""
         return Matrix4.orthographic(
-            self.left, self.right, self.bottom, self.top, self.near_plane, self.far_plane
+            self.left, self.right, self.bottom, self.top, self.near_plane, self.far_plane,
+            out=self._projection_buffer,
         )
 
     def set_size(self, width: float, height: float) -> None:
@@ -1,6 +1,8 @@
 """Core game engine module."""
 
+import time
 import pygame
+import numpy as np
 from typing import Optional, List
 from fortini_engine.core.time import Time
 from fortini_engine.core.input import Input
@@ -9,6 +11,9 @@ from fortini_engine.core.camera import PerspectiveCamera
 from fortini_engine.assets.manager import AssetManager
 from fortini_engine.utils.logger import Logger
 from fortini_engine.rendering.opengl_renderer import OpenGLRenderer
+from fortini_engine.rendering.software_renderer import SoftwareRenderer
+from fortini_engine.rendering.capture import FrameCapture
+from fortini_engine.rendering.dynamic_resolution import DynamicResolution, ResolutionController
 
 
 class GameEngine:
@@ -24,13 +29,25 @@ class GameEngine:
     def __init__(self):
         self._initialized = False
 
-    def initialize(self, width: int = 1280, height: int = 720, title: str = "Fortini Engine", create_display: bool = True, create_renderer: bool = True):
+    def initialize(self, width: int = 1280, height: int = 720, title: str = "Fortini Engine", create_display: bool = True, create_renderer: bool = True, renderer_backend: str = "opengl", offscreen: bool = False, dynamic_resolution: bool = False, target_fps: int = 60):
         """Initialize the game engine.
 
         If `create_display` is False we skip creating a pygame window (useful when the
         engine is embedded in another GUI like Qt). If `create_renderer` is False we
         defer OpenGL renderer creation until a GL context is available (e.g. in
         QOpenGLWidget.initializeGL()).
+
+        `renderer_backend` selects "opengl" or "software". The software backend
+        rasterizes on the CPU and needs no GL context, so it is created even
+        without a display (headless CI, thumbnail rendering).
+
+        With `offscreen` True, frames are rendered into an offscreen target
+        (an FBO behind a hidden GL window, or the software backend when no GL
+        context can be created) and read back through `frame_capture`.
+
+        With `dynamic_resolution` True, on-screen frames are rendered at a scale
+        chosen from recent frame times to hold `target_fps`, then upscaled
+        (see `get_frame_stats()`).
         """
         if self._initialized:
             return
@@ -40,6 +57,8 @@ class GameEngine:
         self.height = height
         self.title = title
         self.running = False
+        self.target_fps = target_fps
+        self.frame_ms = 0.0  # CPU time of the last update + render
 
         # Initialize systems
         self.logger = Logger()
@@ -52,22 +71,46 @@ class GameEngine:
 
         # Optionally initialize Pygame display
         self.renderer = None
-        if create_display:
+        self.frame_capture = None
+        self.offscreen = offscreen
+        if offscreen and renderer_backend == "opengl":
+            pygame.init()
+            try:
+                pygame.display.set_mode((width, height), pygame.OPENGL | pygame.HIDDEN)
+                create_display = True
+            except pygame.error as e:
+                self.logger.warning(f"No OpenGL context for offscreen rendering ({e}), using software backend")
+                renderer_backend = "software"
+        elif create_display and not offscreen:
             pygame.init()
             pygame.display.set_mode((width, height))
             pygame.display.set_caption(title)
 
         # Initialize renderer only if requested (and display was created)
-        if create_renderer and create_display:
+        self.renderer_backend = renderer_backend
+        if create_renderer and renderer_backend == "software":
+            self.renderer = SoftwareRenderer(width, height)
+        elif create_renderer and create_display:
+            if renderer_backend != "opengl":
+                self.logger.warning(f"Unknown renderer backend '{renderer_backend}', using OpenGL")
+                self.renderer_backend = "opengl"
             self.renderer = OpenGLRenderer(width, height)
 
+        if offscreen and self.renderer:
+            self.frame_capture = FrameCapture(self.renderer, width, height)
+
+        self.dynamic_resolution = None
+        if dynamic_resolution and self.renderer and not offscreen:
+            controller = ResolutionController(target_ms=1000.0 / target_fps)
+            self.dynamic_resolution = DynamicResolution(self.renderer, width, height, controller)
+
         # Create default scene
         self.current_scene = Scene("DefaultScene")
         Scene.set_active_scene(self.current_scene)
 
         # Create default camera
         self.main_camera = PerspectiveCamera("MainCamera", fov=45.0, aspect=width / height)
-        self.main_camera.transform.position = self.main_camera.transform.position + [0, 0, 5]
+        self.main_camera.transform.translate(0, 0, 5)
         self.current_scene.add_object(self.main_camera)
         self.current_scene.main_camera = self.main_camera
 
@@ -83,8 +126,25 @@ class GameEngine:
 
     def render(self) -> None:
         """Render current scene."""
-        if self.renderer and self.current_scene:
-            self.renderer.render(self.current_scene, self.main_camera)
+        if self.frame_capture and self.offscreen and self.current_scene:
+            # Frames are collected with frame_capture.poll() / collect()
+            self.frame_capture.submit(self.current_scene, [self.main_camera])
+        elif self.renderer and self.current_scene:
+            source = self.dynamic_resolution or self.renderer
+            source.render(self.current_scene, self.main_camera)
+            if self.renderer_backend == "software" and pygame.display.get_surface() is not None:
+                # Present the CPU-rendered frame in the pygame window
+                image = source.get_image()
+                pygame.surfarray.blit_array(pygame.display.get_surface(), image[..., :3].swapaxes(0, 1))
+                pygame.display.flip()
+
+    def capture_views(self, cameras: List, scene: Optional[Scene] = None) -> List[np.ndarray]:
+        """Render several camera views offscreen and return their RGBA images."""
+        if self.frame_capture is None:
+            if self.renderer is None:
+                raise RuntimeError("capture_views() requires a renderer")
+            self.frame_capture = FrameCapture(self.renderer, self.width, self.height)
+        return self.frame_capture.capture(scene or self.current_scene, cameras)
 
     def run(self) -> None:
         """Start the main game loop."""
@@ -99,16 +159,27 @@ class GameEngine:
                 if event.type == pygame.QUIT:
                     self.running = False
 
+            start = time.perf_counter()
             self.update()
             self.render()
+            self.frame_ms = (time.perf_counter() - start) * 1000.0
+            if self.dynamic_resolution:
+                # Used to pick the next frame's scale
+                self.dynamic_resolution.record_cpu_time(self.frame_ms)
 
-            clock.tick(60)  # 60 FPS
+            clock.tick(self.target_fps)
 
         self.shutdown()
 
     def shutdown(self) -> None:
         """Shutdown the engine."""
         self.logger.info("Shutting down engine")
+        if self.frame_capture:
+            self.frame_capture.release()
+            self.frame_capture = None
+        if self.dynamic_resolution:
+            self.dynamic_resolution.release()
+            self.dynamic_resolution = None
         if self.renderer:
             self.renderer.cleanup()
         pygame.quit()
@@ -124,5 +195,16 @@ class GameEngine:
         """Get current FPS."""
         return self.time.fps
 
+    def get_resolution_scale(self) -> float:
+        """Get the fraction of the window size frames are rendered at."""
+        return self.dynamic_resolution.scale if self.dynamic_resolution else 1.0
+
+    def get_frame_stats(self) -> dict:
+        """Get frame-time and resolution-scaling statistics."""
+        stats = {"fps": self.time.fps, "frame_ms": self.frame_ms, "target_ms": 1000.0 / self.target_fps, "scale": 1.0}
+        if self.dynamic_resolution:
+            stats.update(self.dynamic_resolution.stats())
+        return stats
+
     def __repr__(self) -> str:
         return f"GameEngine(title='{self.title}', resolution={self.width}x{self.height})"
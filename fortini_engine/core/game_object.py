@@ -30,6 +30,16 @@ class GameObject:
         # Script component
         self.script = None
 
+        # Static objects never move after load and are merged into static batches
+        self.static = False
+        self.static_dirty = False
+
+        # Occluders are rasterized into the CPU occlusion buffer to hide objects behind them
+        self.occluder = False
+
+        # Mesh LOD level last drawn (managed by the renderer's LOD selection)
+        self.lod_level = 0
+
     def add_component(self, name: str, component: Any) -> None:
         """Add a component to the object."""
         self.components[name] = component
@@ -52,6 +62,10 @@ class GameObject:
             child.parent = None
             self.transform.remove_child(child.transform)
 
+    def mark_static_dirty(self) -> None:
+        """Request a rebuild of this object's static batch (after moving it or changing its mesh)."""
+        self.static_dirty = True
+
     def set_active(self, active: bool) -> None:
         """Set object active state."""
         self.active = active
@@ -93,6 +107,8 @@ class GameObject:
             "scale": self.transform.scale.to_tuple(),
             "mesh": self.mesh,
             "material": self.material,
+            "static": self.static,
+            "occluder": self.occluder,
         }
 
     @staticmethod
@@ -101,6 +117,8 @@ class GameObject:
         obj = GameObject(name=data.get("name", "GameObject"))
         obj.id = data.get("id", obj.id)
         obj.active = data.get("active", True)
+        obj.static = data.get("static", False)
+        obj.occluder = data.get("occluder", False)
 
         pos = data.get("position", (0, 0, 0))
         obj.transform.set_position(*pos)
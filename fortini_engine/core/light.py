@@ -0,0 +1,20 @@
+"""Light component."""
+
+from typing import Tuple
+
+
+class Light:
+    """Point light attached to a GameObject.
+
+    Add it with `obj.add_component("light", Light(...))`; the light sits at the
+    object's world position. A `range` of 0 means no distance falloff.
+    """
+
+    def __init__(self, color: Tuple[float, float, float] = (1.0, 1.0, 1.0), intensity: float = 1.0, range: float = 0.0):
+        self.color = tuple(color)
+        self.intensity = intensity
+        self.range = range
+        self.enabled = True
+
+    def __repr__(self) -> str:
+        return f"Light(color={self.color}, intensity={self.intensity}, range={self.range})"
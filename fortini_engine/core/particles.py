@@ -0,0 +1,151 @@
+"""Particle emitter component."""
+
+from typing import Optional, Tuple
+import numpy as np
+from fortini_engine.utils.color import to_rgba
+
+
+class ParticleEmitter:
+    """Emits and simulates particles attached to a GameObject.
+
+    Add it with `obj.add_component("particles", ParticleEmitter(...))`; the
+    scene updates it every frame and particles spawn at the object's world
+    position. Particle state is a structure of preallocated arrays of
+    `capacity` rows whose first `count` rows are alive, so spawning,
+    integration and killing are vectorized over all particles at once. Dead
+    particles are replaced by live ones from the end of the arrays
+    (swap-remove), which keeps the live rows packed without preserving order.
+
+    Particles are simulated in world space and drawn as camera-facing quads,
+    one instanced draw per emitter (see rendering.particle_renderer).
+    """
+
+    def __init__(self, capacity: int = 1000, rate: float = 100.0, lifetime: Tuple[float, float] = (1.0, 2.0),
+                 speed: Tuple[float, float] = (1.0, 2.0), direction: Tuple[float, float, float] = (0.0, 1.0, 0.0),
+                 spread: float = 0.3, gravity: Tuple[float, float, float] = (0.0, -9.81, 0.0), drag: float = 0.0,
+                 start_color: Tuple[float, ...] = (1.0, 1.0, 1.0, 1.0), end_color: Tuple[float, ...] = (1.0, 1.0, 1.0, 0.0),
+                 start_size: float = 0.1, end_size: float = 0.1, additive: bool = True, texture=None,
+                 seed: Optional[int] = None):
+        self.capacity = capacity
+        self.rate = rate              # particles per second; 0 for bursts only
+        self.lifetime = lifetime      # (min, max) seconds
+        self.speed = speed            # (min, max) initial speed
+        self.direction = np.asarray(direction, dtype=np.float32)
+        self.spread = spread          # random offset added to the unit direction
+        self.gravity = np.asarray(gravity, dtype=np.float32)
+        self.drag = drag              # fraction of velocity lost per second
+        self.start_color = np.asarray(to_rgba(start_color), dtype=np.float32)
+        self.end_color = np.asarray(to_rgba(end_color), dtype=np.float32)
+        self.start_size = start_size
+        self.end_size = end_size
+        self.additive = additive      # additive blending; otherwise alpha blending
+        self.texture = texture        # Texture, name, file path or GL id; None for a soft disc
+        self.enabled = True
+
+        self.positions = np.zeros((capacity, 3), dtype=np.float32)
+        self.velocities = np.zeros((capacity, 3), dtype=np.float32)
+        self.ages = np.zeros(capacity, dtype=np.float32)
+        self.lifetimes = np.ones(capacity, dtype=np.float32)
+        self.colors = np.zeros((capacity, 4), dtype=np.float32)
+        self.sizes = np.zeros(capacity, dtype=np.float32)
+        self.count = 0
+
+        self.origin = np.zeros(3, dtype=np.float32)
+        self.bounds_min = np.zeros(3, dtype=np.float32)
+        self.bounds_max = np.zeros(3, dtype=np.float32)
+        self._pending = 0.0  # fractional particles carried to the next frame
+        self._rng = np.random.default_rng(seed)
+
+    def emit(self, count: int) -> int:
+        """Spawn up to `count` particles at the origin; returns how many fit."""
+        start = self.count
+        count = min(int(count), self.capacity - start)
+        if count <= 0:
+            return 0
+        end = start + count
+        rng = self._rng
+
+        directions = self.direction + rng.uniform(-self.spread, self.spread, (count, 3)).astype(np.float32)
+        lengths = np.linalg.norm(directions, axis=1, keepdims=True)
+        directions /= np.where(lengths > 1e-6, lengths, 1.0)
+        speeds = rng.uniform(self.speed[0], self.speed[1], (count, 1)).astype(np.float32)
+
+        self.positions[start:end] = self.origin
+        self.velocities[start:end] = directions * speeds
+        self.ages[start:end] = 0.0
+        self.lifetimes[start:end] = rng.uniform(self.lifetime[0], self.lifetime[1], count)
+        self.colors[start:end] = self.start_color
+        self.sizes[start:end] = self.start_size
+        self.count = end
+        return count
+
+    def update(self, delta_time: float, origin=None) -> None:
+        """Advance the simulation: kill expired particles, integrate, then spawn."""
+        if origin is not None:
+            self.origin[:] = origin
+        if not self.enabled:
+            return
+
+        n = self.count
+        self.ages[:n] += delta_time
+        self._kill(self.ages[:n] >= self.lifetimes[:n])
+
+        n = self.count
+        velocities = self.velocities[:n]
+        velocities += self.gravity * delta_time
+        if self.drag > 0.0:
+            velocities *= max(0.0, 1.0 - self.drag * delta_time)
+        self.positions[:n] += velocities * delta_time
+
+        # Color and size follow the normalized age
+        t = (self.ages[:n] / self.lifetimes[:n])[:, None]
+        self.colors[:n] = self.start_color + (self.end_color - self.start_color) * t
+        self.sizes[:n] = self.start_size + (self.end_size - self.start_size) * t[:, 0]
+
+        self._pending += self.rate * delta_time
+        spawn = int(self._pending)
+        self._pending -= spawn
+        self.emit(spawn)
+        self._update_bounds()
+
+    def clear(self) -> None:
+        """Kill every particle."""
+        self.count = 0
+        self._pending = 0.0
+        self._update_bounds()
+
+    def pack(self, out: np.ndarray) -> np.ndarray:
+        """Write live particles as (x, y, z, size, r, g, b, a) rows into `out`; returns the filled part."""
+        n = self.count
+        rows = out[:n]
+        rows[:, :3] = self.positions[:n]
+        rows[:, 3] = self.sizes[:n]
+        rows[:, 4:] = self.colors[:n]
+        return rows
+
+    def _kill(self, dead: np.ndarray) -> None:
+        """Remove particles flagged in `dead` (a mask over the live rows) by swap-remove."""
+        n = self.count
+        alive = n - int(np.count_nonzero(dead))
+        if alive == n:
+            return
+        # Dead rows below the new count are refilled with the live rows above it
+        holes = np.flatnonzero(dead[:alive])
+        movers = alive + np.flatnonzero(~dead[alive:])
+        for array in (self.positions, self.velocities, self.ages, self.lifetimes, self.colors, self.sizes):
+            array[holes] = array[movers]
+        self.count = alive
+
+    def _update_bounds(self) -> None:
+        """World-space box around live particles, padded by their size, for culling."""
+        n = self.count
+        if n == 0:
+            self.bounds_min[:] = self.origin
+            self.bounds_max[:] = self.origin
+            return
+        pad = float(self.sizes[:n].max()) * 0.5
+        self.bounds_min[:] = self.positions[:n].min(axis=0) - pad
+        self.bounds_max[:] = self.positions[:n].max(axis=0) + pad
+
+    def __repr__(self) -> str:
+        return f"ParticleEmitter(count={self.count}, capacity={self.capacity}, rate={self.rate})"
@@ -1,7 +1,9 @@
 """Scene management system."""
 
 from typing import Dict, List, Optional, Any
+import numpy as np
 from fortini_engine.core.game_object import GameObject
+from fortini_engine.core.transform_store import TransformStore
 from fortini_engine.utils.logger import Logger
 
 
@@ -16,6 +18,7 @@ class Scene:
         self.root_objects: List[GameObject] = []
         self._object_dict: Dict[int, GameObject] = {}
         self.main_camera: Optional[GameObject] = None
+        self.transforms = TransformStore()
 
         self.logger = Logger().get_logger(self.__class__.__name__)
 
@@ -34,6 +37,7 @@ class Scene:
         if obj.id not in self._object_dict:
             self.objects.append(obj)
             self._object_dict[obj.id] = obj
+            obj.transform.bind(self.transforms)
 
             if parent is None:
                 if obj not in self.root_objects:
@@ -44,16 +48,25 @@ class Scene:
             self.logger.info(f"Added object '{obj.name}' (ID: {obj.id}) to scene '{self.name}'")
 
     def remove_object(self, obj: GameObject) -> None:
-        """Remove a game object from the scene."""
+        """Remove a game object, and its descendants with it, from the scene."""
         if obj.id in self._object_dict:
-            self.objects.remove(obj)
-            del self._object_dict[obj.id]
-
             if obj in self.root_objects:
                 self.root_objects.remove(obj)
             elif obj.parent:
                 obj.parent.remove_child(obj)
 
+            # Descendants leave too: their transforms move out of self.transforms
+            # along with obj's, and the batched passes only cover this store
+            for member in [obj] + obj.get_all_children():
+                if member.id in self._object_dict:
+                    self.objects.remove(member)
+                    del self._object_dict[member.id]
+                    if member in self.root_objects:
+                        self.root_objects.remove(member)
+
+            if obj.transform.parent is None:
+                obj.transform.bind(TransformStore.default())
+
             self.logger.info(f"Removed object '{obj.name}' (ID: {obj.id}) from scene '{self.name}'")
 
     def find_object(self, name: str) -> Optional[GameObject]:
@@ -71,12 +84,61 @@ class Scene:
         """Get all objects in the scene."""
         return self.objects.copy()
 
+    def get_lights(self) -> List[GameObject]:
+        """Get active objects carrying an enabled "light" component."""
+        lights = []
+        for obj in self.objects:
+            light = obj.components.get("light")
+            if obj.active and light is not None and light.enabled:
+                lights.append(obj)
+        return lights
+
+    def get_sprites(self) -> List[GameObject]:
+        """Get active objects carrying an enabled "sprite" component."""
+        sprites = []
+        for obj in self.objects:
+            sprite = obj.components.get("sprite")
+            if obj.active and sprite is not None and sprite.enabled:
+                sprites.append(obj)
+        return sprites
+
+    def get_particle_emitters(self) -> List[GameObject]:
+        """Get active objects carrying an enabled "particles" component."""
+        emitters = []
+        for obj in self.objects:
+            emitter = obj.components.get("particles")
+            if obj.active and emitter is not None and emitter.enabled:
+                emitters.append(obj)
+        return emitters
+
     def update(self, delta_time: float) -> None:
-        """Update all root objects in the scene."""
+        """Update all root objects in the scene, then simulate particle emitters."""
         for obj in self.root_objects:
             if obj.active:
                 obj.update(delta_time)
 
+        emitters = self.get_particle_emitters()
+        if emitters:
+            # Spawn at the emitters' world positions after scripts have moved them
+            world = self.gather_world_matrices(emitters)
+            for obj, origin in zip(emitters, world[:, :3, 3]):
+                obj.components["particles"].update(delta_time, origin)
+
+    def update_transforms(self) -> None:
+        """Recompute all dirty world matrices in one batched pass."""
+        self.transforms.update()
+
+    def gather_world_matrices(self, objects: List[GameObject]) -> np.ndarray:
+        """Collect the world matrices of `objects` into an (N, 4, 4) array."""
+        self.transforms.update()
+        if all(obj.transform.store is self.transforms for obj in objects):
+            indices = np.fromiter((obj.transform.index for obj in objects), dtype=np.intp, count=len(objects))
+            return self.transforms.world_matrices[indices]
+        matrices = np.empty((len(objects), 4, 4), dtype=np.float32)
+        for i, obj in enumerate(objects):
+            matrices[i] = obj.transform.world_matrix
+        return matrices
+
     def get_hierarchy(self) -> List[Dict[str, Any]]:
         """Get scene hierarchy as a list of dictionaries."""
         hierarchy = []
@@ -0,0 +1,54 @@
+"""Sprite component."""
+
+from itertools import count
+from typing import Tuple
+from fortini_engine.utils.color import to_rgba
+
+# Source of Sprite.revision values, shared so a replaced sprite never repeats one
+_revisions = count(1)
+
+
+class Sprite:
+    """Textured 2D quad drawn by the renderer's sprite batch.
+
+    Add it with `obj.add_component("sprite", Sprite(...))` to an object without
+    a mesh. The quad is `size` units wide and tall, centered on the object and
+    placed by its transform (position, z rotation and scale). Sprites are drawn
+    after the 3D scene in increasing `layer` order, without depth testing.
+
+    `texture` is anything a material accepts (Texture, name, file path or GL
+    id), or None for a plain colored quad. Passing an `atlas` and a `region`
+    (name or AtlasRegion) samples that region of the atlas instead.
+
+    Every attribute assignment bumps `revision`, so the batch only re-reads
+    sprites that changed since the last frame.
+    """
+
+    def __init__(self, texture=None, size: Tuple[float, float] = (1.0, 1.0),
+                 color: Tuple[float, ...] = (1.0, 1.0, 1.0, 1.0), layer: int = 0,
+                 uv: Tuple[float, float, float, float] = (0.0, 0.0, 1.0, 1.0), atlas=None, region=None):
+        self.texture = texture
+        self.size = tuple(size)
+        self.color = to_rgba(color)
+        self.layer = layer
+        self.uv = tuple(uv)  # (u0, v0, u1, v1)
+        self.atlas = None
+        self.region = None
+        self.enabled = True
+        if atlas is not None and region is not None:
+            self.set_region(atlas, region)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, "revision", next(_revisions))
+
+    def set_region(self, atlas, region) -> None:
+        """Sample a region (name or AtlasRegion) of a TextureAtlas."""
+        if isinstance(region, str):
+            region = atlas.regions[region]
+        self.atlas = atlas
+        self.region = region
+        self.uv = region.uv
+
+    def __repr__(self) -> str:
+        return f"Sprite(texture={self.texture!r}, size={self.size}, layer={self.layer})"
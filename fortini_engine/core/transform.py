@@ -1,100 +1,225 @@
 """Transform component for 3D objects."""
 
 import numpy as np
+from typing import Optional
+from fortini_engine.core.transform_store import TransformStore
 from fortini_engine.utils.math_utils import Vector3, Matrix4, Quaternion
 
 
+def _component(axis: int) -> property:
+    """Property reading and writing one component of a store row."""
+    def get(self) -> float:
+        return float(self._row()[axis])
+
+    def set(self, value: float) -> None:
+        self._row()[axis] = value
+        self._transform._mark_dirty()
+
+    return property(get, set)
+
+
+class _Vector3View(Vector3):
+    """Vector3 backed by a row of a transform's store; writes mark it dirty."""
+
+    __slots__ = ("_transform", "_field")
+
+    def __init__(self, transform: "Transform", field: str):
+        self._transform = transform
+        self._field = field
+
+    def _row(self) -> np.ndarray:
+        return getattr(self._transform.store, self._field)[self._transform.index]
+
+    x = _component(0)
+    y = _component(1)
+    z = _component(2)
+
+
+class _QuaternionView(Quaternion):
+    """Quaternion backed by a transform's store rotation; writes mark it dirty."""
+
+    __slots__ = ("_transform",)
+
+    def __init__(self, transform: "Transform"):
+        self._transform = transform
+
+    def _row(self) -> np.ndarray:
+        return self._transform.store.rotations[self._transform.index]
+
+    x = _component(0)
+    y = _component(1)
+    z = _component(2)
+    w = _component(3)
+
+
 class Transform:
-    """Transform component for position, rotation, and scale."""
+    """Transform component for position, rotation, and scale.
+
+    The values live in a slot of a `TransformStore`; this object is a thin view
+    over that slot. Transforms start in the shared default store and move into a
+    scene's store when their object is added to the scene.
+
+    `position`, `rotation` and `scale` return live views of the slot, so
+    `transform.position.x = 1.0` writes through and marks the transform dirty.
+    Copy the components (e.g. `to_tuple()`) to keep a snapshot.
+    """
 
-    def __init__(self, parent=None):
-        self.position = Vector3(0, 0, 0)
-        self.rotation = Quaternion(0, 0, 0, 1)  # w, x, y, z order
-        self.scale = Vector3(1, 1, 1)
+    def __init__(self, parent=None, store: Optional[TransformStore] = None):
+        self._store = store if store is not None else TransformStore.default()
+        self._index = self._store.allocate()
 
-        self.parent = parent
+        self.parent: Optional["Transform"] = None
         self.children = []
 
-        self._matrix_cache = None
-        self._matrix_dirty = True
-        self._inverse_matrix_cache = None
+        if parent is not None:
+            # Accept either a Transform or a GameObject as parent
+            getattr(parent, "transform", parent).add_child(self)
+
+    @property
+    def store(self) -> TransformStore:
+        """Store holding this transform's data."""
+        return self._store
+
+    @property
+    def index(self) -> int:
+        """Slot index inside the store."""
+        return self._index
+
+    @property
+    def position(self) -> Vector3:
+        return _Vector3View(self, "positions")
+
+    @position.setter
+    def position(self, value) -> None:
+        self._store.positions[self._index] = tuple(value.to_tuple() if isinstance(value, Vector3) else value)
+        self._mark_dirty()
+
+    @property
+    def rotation(self) -> Quaternion:
+        return _QuaternionView(self)
+
+    @rotation.setter
+    def rotation(self, value: Quaternion) -> None:
+        self._store.rotations[self._index] = (value.x, value.y, value.z, value.w)
+        self._mark_dirty()
+
+    @property
+    def scale(self) -> Vector3:
+        return _Vector3View(self, "scales")
+
+    @scale.setter
+    def scale(self, value) -> None:
+        self._store.scales[self._index] = tuple(value.to_tuple() if isinstance(value, Vector3) else value)
+        self._mark_dirty()
+
+    @property
+    def position_array(self) -> np.ndarray:
+        """Position as a view into the store (no Vector3 allocation)."""
+        return self._store.positions[self._index]
+
+    @property
+    def scale_array(self) -> np.ndarray:
+        """Scale as a view into the store (no Vector3 allocation)."""
+        return self._store.scales[self._index]
 
     def translate(self, x: float, y: float, z: float) -> None:
         """Translate the object."""
-        self.position = Vector3(
-            self.position.x + x,
-            self.position.y + y,
-            self.position.z + z,
-        )
+        self._store.positions[self._index] += (x, y, z)
         self._mark_dirty()
 
     def rotate(self, pitch: float, yaw: float, roll: float) -> None:
         """Rotate the object (in radians)."""
         self.rotation = Quaternion.from_euler_angles(pitch, yaw, roll)
-        self._mark_dirty()
 
     def set_position(self, x: float, y: float, z: float) -> None:
         """Set absolute position."""
-        self.position = Vector3(x, y, z)
+        self._store.positions[self._index] = (x, y, z)
         self._mark_dirty()
 
     def set_rotation(self, pitch: float, yaw: float, roll: float) -> None:
         """Set absolute rotation (in radians)."""
         self.rotation = Quaternion.from_euler_angles(pitch, yaw, roll)
-        self._mark_dirty()
 
     def set_scale(self, x: float, y: float, z: float) -> None:
         """Set absolute scale."""
-        self.scale = Vector3(x, y, z)
+        self._store.scales[self._index] = (x, y, z)
         self._mark_dirty()
 
-    def get_matrix(self) -> Matrix4:
-        """Get the transformation matrix."""
-        if self._matrix_dirty:
-            self._recalculate_matrix()
-        return self._matrix_cache
-
-    def _recalculate_matrix(self) -> None:
-        """Recalculate the transformation matrix."""
-        # T * R * S (translation * rotation * scale)
-        translation_mat = Matrix4.translation(
-            self.position.x, self.position.y, self.position.z
-        )
+    @property
+    def world_matrix(self) -> np.ndarray:
+        """World matrix as a view into the store's buffer (no copy)."""
+        self._store.update()
+        return self._store.world_matrices[self._index]
 
-        # Simple rotation using quaternion (simplified for now)
-        # In production, use proper quaternion to matrix conversion
-        rotation_mat = Matrix4.identity()
+    @property
+    def inverse_world_matrix(self) -> np.ndarray:
+        """Inverse world matrix as a view into the store's buffer."""
+        self._store.update()
+        return self._store.world_inverse_matrices[self._index]
 
-        scale_mat = Matrix4.scale(self.scale.x, self.scale.y, self.scale.z)
+    @property
+    def normal_matrix(self) -> np.ndarray:
+        """3x3 normal matrix, transpose(inverse(world)), as a view."""
+        return self.inverse_world_matrix[:3, :3].T
 
-        self._matrix_cache = translation_mat * rotation_mat * scale_mat
-
-        if self.parent:
-            parent_matrix = self.parent.transform.get_matrix()
-            self._matrix_cache = parent_matrix * self._matrix_cache
-
-        self._matrix_dirty = False
+    def get_matrix(self) -> Matrix4:
+        """Get the transformation matrix (shares the store buffer; copy() to keep it)."""
+        return Matrix4(self.world_matrix)
 
     def _mark_dirty(self) -> None:
         """Mark matrix as needing recalculation."""
-        self._matrix_dirty = True
-        # Propagate to children
+        # Children are picked up by the store's update pass
+        self._store.mark_dirty(self._index)
+
+    def bind(self, store: TransformStore) -> None:
+        """Move this transform's whole hierarchy into another store."""
+        if store is self._store:
+            return
+
+        if self.parent is not None and self.parent._store is not store:
+            # A hierarchy lives in one store, so move it from its root
+            root = self.parent
+            while root.parent is not None:
+                root = root.parent
+            root.bind(store)
+            return
+
+        index = store.allocate()
+        store.copy_local(self._store, self._index, index)
+        self._store.free(self._index)
+        self._store = store
+        self._index = index
+
+        if self.parent is not None:
+            store.set_parent(index, self.parent._index)
+
         for child in self.children:
-            child._mark_dirty()
+            child.bind(store)
 
     def add_child(self, child_transform: "Transform") -> None:
         """Add a child transform."""
         if child_transform not in self.children:
+            if child_transform.parent is not None:
+                child_transform.parent.remove_child(child_transform)
             self.children.append(child_transform)
             child_transform.parent = self
-            child_transform._mark_dirty()
+            if child_transform._store is not self._store:
+                child_transform.bind(self._store)
+            else:
+                self._store.set_parent(child_transform._index, self._index)
 
     def remove_child(self, child_transform: "Transform") -> None:
         """Remove a child transform."""
         if child_transform in self.children:
             self.children.remove(child_transform)
             child_transform.parent = None
-            child_transform._mark_dirty()
+            self._store.set_parent(child_transform._index, -1)
+
+    def __del__(self):
+        try:
+            self._store.free(self._index)
+        except Exception:
+            pass
 
     def __repr__(self) -> str:
         return f"Transform(pos={self.position}, rot={self.rotation}, scale={self.scale})"
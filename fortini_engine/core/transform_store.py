@@ -0,0 +1,226 @@
+"""Contiguous storage for scene transforms.
+
+Local position/rotation/scale live in float32 NumPy arrays with a parent-index
+column. World matrices for every dirty node are computed in one batched pass per
+frame, walking the hierarchy level by level so parents are always resolved before
+their children.
+"""
+
+from typing import List, Optional
+import numpy as np
+from fortini_engine.utils.math_utils import Vector3Array, QuaternionArray, compose_trs
+
+
+class TransformStore:
+    """Structure-of-arrays storage for a hierarchy of transforms."""
+
+    _default = None
+
+    def __init__(self, capacity: int = 64):
+        capacity = max(1, capacity)
+        self.positions = np.zeros((capacity, 3), dtype=np.float32)
+        self.rotations = np.zeros((capacity, 4), dtype=np.float32)  # x, y, z, w
+        self.rotations[:, 3] = 1.0
+        self.scales = np.ones((capacity, 3), dtype=np.float32)
+        self.parents = np.full(capacity, -1, dtype=np.int32)
+        self.local_matrices = np.zeros((capacity, 4, 4), dtype=np.float32)
+        self.world_matrices = np.zeros((capacity, 4, 4), dtype=np.float32)
+        self.local_inverse_matrices = np.zeros((capacity, 4, 4), dtype=np.float32)
+        self.world_inverse_matrices = np.zeros((capacity, 4, 4), dtype=np.float32)
+        self.dirty = np.zeros(capacity, dtype=bool)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        self._count = 0  # high-water mark of allocated slots
+        self._free: List[int] = []
+        self._levels: Optional[List[np.ndarray]] = None
+        self._needs_update = False
+
+    @classmethod
+    def default(cls) -> "TransformStore":
+        """Store used by transforms that are not part of any scene."""
+        if cls._default is None:
+            cls._default = TransformStore()
+        return cls._default
+
+    @property
+    def capacity(self) -> int:
+        """Number of slots currently allocated in the arrays."""
+        return len(self.parents)
+
+    def __len__(self) -> int:
+        return self._count - len(self._free)
+
+    def allocate(self) -> int:
+        """Reserve a slot initialised to the identity transform."""
+        if self._free:
+            index = self._free.pop()
+        else:
+            if self._count == self.capacity:
+                self._grow(self.capacity * 2)
+            index = self._count
+            self._count += 1
+
+        self.positions[index] = 0.0
+        self.rotations[index] = (0.0, 0.0, 0.0, 1.0)
+        self.scales[index] = 1.0
+        self.parents[index] = -1
+        self.alive[index] = True
+        self.mark_dirty(index)
+        self._levels = None
+        return index
+
+    def free(self, index: int) -> None:
+        """Release a slot so it can be reused."""
+        if not self.alive[index]:
+            return
+        self.alive[index] = False
+        self.dirty[index] = False
+        self.parents[index] = -1
+        self._free.append(index)
+        self._levels = None
+
+    def set_parent(self, index: int, parent_index: int) -> None:
+        """Re-parent a slot (-1 for a root)."""
+        self.parents[index] = parent_index
+        self._levels = None
+        self.mark_dirty(index)
+
+    def copy_local(self, source: "TransformStore", source_index: int, index: int) -> None:
+        """Copy local TRS values from a slot of another store."""
+        self.positions[index] = source.positions[source_index]
+        self.rotations[index] = source.rotations[source_index]
+        self.scales[index] = source.scales[source_index]
+        self.mark_dirty(index)
+
+    def mark_dirty(self, index) -> None:
+        """Flag a slot (or an array of slots) whose local values changed."""
+        self.dirty[index] = True
+        self._needs_update = True
+
+    def position_array(self) -> Vector3Array:
+        """Positions of all slots as a Vector3Array view (writes are not tracked)."""
+        return Vector3Array(self.positions[:self._count])
+
+    def rotation_array(self) -> QuaternionArray:
+        """Rotations of all slots as a QuaternionArray view (writes are not tracked)."""
+        return QuaternionArray(self.rotations[:self._count])
+
+    def scale_array(self) -> Vector3Array:
+        """Scales of all slots as a Vector3Array view (writes are not tracked)."""
+        return Vector3Array(self.scales[:self._count])
+
+    def translate(self, indices, offsets) -> None:
+        """Translate many slots at once by per-slot or shared offsets."""
+        indices = np.asarray(indices, dtype=np.intp)
+        self.positions[indices] += np.asarray(offsets, dtype=np.float32)
+        self.mark_dirty(indices)
+
+    def set_positions(self, indices, positions) -> None:
+        """Set positions of many slots at once."""
+        indices = np.asarray(indices, dtype=np.intp)
+        self.positions[indices] = np.asarray(positions, dtype=np.float32)
+        self.mark_dirty(indices)
+
+    def set_rotations(self, indices, rotations) -> None:
+        """Set (x, y, z, w) rotations of many slots at once."""
+        indices = np.asarray(indices, dtype=np.intp)
+        if isinstance(rotations, QuaternionArray):
+            rotations = rotations.data
+        self.rotations[indices] = rotations
+        self.mark_dirty(indices)
+
+    def update(self) -> None:
+        """Recompute local and world matrices for all dirty slots."""
+        if not self._needs_update:
+            return
+        if self._levels is None:
+            self._rebuild_levels()
+
+        n = self._count
+        dirty = self.dirty[:n]
+        changed = np.flatnonzero(dirty)
+        if changed.size:
+            self._compose_local(changed)
+
+        world = self.world_matrices
+        world_inv = self.world_inverse_matrices
+        roots = self._levels[0] if self._levels else np.empty(0, dtype=np.intp)
+        selected = roots[dirty[roots]]
+        world[selected] = self.local_matrices[selected]
+        world_inv[selected] = self.local_inverse_matrices[selected]
+
+        for level in self._levels[1:]:
+            parents = self.parents[level]
+            # A child is dirty when its parent's world matrix changed this pass
+            dirty[level] |= dirty[parents]
+            selected = level[dirty[level]]
+            if selected.size:
+                parents = self.parents[selected]
+                world[selected] = np.matmul(world[parents], self.local_matrices[selected])
+                world_inv[selected] = np.matmul(
+                    self.local_inverse_matrices[selected], world_inv[parents]
+                )
+
+        dirty[:] = False
+        self._needs_update = False
+
+    def _compose_local(self, indices: np.ndarray) -> None:
+        """Build local T * R * S matrices and their inverses for the given slots."""
+        local = np.empty((len(indices), 4, 4), dtype=np.float32)
+        local_inv = np.empty_like(local)
+        compose_trs(
+            self.positions[indices],
+            self.rotations[indices],
+            self.scales[indices],
+            out=local,
+            inverse_out=local_inv,
+        )
+        self.local_matrices[indices] = local
+        self.local_inverse_matrices[indices] = local_inv
+
+    def _rebuild_levels(self) -> None:
+        """Group live slots by hierarchy depth (topological order)."""
+        n = self._count
+        live = np.flatnonzero(self.alive[:n])
+        parents = self.parents[live]
+
+        levels = []
+        current = live[parents < 0]
+        children = live[parents >= 0]
+        in_level = np.zeros(n, dtype=bool)
+        while current.size:
+            levels.append(current)
+            if not children.size:
+                break
+            in_level[:] = False
+            in_level[current] = True
+            is_next = in_level[self.parents[children]]
+            current = children[is_next]
+            children = children[~is_next]
+
+        self._levels = levels
+
+    def _grow(self, capacity: int) -> None:
+        """Resize all arrays, preserving contents."""
+        old = self.capacity
+
+        def grown(array: np.ndarray, fill) -> np.ndarray:
+            result = np.empty((capacity,) + array.shape[1:], dtype=array.dtype)
+            result[:old] = array
+            result[old:] = fill
+            return result
+
+        self.positions = grown(self.positions, 0.0)
+        self.rotations = grown(self.rotations, 0.0)
+        self.rotations[old:, 3] = 1.0
+        self.scales = grown(self.scales, 1.0)
+        self.parents = grown(self.parents, -1)
+        self.local_matrices = grown(self.local_matrices, 0.0)
+        self.world_matrices = grown(self.world_matrices, 0.0)
+        self.local_inverse_matrices = grown(self.local_inverse_matrices, 0.0)
+        self.world_inverse_matrices = grown(self.world_inverse_matrices, 0.0)
+        self.dirty = grown(self.dirty, False)
+        self.alive = grown(self.alive, False)
+
+    def __repr__(self) -> str:
+        return f"TransformStore(count={len(self)}, capacity={self.capacity})"
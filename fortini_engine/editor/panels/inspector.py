@@ -124,20 +124,12 @@ class InspectorPanel(QWidget):
 
     def _update_position(self, axis: int, value: float) -> None:
         """Update object position."""
-        pos = self.current_object.transform.position
-        if axis == 0:
-            pos.x = value
-        elif axis == 1:
-            pos.y = value
-        elif axis == 2:
-            pos.z = value
+        pos = list(self.current_object.transform.position.to_tuple())
+        pos[axis] = value
+        self.current_object.transform.set_position(*pos)
 
     def _update_scale(self, axis: int, value: float) -> None:
         """Update object scale."""
-        scale = self.current_object.transform.scale
-        if axis == 0:
-            scale.x = value
-        elif axis == 1:
-            scale.y = value
-        elif axis == 2:
-            scale.z = value
+        scale = list(self.current_object.transform.scale.to_tuple())
+        scale[axis] = value
+        self.current_object.transform.set_scale(*scale)
@@ -1,5 +1,27 @@
 """Rendering module initialization."""
 
 from fortini_engine.rendering.opengl_renderer import OpenGLRenderer, Shader
+from fortini_engine.rendering.software_renderer import SoftwareRenderer
+from fortini_engine.rendering.capture import FrameCapture, CapturedFrame, RenderTarget
+from fortini_engine.rendering.render_stats import RenderStats
+from fortini_engine.rendering.culling import extract_frustum_planes, cull_bounds
+from fortini_engine.rendering.static_batch import StaticBatch, StaticBatcher
+from fortini_engine.rendering.clustered_lighting import ClusteredLighting, LightClusterGrid
+from fortini_engine.rendering.lod import LODSelector
+from fortini_engine.rendering.occlusion import OcclusionCuller
+from fortini_engine.rendering.textures import Texture, TextureManager
+from fortini_engine.rendering.texture_streaming import TextureStreamer
+from fortini_engine.rendering.particle_renderer import ParticleRenderer
+from fortini_engine.rendering.sprite_batch import SpriteBatch
+from fortini_engine.rendering.text import Font, TextLayout
+from fortini_engine.rendering.debug_draw import DebugDraw, NullDebugDraw
+from fortini_engine.rendering.dynamic_resolution import DynamicResolution, ResolutionController
 
-__all__ = ["OpenGLRenderer", "Shader"]
+__all__ = [
+    "OpenGLRenderer", "Shader", "SoftwareRenderer",
+    "FrameCapture", "CapturedFrame", "RenderTarget", "RenderStats", "extract_frustum_planes", "cull_bounds",
+    "StaticBatch", "StaticBatcher", "ClusteredLighting", "LightClusterGrid",
+    "LODSelector", "OcclusionCuller", "Texture", "TextureManager",
+    "TextureStreamer", "ParticleRenderer", "SpriteBatch", "Font", "TextLayout",
+    "DebugDraw", "NullDebugDraw", "DynamicResolution", "ResolutionController",
+]
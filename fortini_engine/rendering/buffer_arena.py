@@ -0,0 +1,406 @@
+"""Shared GPU buffers for mesh geometry.
+
+All meshes are packed into one interleaved vertex buffer (position, normal, UV)
+and one index buffer, described by a single VAO. Each mesh owns a
+sub-allocation (vertex range + index range) handed out by a free-list
+allocator, and is drawn with base-vertex/offset draws. Allocations are
+released when their mesh is garbage collected, evicted, or left undrawn for
+`max_idle_frames` frames (so assets still referenced elsewhere, such as unused
+LOD levels, do not hold VRAM forever), and the buffers can be compacted to
+squeeze out fragmentation.
+"""
+
+import bisect
+import ctypes
+import weakref
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from OpenGL.GL import *
+from fortini_engine.utils.logger import Logger
+
+# Vertex attribute locations shared by every built-in shader
+ATTRIB_POSITION = 0
+ATTRIB_NORMAL = 1
+ATTRIB_UV = 2
+
+VERTEX_FLOATS = 8  # position(3) + normal(3) + uv(2)
+VERTEX_STRIDE = VERTEX_FLOATS * 4
+INDEX_SIZE = 4  # uint32
+
+# Frames a mesh may go undrawn before its ranges are reclaimed, and how often to check
+DEFAULT_MAX_IDLE_FRAMES = 1800
+EVICTION_INTERVAL = 60
+
+
+class RangeAllocator:
+    """First-fit free-list allocator over a linear range of elements."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._free: List[Tuple[int, int]] = [(0, capacity)] if capacity else []  # (offset, size), sorted
+
+    def allocate(self, size: int) -> Optional[int]:
+        """Reserve `size` elements; returns the offset or None if no block fits."""
+        for i, (offset, block) in enumerate(self._free):
+            if block >= size:
+                if block == size:
+                    del self._free[i]
+                else:
+                    self._free[i] = (offset + size, block - size)
+                return offset
+        return None
+
+    def free(self, offset: int, size: int) -> None:
+        """Return a range, merging it with adjacent free blocks."""
+        if size <= 0:
+            return
+        i = bisect.bisect_left(self._free, (offset, 0))
+        self._free.insert(i, (offset, size))
+        # Merge with the following block, then with the preceding one
+        if i + 1 < len(self._free) and offset + size == self._free[i + 1][0]:
+            self._free[i] = (offset, size + self._free[i + 1][1])
+            del self._free[i + 1]
+        if i > 0 and self._free[i - 1][0] + self._free[i - 1][1] == offset:
+            self._free[i - 1] = (self._free[i - 1][0], self._free[i - 1][1] + self._free[i][1])
+            del self._free[i]
+
+    def grow(self, capacity: int) -> None:
+        """Extend the managed range to `capacity` elements."""
+        if capacity > self.capacity:
+            self.free(self.capacity, capacity - self.capacity)
+            self.capacity = capacity
+
+    def reset(self, used: int) -> None:
+        """Mark [0, used) as allocated and the rest as free (after compaction)."""
+        self._free = [(used, self.capacity - used)] if used < self.capacity else []
+
+    @property
+    def free_total(self) -> int:
+        """Total number of free elements."""
+        return sum(size for _, size in self._free)
+
+    @property
+    def largest_free(self) -> int:
+        """Largest contiguous free block."""
+        return max((size for _, size in self._free), default=0)
+
+
+class MeshAllocation:
+    """A mesh's vertex and index ranges inside the arena."""
+
+    __slots__ = (
+        "id", "owner", "name", "vertex_offset", "vertex_count", "index_offset", "index_count",
+        "last_used", "vertices", "indices", "finalizer", "__weakref__",
+    )
+
+    def __init__(self, alloc_id: int, mesh, vertex_offset: int, vertex_count: int, index_offset: int, index_count: int):
+        self.id = alloc_id
+        self.owner = weakref.ref(mesh)
+        self.name = mesh.name
+        self.vertex_offset = vertex_offset
+        self.vertex_count = vertex_count
+        self.index_offset = index_offset
+        self.index_count = index_count
+        self.last_used = 0
+        # Arrays the upload came from, to detect replaced geometry
+        self.vertices = mesh.vertices
+        self.indices = mesh.indices
+        self.finalizer = None  # releases the ranges when the mesh is collected
+
+    @property
+    def index_byte_offset(self) -> int:
+        """Byte offset of the first index, for glDrawElements*."""
+        return self.index_offset * INDEX_SIZE
+
+    def __repr__(self) -> str:
+        return (
+            f"MeshAllocation(name='{self.name}', vertices={self.vertex_offset}+{self.vertex_count}, "
+            f"indices={self.index_offset}+{self.index_count})"
+        )
+
+
+class GeometryArena:
+    """Interleaved vertex/index buffers shared by all meshes."""
+
+    def __init__(self, state, vertex_capacity: int = 65536, index_capacity: int = 196608):
+        self.state = state  # GLStateCache used for VAO binds
+        self.logger = Logger().get_logger(self.__class__.__name__)
+
+        self.vao = None
+        self.vbo = None
+        self.ebo = None
+        self.vertex_allocator = RangeAllocator(vertex_capacity)
+        self.index_allocator = RangeAllocator(index_capacity)
+
+        self.allocations: Dict[int, MeshAllocation] = {}
+        self.frame = 0
+        self._next_id = 1
+        # Bumped whenever an allocation is created, moved or released
+        self.generation = 0
+        # Callbacks run when a VAO is (re)described, e.g. to attach instance attributes
+        self.layout_listeners = []
+        # Meshes not drawn for this many frames give their ranges back (None keeps them);
+        # they are re-uploaded on next use
+        self.max_idle_frames: Optional[int] = DEFAULT_MAX_IDLE_FRAMES
+
+    @property
+    def vertex_capacity(self) -> int:
+        return self.vertex_allocator.capacity
+
+    @property
+    def index_capacity(self) -> int:
+        return self.index_allocator.capacity
+
+    def begin_frame(self) -> None:
+        """Advance the frame counter, evicting idle meshes every EVICTION_INTERVAL frames."""
+        self.frame += 1
+        if self.max_idle_frames is not None and self.frame % EVICTION_INTERVAL == 0:
+            evicted = self.evict_unused(self.max_idle_frames)
+            if evicted:
+                self.logger.debug(f"Evicted {evicted} meshes idle for over {self.max_idle_frames} frames")
+
+    def ensure(self, mesh) -> Optional[MeshAllocation]:
+        """Return the mesh's allocation, uploading its geometry if needed."""
+        alloc = mesh.gpu_allocation
+        if alloc is not None and (alloc.vertices is not mesh.vertices or alloc.indices is not mesh.indices):
+            # Geometry was replaced since the upload
+            self.evict(mesh)
+            alloc = None
+
+        if alloc is None:
+            alloc = self._upload(mesh)
+            if alloc is None:
+                return None
+
+        alloc.last_used = self.frame
+        return alloc
+
+    def _upload(self, mesh) -> Optional[MeshAllocation]:
+        """Allocate ranges for a mesh and copy its geometry into them."""
+        vertices = np.asarray(mesh.vertices, dtype=np.float32).reshape(-1, 3)
+        indices = np.asarray(mesh.indices, dtype=np.uint32).ravel()
+        if len(vertices) == 0 or len(indices) == 0:
+            return None
+
+        if self.vao is None:
+            self._create_buffers()
+
+        vertex_offset, index_offset = self._reserve(len(vertices), len(indices))
+
+        data = self._interleave(mesh, 0, len(vertices))
+
+        # Upload through the copy-write target so no VAO state is touched
+        glBindBuffer(GL_COPY_WRITE_BUFFER, self.vbo)
+        glBufferSubData(GL_COPY_WRITE_BUFFER, vertex_offset * VERTEX_STRIDE, data.nbytes, data)
+        glBindBuffer(GL_COPY_WRITE_BUFFER, self.ebo)
+        glBufferSubData(GL_COPY_WRITE_BUFFER, index_offset * INDEX_SIZE, indices.nbytes, indices)
+        glBindBuffer(GL_COPY_WRITE_BUFFER, 0)
+
+        alloc = MeshAllocation(self._next_id, mesh, vertex_offset, len(vertices), index_offset, len(indices))
+        self._next_id += 1
+        self.allocations[alloc.id] = alloc
+        alloc.finalizer = weakref.finalize(mesh, self._release, alloc.id)
+
+        mesh.gpu_allocation = alloc
+        mesh.vao, mesh.vbo, mesh.ebo = self.vao, self.vbo, self.ebo
+        self.generation += 1
+        return alloc
+
+    def update_vertices(self, mesh, first: int, count: int) -> None:
+        """Re-upload vertices [first, first + count) of a mesh modified in place."""
+        alloc = mesh.gpu_allocation
+        if alloc is None or alloc.vertices is not mesh.vertices or first + count > alloc.vertex_count:
+            return  # the next ensure() uploads everything
+        data = self._interleave(mesh, first, count)
+        glBindBuffer(GL_COPY_WRITE_BUFFER, self.vbo)
+        glBufferSubData(GL_COPY_WRITE_BUFFER, (alloc.vertex_offset + first) * VERTEX_STRIDE, data.nbytes, data)
+        glBindBuffer(GL_COPY_WRITE_BUFFER, 0)
+
+    @staticmethod
+    def _interleave(mesh, first: int, count: int) -> np.ndarray:
+        """Build interleaved position/normal/UV rows for a vertex range."""
+        end = first + count
+        vertex_count = len(mesh.vertices)
+        data = np.zeros((count, VERTEX_FLOATS), dtype=np.float32)
+        data[:, 0:3] = np.asarray(mesh.vertices, dtype=np.float32).reshape(-1, 3)[first:end]
+        normals = np.asarray(mesh.normals, dtype=np.float32).reshape(-1, 3)
+        if len(normals) == vertex_count:
+            data[:, 3:6] = normals[first:end]
+        uvs = np.asarray(mesh.uv_coords, dtype=np.float32).reshape(-1, 2)
+        if len(uvs) == vertex_count:
+            data[:, 6:8] = uvs[first:end]
+        return data
+
+    def _reserve(self, vertex_count: int, index_count: int) -> Tuple[int, int]:
+        """Allocate vertex and index ranges, compacting or growing when full."""
+        compacted = False
+        while True:
+            vertex_offset = self.vertex_allocator.allocate(vertex_count)
+            if vertex_offset is not None:
+                index_offset = self.index_allocator.allocate(index_count)
+                if index_offset is not None:
+                    return vertex_offset, index_offset
+                self.vertex_allocator.free(vertex_offset, vertex_count)
+
+            # Fragmented but large enough: compact once before growing
+            if (
+                not compacted
+                and self.vertex_allocator.free_total >= vertex_count
+                and self.index_allocator.free_total >= index_count
+            ):
+                self.compact()
+                compacted = True
+                continue
+
+            vertex_capacity = self.vertex_capacity
+            if self.vertex_allocator.largest_free < vertex_count:
+                vertex_capacity = max(vertex_capacity * 2, vertex_capacity + vertex_count)
+            index_capacity = self.index_capacity
+            if self.index_allocator.largest_free < index_count:
+                index_capacity = max(index_capacity * 2, index_capacity + index_count)
+            self._resize(vertex_capacity, index_capacity)
+
+    def evict(self, mesh) -> None:
+        """Release a mesh's GPU ranges; it is re-uploaded on next use."""
+        alloc = mesh.gpu_allocation
+        if alloc is not None:
+            self._release(alloc.id)
+
+    def evict_unused(self, max_idle_frames: int) -> int:
+        """Evict meshes not drawn in the last `max_idle_frames` frames."""
+        stale = [a.id for a in self.allocations.values() if self.frame - a.last_used > max_idle_frames]
+        for alloc_id in stale:
+            self._release(alloc_id)
+        return len(stale)
+
+    def _release(self, alloc_id: int) -> None:
+        """Return an allocation's ranges to the free lists."""
+        alloc = self.allocations.pop(alloc_id, None)
+        if alloc is None:
+            return
+        if alloc.finalizer is not None:
+            # Registered finalizers would otherwise pile up per upload and keep the arena alive
+            alloc.finalizer.detach()
+            alloc.finalizer = None
+        self.vertex_allocator.free(alloc.vertex_offset, alloc.vertex_count)
+        self.index_allocator.free(alloc.index_offset, alloc.index_count)
+        self.generation += 1
+        mesh = alloc.owner()
+        if mesh is not None and mesh.gpu_allocation is alloc:
+            mesh.gpu_allocation = None
+            mesh.vao = mesh.vbo = mesh.ebo = None
+
+    def compact(self) -> None:
+        """Pack all live allocations to the start of fresh buffers."""
+        if self.vao is None:
+            return
+        live = sorted(self.allocations.values(), key=lambda a: a.vertex_offset)
+        new_vbo, new_ebo = glGenBuffers(2)
+        self._allocate_storage(new_vbo, self.vertex_capacity * VERTEX_STRIDE)
+        self._allocate_storage(new_ebo, self.index_capacity * INDEX_SIZE)
+
+        vertex_cursor = 0
+        index_cursor = 0
+        for alloc in live:
+            self._copy(self.vbo, new_vbo, alloc.vertex_offset * VERTEX_STRIDE,
+                       vertex_cursor * VERTEX_STRIDE, alloc.vertex_count * VERTEX_STRIDE)
+            self._copy(self.ebo, new_ebo, alloc.index_offset * INDEX_SIZE,
+                       index_cursor * INDEX_SIZE, alloc.index_count * INDEX_SIZE)
+            alloc.vertex_offset = vertex_cursor
+            alloc.index_offset = index_cursor
+            vertex_cursor += alloc.vertex_count
+            index_cursor += alloc.index_count
+
+        glDeleteBuffers(2, [self.vbo, self.ebo])
+        self.vbo, self.ebo = new_vbo, new_ebo
+        self.vertex_allocator.reset(vertex_cursor)
+        self.index_allocator.reset(index_cursor)
+        self.generation += 1
+        self._describe_layout()
+        self.logger.debug(f"Compacted geometry arena: {len(live)} meshes")
+
+    def _resize(self, vertex_capacity: int, index_capacity: int) -> None:
+        """Grow the buffers, preserving their contents and offsets."""
+        if vertex_capacity != self.vertex_capacity:
+            self.vbo = self._grow_buffer(self.vbo, self.vertex_capacity * VERTEX_STRIDE, vertex_capacity * VERTEX_STRIDE)
+            self.vertex_allocator.grow(vertex_capacity)
+        if index_capacity != self.index_capacity:
+            self.ebo = self._grow_buffer(self.ebo, self.index_capacity * INDEX_SIZE, index_capacity * INDEX_SIZE)
+            self.index_allocator.grow(index_capacity)
+        self._describe_layout()
+        self.logger.debug(f"Grew geometry arena to {vertex_capacity} vertices / {index_capacity} indices")
+
+    def _grow_buffer(self, buffer, old_size: int, new_size: int):
+        """Create a larger buffer holding a copy of `buffer`."""
+        new_buffer = glGenBuffers(1)
+        self._allocate_storage(new_buffer, new_size)
+        self._copy(buffer, new_buffer, 0, 0, old_size)
+        glDeleteBuffers(1, [buffer])
+        return new_buffer
+
+    def _create_buffers(self) -> None:
+        """Create the VAO and the initial vertex/index storage."""
+        self.vao = glGenVertexArrays(1)
+        self.vbo, self.ebo = glGenBuffers(2)
+        self._allocate_storage(self.vbo, self.vertex_capacity * VERTEX_STRIDE)
+        self._allocate_storage(self.ebo, self.index_capacity * INDEX_SIZE)
+        self._describe_layout()
+
+    def _describe_layout(self) -> None:
+        """Point the VAO's attributes and element buffer at the current buffers."""
+        self.state.bind_vertex_array(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glVertexAttribPointer(ATTRIB_POSITION, 3, GL_FLOAT, GL_FALSE, VERTEX_STRIDE, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(ATTRIB_POSITION)
+        glVertexAttribPointer(ATTRIB_NORMAL, 3, GL_FLOAT, GL_FALSE, VERTEX_STRIDE, ctypes.c_void_p(12))
+        glEnableVertexAttribArray(ATTRIB_NORMAL)
+        glVertexAttribPointer(ATTRIB_UV, 2, GL_FLOAT, GL_FALSE, VERTEX_STRIDE, ctypes.c_void_p(24))
+        glEnableVertexAttribArray(ATTRIB_UV)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ebo)
+        for listener in self.layout_listeners:
+            listener(self.vao)
+        self.state.bind_vertex_array(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        for alloc in self.allocations.values():
+            mesh = alloc.owner()
+            if mesh is not None:
+                mesh.vao, mesh.vbo, mesh.ebo = self.vao, self.vbo, self.ebo
+
+    @staticmethod
+    def _allocate_storage(buffer, size: int) -> None:
+        glBindBuffer(GL_COPY_WRITE_BUFFER, buffer)
+        glBufferData(GL_COPY_WRITE_BUFFER, size, None, GL_STATIC_DRAW)
+        glBindBuffer(GL_COPY_WRITE_BUFFER, 0)
+
+    @staticmethod
+    def _copy(source, target, source_offset: int, target_offset: int, size: int) -> None:
+        if size <= 0:
+            return
+        glBindBuffer(GL_COPY_READ_BUFFER, source)
+        glBindBuffer(GL_COPY_WRITE_BUFFER, target)
+        glCopyBufferSubData(GL_COPY_READ_BUFFER, GL_COPY_WRITE_BUFFER, source_offset, target_offset, size)
+        glBindBuffer(GL_COPY_READ_BUFFER, 0)
+        glBindBuffer(GL_COPY_WRITE_BUFFER, 0)
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Bytes used and reserved by the arena buffers."""
+        vertex_used = self.vertex_capacity - self.vertex_allocator.free_total
+        index_used = self.index_capacity - self.index_allocator.free_total
+        return {
+            "meshes": len(self.allocations),
+            "vertex_bytes_used": vertex_used * VERTEX_STRIDE,
+            "vertex_bytes_reserved": self.vertex_capacity * VERTEX_STRIDE,
+            "index_bytes_used": index_used * INDEX_SIZE,
+            "index_bytes_reserved": self.index_capacity * INDEX_SIZE,
+        }
+
+    def release(self) -> None:
+        """Delete all GPU objects and drop every allocation."""
+        for alloc_id in list(self.allocations):
+            self._release(alloc_id)
+        if self.vao is not None:
+            glDeleteBuffers(2, [self.vbo, self.ebo])
+            glDeleteVertexArrays(1, [self.vao])
+            self.vao = self.vbo = self.ebo = None
+        self.vertex_allocator = RangeAllocator(self.vertex_capacity)
+        self.index_allocator = RangeAllocator(self.index_capacity)
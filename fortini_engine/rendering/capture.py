@@ -0,0 +1,216 @@
+"""Offscreen rendering and batched image capture.
+
+`FrameCapture` renders any number of camera views into an offscreen target and
+reads them back into NumPy arrays. With `OpenGLRenderer` the views go into a
+framebuffer object and each readback is queued into a ring of pixel-buffer
+objects guarded by fence syncs, so the CPU keeps submitting views while the GPU
+copies earlier ones. With `SoftwareRenderer` frames are available immediately.
+
+All images are (height, width, 4) uint8 RGBA arrays with the top row first.
+"""
+
+from collections import deque
+from typing import Any, Deque, List, Optional
+import ctypes
+from OpenGL.GL import *
+import numpy as np
+from fortini_engine.utils.logger import Logger
+from fortini_engine.rendering.software_renderer import SoftwareRenderer
+
+
+class CapturedFrame:
+    """A rendered view read back from the offscreen target."""
+
+    def __init__(self, camera, image: np.ndarray, tag: Any = None):
+        self.camera = camera
+        self.image = image
+        self.tag = tag
+
+    def __repr__(self) -> str:
+        return f"CapturedFrame(camera='{self.camera.name}', shape={self.image.shape}, tag={self.tag!r})"
+
+
+class RenderTarget:
+    """An OpenGL framebuffer with RGBA8 color and 24-bit depth renderbuffers."""
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.fbo = glGenFramebuffers(1)
+        self.color_rbo, self.depth_rbo = glGenRenderbuffers(2)
+
+        glBindRenderbuffer(GL_RENDERBUFFER, self.color_rbo)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, width, height)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.depth_rbo)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, width, height)
+        glBindRenderbuffer(GL_RENDERBUFFER, 0)
+
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, self.color_rbo)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, self.depth_rbo)
+        status = glCheckFramebufferStatus(GL_FRAMEBUFFER)
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        if status != GL_FRAMEBUFFER_COMPLETE:
+            self.release()
+            raise RuntimeError(f"Offscreen framebuffer incomplete (status 0x{int(status):x})")
+
+    def release(self) -> None:
+        """Delete the framebuffer and its renderbuffers."""
+        if self.fbo:
+            glDeleteFramebuffers(1, [self.fbo])
+            glDeleteRenderbuffers(2, [self.color_rbo, self.depth_rbo])
+            self.fbo = 0
+
+    def __repr__(self) -> str:
+        return f"RenderTarget({self.width}x{self.height}, fbo={self.fbo})"
+
+
+class FrameCapture:
+    """Renders camera views offscreen and reads them back asynchronously."""
+
+    def __init__(self, renderer, width: int, height: int, buffer_count: int = 4):
+        self.logger = Logger().get_logger(self.__class__.__name__)
+        self.renderer = renderer
+        self.width = width
+        self.height = height
+        self.clear_color = (0.1, 0.1, 0.1, 1.0)
+
+        self._ready: Deque[CapturedFrame] = deque()
+        self._pending: Deque[tuple] = deque()  # (pbo, fence, camera, tag), oldest first
+        self._free_pbos: List[int] = []
+        self.target: Optional[RenderTarget] = None
+
+        if not self.software:
+            self.target = RenderTarget(width, height)
+            pbos = glGenBuffers(buffer_count)
+            self._free_pbos = [int(pbo) for pbo in np.atleast_1d(pbos)]
+            for pbo in self._free_pbos:
+                glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+                glBufferData(GL_PIXEL_PACK_BUFFER, width * height * 4, None, GL_STREAM_READ)
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+
+    @property
+    def software(self) -> bool:
+        """Whether frames come from the CPU rasterizer instead of OpenGL."""
+        return isinstance(self.renderer, SoftwareRenderer)
+
+    @property
+    def pending(self) -> int:
+        """Number of views whose readback has not completed yet."""
+        return len(self._pending)
+
+    def submit(self, scene, cameras, tag: Any = None) -> None:
+        """Render each camera's view and queue its readback."""
+        if self.software:
+            self._submit_software(scene, cameras, tag)
+        else:
+            self._submit_gl(scene, cameras, tag)
+
+    def poll(self) -> List[CapturedFrame]:
+        """Return frames whose readback has finished, without blocking."""
+        while self._pending and self._is_signaled(self._pending[0][1]):
+            self._finish_oldest()
+        return self._drain()
+
+    def collect(self) -> List[CapturedFrame]:
+        """Wait for every queued readback and return all remaining frames."""
+        while self._pending:
+            self._finish_oldest()
+        return self._drain()
+
+    def capture(self, scene, cameras) -> List[np.ndarray]:
+        """Render the views and return their images in camera order (blocking)."""
+        if self._pending or self._ready:
+            raise RuntimeError("capture() called with uncollected asynchronous frames")
+        self.submit(scene, cameras)
+        return [frame.image for frame in self.collect()]
+
+    def _drain(self) -> List[CapturedFrame]:
+        """Hand over all ready frames."""
+        frames = list(self._ready)
+        self._ready.clear()
+        return frames
+
+    def _submit_software(self, scene, cameras, tag: Any) -> None:
+        """Render views on the CPU; frames are ready immediately."""
+        renderer = self.renderer
+        size = (renderer.width, renderer.height)
+        if size != (self.width, self.height):
+            renderer.resize(self.width, self.height)
+        try:
+            for camera in cameras:
+                renderer.render(scene, camera)
+                self._ready.append(CapturedFrame(camera, renderer.get_image(), tag))
+        finally:
+            if size != (self.width, self.height):
+                renderer.resize(*size)
+
+    def _submit_gl(self, scene, cameras, tag: Any) -> None:
+        """Render views into the framebuffer, reading each into a free PBO."""
+        renderer = self.renderer
+        previous_draw = glGetIntegerv(GL_DRAW_FRAMEBUFFER_BINDING)
+        previous_read = glGetIntegerv(GL_READ_FRAMEBUFFER_BINDING)
+        previous_viewport = glGetIntegerv(GL_VIEWPORT)
+        previous_clear = glGetFloatv(GL_COLOR_CLEAR_VALUE)
+        depth_test = glIsEnabled(GL_DEPTH_TEST)
+        size = (renderer.width, renderer.height)
+
+        glBindFramebuffer(GL_FRAMEBUFFER, self.target.fbo)
+        glReadBuffer(GL_COLOR_ATTACHMENT0)
+        glEnable(GL_DEPTH_TEST)
+        glClearColor(*self.clear_color)
+        renderer.width, renderer.height = self.width, self.height
+        try:
+            for camera in cameras:
+                if not self._free_pbos:
+                    self._finish_oldest()
+                pbo = self._free_pbos.pop()
+
+                renderer.render(scene, camera)
+                glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+                glReadPixels(0, 0, self.width, self.height, GL_RGBA, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+                glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+                fence = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+                self._pending.append((pbo, fence, camera, tag))
+        finally:
+            renderer.width, renderer.height = size
+            if not depth_test:
+                glDisable(GL_DEPTH_TEST)
+            glBindFramebuffer(GL_DRAW_FRAMEBUFFER, int(previous_draw))
+            glBindFramebuffer(GL_READ_FRAMEBUFFER, int(previous_read))
+            glViewport(*(int(v) for v in previous_viewport))
+            glClearColor(*(float(v) for v in previous_clear))
+
+    @staticmethod
+    def _is_signaled(fence) -> bool:
+        """Whether the GPU has passed a fence, without waiting."""
+        status = glClientWaitSync(fence, 0, 0)
+        return status in (GL_ALREADY_SIGNALED, GL_CONDITION_SATISFIED)
+
+    def _finish_oldest(self) -> None:
+        """Wait for the oldest readback and copy its pixels out of the PBO."""
+        pbo, fence, camera, tag = self._pending.popleft()
+        while glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT, 1_000_000_000) == GL_TIMEOUT_EXPIRED:
+            pass
+        glDeleteSync(fence)
+
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+        data = glGetBufferSubData(GL_PIXEL_PACK_BUFFER, 0, self.width * self.height * 4)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self._free_pbos.append(pbo)
+
+        # GL rows start at the bottom of the image
+        image = np.frombuffer(data, dtype=np.uint8).reshape(self.height, self.width, 4)[::-1].copy()
+        self._ready.append(CapturedFrame(camera, image, tag))
+
+    def release(self) -> None:
+        """Finish outstanding readbacks and delete GL resources."""
+        if self.software:
+            return
+        self.collect()
+        if self._free_pbos:
+            glDeleteBuffers(len(self._free_pbos), self._free_pbos)
+            self._free_pbos = []
+        if self.target is not None:
+            self.target.release()
+            self.target = None
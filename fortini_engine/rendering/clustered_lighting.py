@@ -0,0 +1,253 @@
+"""Clustered forward lighting.
+
+The view frustum is split into a grid of froxels: screen tiles times
+exponentially spaced depth slices. Every frame each ranged light is assigned,
+with vectorized NumPy, to the froxels its sphere touches. The result is a
+per-cluster (offset, count) table and a flat light-index list, uploaded as
+texture buffers so the fragment shader only loops over the lights of its own
+cluster. Lights without a range affect everything and stay in the LightData
+block instead.
+"""
+
+import math
+from typing import Optional
+from OpenGL.GL import *
+import numpy as np
+from fortini_engine.rendering.uniform_buffers import (
+    UniformBuffer,
+    CLUSTER_BLOCK_BINDING,
+    CLUSTER_FLOATS,
+    SAMPLER_UNITS,
+)
+
+
+class LightClusterGrid:
+    """CPU light assignment into a view-space froxel grid."""
+
+    def __init__(self, tiles_x: int = 16, tiles_y: int = 9, slices: int = 24):
+        self.tiles_x = tiles_x
+        self.tiles_y = tiles_y
+        self.slices = slices
+
+        # Outputs of build()
+        self.grid = np.zeros((self.cluster_count, 2), dtype=np.uint32)  # (offset, count)
+        self.indices = np.zeros(0, dtype=np.uint32)
+        self.depth_scale = 0.0
+        self.depth_bias = 0.0
+        self.tile_size = (1.0, 1.0)  # pixels
+
+        self._bounds_key = None
+        self._bounds_min = None
+        self._bounds_max = None
+
+    @property
+    def cluster_count(self) -> int:
+        return self.tiles_x * self.tiles_y * self.slices
+
+    def slice_of(self, depth: np.ndarray) -> np.ndarray:
+        """Depth slice index for positive view-space depths."""
+        slices = np.floor(np.log(np.maximum(depth, 1e-6)) * self.depth_scale + self.depth_bias)
+        return np.clip(slices, 0, self.slices - 1).astype(np.int64)
+
+    def build(self, view: np.ndarray, projection: np.ndarray, near: float, far: float,
+              positions: np.ndarray, width: int, height: int) -> None:
+        """Assign lights ((N, 4) world positions with range in w) to clusters.
+
+        Cluster i = x + tiles_x * (y + tiles_y * slice), with tile (0, 0) at
+        the bottom-left of the viewport like gl_FragCoord.
+        """
+        log_ratio = math.log(far / near)
+        self.depth_scale = self.slices / log_ratio
+        self.depth_bias = -self.slices * math.log(near) / log_ratio
+        self.tile_size = (math.ceil(width / self.tiles_x), math.ceil(height / self.tiles_y))
+        bounds_min, bounds_max = self._cluster_bounds(projection, near, far, width, height)
+
+        centers = positions[:, :3] @ view[:3, :3].T + view[:3, 3]
+        radii = positions[:, 3]
+        depths = -centers[:, 2]
+        visible = (radii > 0) & (depths + radii > near) & (depths - radii < far)
+        lights = np.flatnonzero(visible)
+        if not lights.size:
+            self.grid[:] = 0
+            self.indices = np.zeros(0, dtype=np.uint32)
+            return
+        centers, radii, depths = centers[lights], radii[lights], depths[lights]
+
+        # Conservative cluster box per light: depth slices from the sphere's depth
+        # range, tiles from the projection of its view-space bounding box
+        z0 = self.slice_of(np.maximum(depths - radii, near))
+        z1 = self.slice_of(np.minimum(depths + radii, far))
+        x0, x1, y0, y1 = self._tile_ranges(projection, centers, radii, width, height)
+
+        span_x = x1 - x0 + 1
+        span_y = y1 - y0 + 1
+        counts = span_x * span_y * (z1 - z0 + 1)
+        total = int(counts.sum())
+        owner = np.repeat(np.arange(len(lights)), counts)
+        local = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        sx, sy = span_x[owner], span_y[owner]
+        cx = x0[owner] + local % sx
+        cy = y0[owner] + (local // sx) % sy
+        cz = z0[owner] + local // (sx * sy)
+        clusters = cx + self.tiles_x * (cy + self.tiles_y * cz)
+
+        # Exact sphere / cluster-box test
+        closest = np.clip(centers[owner], bounds_min[clusters], bounds_max[clusters])
+        inside = np.sum((closest - centers[owner]) ** 2, axis=1) <= radii[owner] ** 2
+        clusters, owner = clusters[inside], owner[inside]
+
+        order = np.argsort(clusters, kind="stable")
+        per_cluster = np.bincount(clusters, minlength=self.cluster_count)
+        self.grid[:, 1] = per_cluster
+        self.grid[:, 0] = np.cumsum(per_cluster) - per_cluster
+        self.indices = lights[owner[order]].astype(np.uint32)
+
+    def _tile_ranges(self, projection: np.ndarray, centers: np.ndarray, radii: np.ndarray, width: int, height: int):
+        """Tile rectangles covered by the projected bounding boxes of spheres."""
+        offsets = np.array(
+            [(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)], dtype=np.float32
+        )
+        corners = centers[:, None, :] + offsets[None, :, :] * radii[:, None, None]
+        clip = corners @ projection[:, :3].T + projection[:, 3]
+        w = clip[..., 3]
+        behind = np.any(w <= 1e-6, axis=1)
+        w = np.where(w > 1e-6, w, 1.0)
+        ndc_x = clip[..., 0] / w
+        ndc_y = clip[..., 1] / w
+
+        tile_w, tile_h = self.tile_size
+        px0 = (ndc_x.min(axis=1) * 0.5 + 0.5) * width / tile_w
+        px1 = (ndc_x.max(axis=1) * 0.5 + 0.5) * width / tile_w
+        py0 = (ndc_y.min(axis=1) * 0.5 + 0.5) * height / tile_h
+        py1 = (ndc_y.max(axis=1) * 0.5 + 0.5) * height / tile_h
+
+        # Boxes crossing the camera plane can project anywhere
+        px0 = np.where(behind, 0, px0)
+        py0 = np.where(behind, 0, py0)
+        px1 = np.where(behind, self.tiles_x - 1, px1)
+        py1 = np.where(behind, self.tiles_y - 1, py1)
+        x0 = np.clip(np.floor(px0), 0, self.tiles_x - 1).astype(np.int64)
+        x1 = np.clip(np.floor(px1), 0, self.tiles_x - 1).astype(np.int64)
+        y0 = np.clip(np.floor(py0), 0, self.tiles_y - 1).astype(np.int64)
+        y1 = np.clip(np.floor(py1), 0, self.tiles_y - 1).astype(np.int64)
+        return x0, x1, y0, y1
+
+    def _cluster_bounds(self, projection: np.ndarray, near: float, far: float, width: int, height: int):
+        """View-space AABBs of all clusters, cached until the projection changes."""
+        key = (projection.tobytes(), near, far, width, height)
+        if key == self._bounds_key:
+            return self._bounds_min, self._bounds_max
+
+        tile_w, tile_h = self.tile_size
+        ndc_x = np.arange(self.tiles_x + 1) * tile_w / width * 2.0 - 1.0
+        ndc_y = np.arange(self.tiles_y + 1) * tile_h / height * 2.0 - 1.0
+        gx, gy = np.meshgrid(ndc_x, ndc_y)  # (tiles_y + 1, tiles_x + 1)
+
+        # Points where each tile-corner ray crosses the near and far planes
+        inverse = np.linalg.inv(projection.astype(np.float64))
+
+        def unproject(ndc_z: float) -> np.ndarray:
+            points = np.stack((gx, gy, np.full_like(gx, ndc_z), np.ones_like(gx)), axis=-1) @ inverse.T
+            return points[..., :3] / points[..., 3:4]
+
+        near_points, far_points = unproject(-1.0), unproject(1.0)
+        near_depth, far_depth = -near_points[..., 2:3], -far_points[..., 2:3]
+
+        # Slice boundary depths, exponentially spaced
+        depths = near * (far / near) ** (np.arange(self.slices + 1) / self.slices)
+        t = (depths[:, None, None, None] - near_depth) / np.maximum(far_depth - near_depth, 1e-12)
+        points = near_points + (far_points - near_points) * t  # (slices + 1, ty + 1, tx + 1, 3)
+
+        # Each cluster's box spans its 8 corner points
+        corners = np.stack([
+            points[dz:dz + self.slices, dy:dy + self.tiles_y, dx:dx + self.tiles_x]
+            for dz in (0, 1) for dy in (0, 1) for dx in (0, 1)
+        ])
+        self._bounds_min = corners.min(axis=0).reshape(-1, 3).astype(np.float32)
+        self._bounds_max = corners.max(axis=0).reshape(-1, 3).astype(np.float32)
+        self._bounds_key = key
+        return self._bounds_min, self._bounds_max
+
+
+class ClusterUniforms(UniformBuffer):
+    """Cluster grid parameters block (ClusterData)."""
+
+    def __init__(self):
+        super().__init__(CLUSTER_BLOCK_BINDING, CLUSTER_FLOATS)
+
+    def set(self, grid: Optional[LightClusterGrid]) -> None:
+        """Write grid dimensions, depth slicing and tile size (all zero when disabled)."""
+        self.data[:] = 0.0
+        if grid is None:
+            return
+        dims = self.data[0:4].view(np.uint32)
+        dims[:] = (grid.tiles_x, grid.tiles_y, grid.slices, 1)
+        self.data[4:6] = (grid.depth_scale, grid.depth_bias)
+        self.data[8:10] = grid.tile_size
+
+
+class ClusteredLighting:
+    """GPU side of clustered lighting: texture buffers and the ClusterData block."""
+
+    def __init__(self, grid: Optional[LightClusterGrid] = None):
+        self.grid = grid or LightClusterGrid()
+        self.uniforms = ClusterUniforms()
+        self.light_count = 0
+        self.entries = 0
+
+        self._buffers = glGenBuffers(3)
+        self._textures = glGenTextures(3)
+        self._formats = (GL_RGBA32F, GL_RG32UI, GL_R32UI)  # lights, grid, indices
+        self._units = (
+            SAMPLER_UNITS["clusterLights"],
+            SAMPLER_UNITS["clusterGrid"],
+            SAMPLER_UNITS["clusterLightIndices"],
+        )
+        for buffer, texture, fmt in zip(self._buffers, self._textures, self._formats):
+            glBindBuffer(GL_TEXTURE_BUFFER, buffer)
+            glBufferData(GL_TEXTURE_BUFFER, 16, None, GL_STREAM_DRAW)
+            glBindTexture(GL_TEXTURE_BUFFER, texture)
+            glTexBuffer(GL_TEXTURE_BUFFER, fmt, buffer)
+        glBindTexture(GL_TEXTURE_BUFFER, 0)
+        glBindBuffer(GL_TEXTURE_BUFFER, 0)
+
+    def update(self, view: np.ndarray, projection: np.ndarray, near: float, far: float,
+               positions: np.ndarray, colors: np.ndarray, width: int, height: int) -> int:
+        """Assign ranged lights to clusters and upload the tables; returns uniform block uploads."""
+        grid = self.grid
+        grid.build(view, projection, near, far, positions, width, height)
+        self.light_count = len(positions)
+        self.entries = len(grid.indices)
+
+        lights = np.empty((len(positions), 2, 4), dtype=np.float32)
+        lights[:, 0] = positions
+        lights[:, 1] = colors
+        for buffer, data in zip(self._buffers, (lights, grid.grid, grid.indices)):
+            glBindBuffer(GL_TEXTURE_BUFFER, buffer)
+            # Orphan and refill; keep at least one texel so the texture stays valid
+            glBufferData(GL_TEXTURE_BUFFER, max(data.nbytes, 16), data if data.size else None, GL_STREAM_DRAW)
+        glBindBuffer(GL_TEXTURE_BUFFER, 0)
+
+        self.uniforms.set(grid)
+        return int(self.uniforms.upload())
+
+    def disable(self) -> int:
+        """Turn cluster lookups off in the shaders; returns uniform block uploads."""
+        self.light_count = self.entries = 0
+        self.uniforms.set(None)
+        return int(self.uniforms.upload())
+
+    def bind(self) -> None:
+        """Bind the texture buffers to their sampler units."""
+        for texture, unit in zip(self._textures, self._units):
+            glActiveTexture(GL_TEXTURE0 + unit)
+            glBindTexture(GL_TEXTURE_BUFFER, texture)
+        glActiveTexture(GL_TEXTURE0)
+
+    def release(self) -> None:
+        """Delete buffers and textures."""
+        if self._buffers is not None:
+            glDeleteTextures(3, self._textures)
+            glDeleteBuffers(3, self._buffers)
+            self._buffers = self._textures = None
+        self.uniforms.release()
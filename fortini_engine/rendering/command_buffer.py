@@ -0,0 +1,152 @@
+"""Recorded draw command buffers.
+
+Scene traversal records each draw as a compact row in preallocated NumPy
+arrays instead of issuing GL calls directly. Rows use the layout of
+`DrawElementsIndirectCommand` (index count, instance count, first index, base
+vertex, base instance) so a run of draws sharing a program, VAO and material
+texture can be submitted with a single `glMultiDrawElementsIndirect`. The base instance is
+the draw's slot in the per-instance data buffer (model matrix + color), which
+the instanced vertex shader fetches through its divisor-1 attributes.
+"""
+
+from typing import List, Optional
+import ctypes
+from OpenGL.GL import *
+import numpy as np
+
+# Columns of a command row, matching DrawElementsIndirectCommand
+CMD_COUNT = 0
+CMD_INSTANCE_COUNT = 1
+CMD_FIRST_INDEX = 2
+CMD_BASE_VERTEX = 3
+CMD_BASE_INSTANCE = 4  # slot of the draw's first instance
+COMMAND_FIELDS = 5
+COMMAND_STRIDE = COMMAND_FIELDS * 4
+
+
+class DrawRun:
+    """Consecutive commands sharing render pass, shader, VAO and texture."""
+
+    __slots__ = ("render_pass", "shader", "vao", "texture", "first", "count")
+
+    def __init__(self, render_pass: int, shader, vao, texture, first: int):
+        self.render_pass = render_pass
+        self.shader = shader
+        self.vao = vao
+        self.texture = texture
+        self.first = first
+        self.count = 0
+
+    def __repr__(self) -> str:
+        return f"DrawRun(pass={self.render_pass}, vao={self.vao}, first={self.first}, count={self.count})"
+
+
+class CommandBuffer:
+    """Flat arrays of draw records, replayable across frames."""
+
+    def __init__(self, capacity: int = 1024, instance_capacity: int = 4096):
+        self.commands = np.zeros((capacity, COMMAND_FIELDS), dtype=np.uint32)
+        self.vaos = np.zeros(capacity, dtype=np.uint32)
+        self.materials: List = []  # per command, for instance colors
+        self.meshes: List = []  # per command, kept alive for reuse checks
+        self.textures: List = []  # per command, the material texture at record time
+        self.runs: List[DrawRun] = []
+        self.count = 0
+
+        # World-matrix row feeding each instance slot
+        self.instance_sources = np.zeros(instance_capacity, dtype=np.intp)
+        self.instance_count = 0
+
+        # Reuse bookkeeping: what the recording was built from
+        self.signature: Optional[tuple] = None
+        self.generation = -1
+
+        self.indirect_buffer = None
+        self._uploaded = 0  # commands currently in the indirect buffer
+
+    def clear(self) -> None:
+        """Drop all records, keeping the allocated arrays."""
+        self.count = 0
+        self.instance_count = 0
+        self.materials = []
+        self.meshes = []
+        self.textures = []
+        self.runs = []
+        self.signature = None
+        self._uploaded = 0
+
+    def add(self, render_pass: int, shader, vao, mesh, material, alloc, rows: np.ndarray, texture=None) -> None:
+        """Record one draw of `alloc` with an instance per world-matrix row."""
+        index = self.count
+        if index == len(self.commands):
+            self._grow_commands(2 * len(self.commands))
+        instances = len(rows)
+        slot = self.instance_count
+        if slot + instances > len(self.instance_sources):
+            self._grow_instances(max(2 * len(self.instance_sources), slot + instances))
+
+        self.commands[index] = (alloc.index_count, instances, alloc.index_offset, alloc.vertex_offset, slot)
+        self.vaos[index] = vao
+        self.instance_sources[slot:slot + instances] = rows
+        self.instance_count += instances
+        self.materials.append(material)
+        self.meshes.append(mesh)
+        self.textures.append(texture)
+        self.count += 1
+
+        run = self.runs[-1] if self.runs else None
+        if (
+            run is None or run.render_pass != render_pass or run.shader is not shader
+            or run.vao != vao or run.texture is not texture
+        ):
+            run = DrawRun(render_pass, shader, vao, texture, index)
+            self.runs.append(run)
+        run.count += 1
+
+    def upload(self) -> None:
+        """Copy the recorded commands into the GL_DRAW_INDIRECT_BUFFER."""
+        if self.indirect_buffer is None:
+            self.indirect_buffer = glGenBuffers(1)
+        data = self.commands[:self.count]
+        glBindBuffer(GL_DRAW_INDIRECT_BUFFER, self.indirect_buffer)
+        glBufferData(GL_DRAW_INDIRECT_BUFFER, max(data.nbytes, COMMAND_STRIDE), data if self.count else None, GL_DYNAMIC_DRAW)
+        self._uploaded = self.count
+
+    @property
+    def uploaded(self) -> bool:
+        """Whether the indirect buffer holds the current recording."""
+        return self._uploaded == self.count and self.indirect_buffer is not None
+
+    def triangle_count(self) -> int:
+        """Triangles drawn by a full replay."""
+        commands = self.commands[:self.count].astype(np.int64)
+        return int((commands[:, CMD_COUNT] // 3 * commands[:, CMD_INSTANCE_COUNT]).sum())
+
+    @staticmethod
+    def offset(command: int) -> ctypes.c_void_p:
+        """Byte offset of a command inside the indirect buffer."""
+        return ctypes.c_void_p(command * COMMAND_STRIDE)
+
+    def _grow_commands(self, capacity: int) -> None:
+        """Enlarge the command arrays, preserving recorded rows."""
+        commands = np.zeros((capacity, COMMAND_FIELDS), dtype=np.uint32)
+        commands[:self.count] = self.commands[:self.count]
+        vaos = np.zeros(capacity, dtype=np.uint32)
+        vaos[:self.count] = self.vaos[:self.count]
+        self.commands, self.vaos = commands, vaos
+
+    def _grow_instances(self, capacity: int) -> None:
+        """Enlarge the instance slot array, preserving recorded slots."""
+        sources = np.zeros(capacity, dtype=np.intp)
+        sources[:self.instance_count] = self.instance_sources[:self.instance_count]
+        self.instance_sources = sources
+
+    def release(self) -> None:
+        """Delete the indirect buffer."""
+        if self.indirect_buffer is not None:
+            glDeleteBuffers(1, [self.indirect_buffer])
+            self.indirect_buffer = None
+            self._uploaded = 0
+
+    def __repr__(self) -> str:
+        return f"CommandBuffer(commands={self.count}, instances={self.instance_count}, runs={len(self.runs)})"
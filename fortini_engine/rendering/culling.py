@@ -0,0 +1,65 @@
+"""Visibility culling against the camera frustum (see occlusion for occluders)."""
+
+import numpy as np
+
+
+def extract_frustum_planes(view_projection: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """Extract the six normalized frustum planes from a view-projection matrix.
+
+    Returns a (6, 4) array of (a, b, c, d) planes in world space, ordered left,
+    right, bottom, top, near, far. A point p is inside when a*x + b*y + c*z + d >= 0
+    for every plane.
+    """
+    m = np.asarray(view_projection, dtype=np.float32)
+    planes = out if out is not None else np.empty((6, 4), dtype=np.float32)
+    planes[0] = m[3] + m[0]
+    planes[1] = m[3] - m[0]
+    planes[2] = m[3] + m[1]
+    planes[3] = m[3] - m[1]
+    planes[4] = m[3] + m[2]
+    planes[5] = m[3] - m[2]
+    lengths = np.linalg.norm(planes[:, :3], axis=1)
+    planes /= np.where(lengths > 0, lengths, 1.0)[:, None]
+    return planes
+
+
+def gather_bounds(objects) -> tuple:
+    """Stack the local mesh bounds of objects into (centers, half_extents, radii) arrays."""
+    count = len(objects)
+    centers = np.empty((count, 3), dtype=np.float32)
+    half_extents = np.empty((count, 3), dtype=np.float32)
+    radii = np.empty(count, dtype=np.float32)
+    for i, obj in enumerate(objects):
+        centers[i], half_extents[i], radii[i] = obj.mesh.get_bounds()
+    return centers, half_extents, radii
+
+
+def cull_bounds(
+    planes: np.ndarray,
+    world_matrices: np.ndarray,
+    centers: np.ndarray,
+    half_extents: np.ndarray,
+    radii: np.ndarray,
+) -> np.ndarray:
+    """Test N local-space bounds, placed by N world matrices, against the frustum.
+
+    Each object is tested as a bounding sphere first and then as an oriented box
+    (projected onto each plane normal); it is visible only if both overlap the
+    frustum. Returns a boolean mask of shape (N,).
+    """
+    if len(world_matrices) == 0:
+        return np.zeros(0, dtype=bool)
+
+    basis = world_matrices[:, :3, :3]
+    world_centers = np.einsum("nij,nj->ni", basis, centers) + world_matrices[:, :3, 3]
+    distances = world_centers @ planes[:, :3].T + planes[:, 3]  # (N, 6)
+
+    # Spheres grow with the largest axis scale
+    axis_scale = np.sqrt(np.max(np.einsum("nij,nij->nj", basis, basis), axis=1))
+    visible = np.all(distances >= -(radii * axis_scale)[:, None], axis=1)
+
+    # Boxes: world-space extents projected onto each plane normal
+    world_extents = np.einsum("nij,nj->ni", np.abs(basis), half_extents)
+    box_radii = world_extents @ np.abs(planes[:, :3]).T
+    visible &= np.all(distances >= -box_radii, axis=1)
+    return visible
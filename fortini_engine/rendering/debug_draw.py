@@ -0,0 +1,248 @@
+"""Immediate-mode debug lines and gizmos.
+
+Calls such as `line`, `box`, `sphere` and `frustum` append line vertices to
+growable per-frame NumPy buffers, vectorized per shape. At the end of the
+frame the renderer uploads both buffers in one transfer and draws each with a
+single GL_LINES call: depth-tested lines first, then overlay lines that show
+through geometry. The buffers are then cleared.
+
+Debug drawing is compiled out of release builds: under `python -O`, or with
+FORTINI_DEBUG_DRAW=0 in the environment, renderers get a `NullDebugDraw`
+whose methods do nothing and which compiles no shader.
+"""
+
+from typing import Optional, Tuple
+import ctypes
+import math
+import os
+from OpenGL.GL import *
+import numpy as np
+from fortini_engine.utils.color import to_rgba
+
+# Whether renderers create a working DebugDraw
+DEBUG_DRAW_ENABLED = __debug__ and os.environ.get("FORTINI_DEBUG_DRAW", "1") != "0"
+
+# Vertex attribute locations of the debug line program
+ATTRIB_DEBUG_POSITION = 0
+ATTRIB_DEBUG_COLOR = 1
+
+# Floats per vertex: position xyz, color rgba
+DEBUG_VERTEX_FLOATS = 7
+
+DEFAULT_COLOR = (1.0, 1.0, 0.0, 1.0)
+
+# Corners of the unit cube [-1, 1]^3 and its 12 edges as corner pairs
+_CUBE_CORNERS = np.array(
+    [(x, y, z) for z in (-1.0, 1.0) for y in (-1.0, 1.0) for x in (-1.0, 1.0)], dtype=np.float32,
+)
+_CUBE_EDGES = np.array(
+    [0, 1, 2, 3, 4, 5, 6, 7,   # along x
+     0, 2, 1, 3, 4, 6, 5, 7,   # along y
+     0, 4, 1, 5, 2, 6, 3, 7],  # along z
+    dtype=np.intp,
+)
+
+
+class DebugDraw:
+    """Per-frame batches of debug lines, drawn with one call per variant."""
+
+    def __init__(self, state, shader, capacity: int = 4096):
+        self.state = state
+        self.shader = shader
+        self.enabled = True
+
+        # Vertex buffers of the depth-tested and overlay variants
+        self._vertices = [np.empty((capacity, DEBUG_VERTEX_FLOATS), dtype=np.float32) for _ in range(2)]
+        self._counts = [0, 0]
+        self._circles = {}  # segments -> (segments * 2, 2) unit circle line list
+
+        self.vao = None
+        self._vbo = None
+
+    @property
+    def line_count(self) -> int:
+        """Lines queued this frame."""
+        return (self._counts[0] + self._counts[1]) // 2
+
+    def line(self, start, end, color=DEFAULT_COLOR, overlay: bool = False) -> None:
+        """Queue a line segment between two points."""
+        vertices = self._reserve(2, overlay)
+        vertices[0, :3] = start
+        vertices[1, :3] = end
+        vertices[:, 3:] = to_rgba(color)
+
+    def lines(self, starts: np.ndarray, ends: np.ndarray, color=DEFAULT_COLOR, overlay: bool = False) -> None:
+        """Queue N segments from (N, 3) start and end arrays; `color` is one color or (N, 4)."""
+        starts = np.asarray(starts, dtype=np.float32).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=np.float32).reshape(-1, 3)
+        count = len(starts)
+        if count == 0:
+            return
+        vertices = self._reserve(2 * count, overlay).reshape(count, 2, DEBUG_VERTEX_FLOATS)
+        vertices[:, 0, :3] = starts
+        vertices[:, 1, :3] = ends
+        colors = np.asarray(color, dtype=np.float32)
+        if colors.ndim == 2:
+            vertices[:, :, 3:] = colors[:, None, :]
+        else:
+            vertices[:, :, 3:] = to_rgba(color)
+
+    def box(self, center, half_extents, color=DEFAULT_COLOR, matrix: Optional[np.ndarray] = None,
+            overlay: bool = False) -> None:
+        """Queue the 12 edges of a box, optionally placed by a 4x4 world matrix (oriented bounds)."""
+        corners = _CUBE_CORNERS * np.asarray(half_extents, dtype=np.float32) + np.asarray(center, dtype=np.float32)
+        if matrix is not None:
+            corners = _transform_points(matrix, corners)
+        vertices = self._reserve(24, overlay)
+        vertices[:, :3] = corners[_CUBE_EDGES]
+        vertices[:, 3:] = to_rgba(color)
+
+    def aabb(self, minimum, maximum, color=DEFAULT_COLOR, overlay: bool = False) -> None:
+        """Queue an axis-aligned box given its min and max corners."""
+        minimum = np.asarray(minimum, dtype=np.float32)
+        maximum = np.asarray(maximum, dtype=np.float32)
+        self.box((minimum + maximum) * 0.5, (maximum - minimum) * 0.5, color, overlay=overlay)
+
+    def sphere(self, center, radius: float, color=DEFAULT_COLOR, segments: int = 24, overlay: bool = False) -> None:
+        """Queue a wire sphere: three circles in the axis planes."""
+        circle = self._circle(segments) * radius
+        center = np.asarray(center, dtype=np.float32)
+        vertices = self._reserve(6 * segments, overlay).reshape(3, 2 * segments, DEBUG_VERTEX_FLOATS)
+        for plane, (a, b) in enumerate(((0, 1), (1, 2), (0, 2))):
+            ring = vertices[plane, :, :3]
+            ring[:] = center
+            ring[:, a] += circle[:, 0]
+            ring[:, b] += circle[:, 1]
+        vertices[..., 3:] = to_rgba(color)
+
+    def frustum(self, view_projection, color=DEFAULT_COLOR, overlay: bool = False) -> None:
+        """Queue the edges of a view frustum, from a camera or a 4x4 view-projection matrix."""
+        if hasattr(view_projection, "get_projection_matrix"):
+            camera = view_projection
+            view_projection = camera.get_projection_matrix().to_numpy() @ camera.get_view_matrix().to_numpy()
+        inverse = np.linalg.inv(np.asarray(view_projection, dtype=np.float64))
+        corners = _transform_points(inverse, _CUBE_CORNERS)
+        vertices = self._reserve(24, overlay)
+        vertices[:, :3] = corners[_CUBE_EDGES]
+        vertices[:, 3:] = to_rgba(color)
+
+    def axes(self, matrix: np.ndarray, size: float = 1.0, overlay: bool = False) -> None:
+        """Queue the x (red), y (green) and z (blue) axes of a 4x4 world matrix."""
+        matrix = np.asarray(matrix, dtype=np.float32)
+        origin = matrix[:3, 3]
+        vertices = self._reserve(6, overlay).reshape(3, 2, DEBUG_VERTEX_FLOATS)
+        vertices[:, 0, :3] = origin
+        vertices[:, 1, :3] = origin + matrix[:3, :3].T * size
+        vertices[:, :, 3:] = np.eye(3, 4, dtype=np.float32)[:, None, :] + (0.0, 0.0, 0.0, 1.0)
+
+    def flush(self) -> Tuple[int, int]:
+        """Draw and clear the queued lines (FrameData must be bound); returns (draws, lines)."""
+        depth_count, overlay_count = self._counts
+        if not self.enabled or depth_count + overlay_count == 0:
+            self.clear()
+            return 0, 0
+
+        self._ensure_buffers()
+        glBindBuffer(GL_ARRAY_BUFFER, self._vbo)
+        # Both variants in one upload: depth-tested vertices, then overlay vertices
+        stride = DEBUG_VERTEX_FLOATS * 4
+        glBufferData(GL_ARRAY_BUFFER, (depth_count + overlay_count) * stride, None, GL_STREAM_DRAW)
+        if depth_count:
+            glBufferSubData(GL_ARRAY_BUFFER, 0, depth_count * stride, self._vertices[0][:depth_count])
+        if overlay_count:
+            glBufferSubData(GL_ARRAY_BUFFER, depth_count * stride, overlay_count * stride, self._vertices[1][:overlay_count])
+
+        self.state.use_program(self.shader.program)
+        self.state.bind_vertex_array(self.vao)
+        depth_test = glIsEnabled(GL_DEPTH_TEST)
+        draws = 0
+        if depth_count:
+            glDrawArrays(GL_LINES, 0, depth_count)
+            draws += 1
+        if overlay_count:
+            glDisable(GL_DEPTH_TEST)
+            glDrawArrays(GL_LINES, depth_count, overlay_count)
+            draws += 1
+        if depth_test:
+            glEnable(GL_DEPTH_TEST)
+
+        lines = self.line_count
+        self.clear()
+        return draws, lines
+
+    def clear(self) -> None:
+        """Drop the queued lines."""
+        self._counts = [0, 0]
+
+    def _reserve(self, count: int, overlay: bool) -> np.ndarray:
+        """Rows for `count` more vertices of a variant, growing its buffer by doubling."""
+        variant = 1 if overlay else 0
+        start = self._counts[variant]
+        end = start + count
+        vertices = self._vertices[variant]
+        if end > len(vertices):
+            grown = np.empty((max(end, 2 * len(vertices)), DEBUG_VERTEX_FLOATS), dtype=np.float32)
+            grown[:start] = vertices[:start]
+            self._vertices[variant] = vertices = grown
+        self._counts[variant] = end
+        return vertices[start:end]
+
+    def _circle(self, segments: int) -> np.ndarray:
+        """Unit circle as a line list of `segments` segments, cached."""
+        circle = self._circles.get(segments)
+        if circle is None:
+            angles = np.linspace(0.0, 2.0 * math.pi, segments + 1, dtype=np.float32)
+            points = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+            circle = self._circles[segments] = np.stack([points[:-1], points[1:]], axis=1).reshape(-1, 2)
+        return circle
+
+    def _ensure_buffers(self) -> None:
+        """Create the VAO and vertex buffer on first use."""
+        if self.vao is not None:
+            return
+        self.vao = glGenVertexArrays(1)
+        self._vbo = glGenBuffers(1)
+        self.state.bind_vertex_array(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self._vbo)
+        stride = DEBUG_VERTEX_FLOATS * 4
+        glVertexAttribPointer(ATTRIB_DEBUG_POSITION, 3, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(ATTRIB_DEBUG_POSITION)
+        glVertexAttribPointer(ATTRIB_DEBUG_COLOR, 4, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(12))
+        glEnableVertexAttribArray(ATTRIB_DEBUG_COLOR)
+
+    def release(self) -> None:
+        """Delete the VAO and vertex buffer."""
+        if self.vao is None:
+            return
+        glDeleteBuffers(1, [self._vbo])
+        glDeleteVertexArrays(1, [self.vao])
+        self.vao = self._vbo = None
+
+    def __repr__(self) -> str:
+        return f"DebugDraw(lines={self.line_count}, enabled={self.enabled})"
+
+
+class NullDebugDraw:
+    """DebugDraw stand-in for release builds: every call is a no-op."""
+
+    enabled = False
+    line_count = 0
+
+    def line(self, *args, **kwargs) -> None:
+        pass
+
+    lines = box = aabb = sphere = frustum = axes = clear = release = line
+
+    def flush(self) -> Tuple[int, int]:
+        return 0, 0
+
+    def __repr__(self) -> str:
+        return "NullDebugDraw()"
+
+
+def _transform_points(matrix: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Apply a 4x4 matrix to (N, 3) points, with the perspective divide."""
+    matrix = np.asarray(matrix)
+    transformed = points @ matrix[:3, :3].T + matrix[:3, 3]
+    w = points @ matrix[3, :3] + matrix[3, 3]
+    return (transformed / w[:, None]).astype(np.float32)
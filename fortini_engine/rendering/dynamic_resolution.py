@@ -0,0 +1,255 @@
+"""Dynamic resolution scaling driven by measured frame time.
+
+`DynamicResolution` wraps a renderer the way `FrameCapture` does: each frame is
+rendered at `scale` times the output size into an offscreen target and then
+upscaled to the window. A `ResolutionController` picks the scale from the
+recent frame cost, the larger of the CPU time reported by the game loop and
+the GPU time measured with timer queries, read back a few frames late so they
+never stall.
+
+The controller has a dead band for hysteresis. It lowers the scale as soon
+as the average frame time exceeds the target, aiming a little below it. It
+raises the scale one step only once the average stays under
+`raise_threshold * target`. After every change it collects a full window of
+samples at the new size before deciding again.
+"""
+
+from collections import deque
+from typing import Dict, Optional
+import ctypes
+import math
+import time
+from OpenGL.GL import *
+import numpy as np
+from fortini_engine.rendering.capture import RenderTarget
+from fortini_engine.rendering.software_renderer import SoftwareRenderer
+
+
+class ResolutionController:
+    """Chooses a render scale from recent frame times, with hysteresis."""
+
+    def __init__(self, target_ms: float = 1000.0 / 60.0, min_scale: float = 0.5, max_scale: float = 1.0,
+                 step: float = 0.05, window: int = 20, raise_threshold: float = 0.75, headroom: float = 0.9):
+        self.target_ms = target_ms
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.step = step                        # scales are multiples of this
+        self.raise_threshold = raise_threshold  # fraction of the target to stay under before growing
+        self.headroom = headroom                # fraction of the target aimed for when shrinking
+        self.samples = deque(maxlen=window)
+        self.scale = max_scale
+        self.frame_ms = 0.0
+        self.changes = 0
+
+    @property
+    def average_ms(self) -> float:
+        """Mean frame time over the sample window."""
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
+
+    @property
+    def peak_ms(self) -> float:
+        """Slowest frame in the sample window."""
+        return max(self.samples) if self.samples else 0.0
+
+    def update(self, frame_ms: float) -> float:
+        """Record a frame's cost and return the scale for the next frame."""
+        self.frame_ms = frame_ms
+        self.samples.append(frame_ms)
+        if len(self.samples) < self.samples.maxlen:
+            return self.scale
+
+        average = self.average_ms
+        scale = self.scale
+        if average > self.target_ms:
+            # Cost scales with pixel count, i.e. with scale squared
+            wanted = scale * math.sqrt(self.target_ms * self.headroom / average)
+            scale = min(self._quantize(wanted, math.floor), scale - self.step)
+        elif average < self.target_ms * self.raise_threshold:
+            scale = self._quantize(scale + self.step, round)
+        scale = min(max(scale, self.min_scale), self.max_scale)
+
+        if abs(scale - self.scale) > 1e-6:
+            self.scale = scale
+            self.changes += 1
+            # Samples taken at the old size no longer describe the cost
+            self.samples.clear()
+        return self.scale
+
+    def reset(self) -> None:
+        """Forget the history and return to full resolution."""
+        self.samples.clear()
+        self.scale = self.max_scale
+
+    def _quantize(self, scale: float, rounding) -> float:
+        """Snap a scale to a multiple of `step`."""
+        return rounding(scale / self.step + 1e-6) * self.step
+
+    def __repr__(self) -> str:
+        return f"ResolutionController(scale={self.scale:.2f}, average_ms={self.average_ms:.2f})"
+
+
+class DynamicResolution:
+    """Renders frames at a controller-chosen fraction of the output size and upscales them."""
+
+    def __init__(self, renderer, width: int, height: int, controller: Optional[ResolutionController] = None,
+                 timer_queries: int = 4):
+        self.renderer = renderer
+        self.width = width
+        self.height = height
+        self.controller = controller or ResolutionController()
+        self.enabled = True
+
+        self.cpu_ms = 0.0
+        self.gpu_ms = 0.0
+        self._reported_cpu_ms = None
+        self.target: Optional[RenderTarget] = None
+        self._free_queries = []
+        self._pending_queries = deque()
+        self._upscale_rows = self._upscale_cols = None
+        self._upscale_key = None
+
+        if not self.software:
+            # Allocated at full size once; smaller scales only shrink the viewport
+            self.target = RenderTarget(width, height)
+            self._free_queries = [int(query) for query in np.atleast_1d(glGenQueries(timer_queries))]
+
+    @property
+    def software(self) -> bool:
+        """Whether frames come from the CPU rasterizer instead of OpenGL."""
+        return isinstance(self.renderer, SoftwareRenderer)
+
+    @property
+    def scale(self) -> float:
+        """Current fraction of the output size rendered per axis."""
+        return self.controller.scale if self.enabled else 1.0
+
+    @property
+    def render_size(self) -> tuple:
+        """Size of the scaled render, in pixels."""
+        scale = self.scale
+        return max(1, round(self.width * scale)), max(1, round(self.height * scale))
+
+    def record_cpu_time(self, milliseconds: float) -> None:
+        """Report the CPU cost of the whole frame (update + render), measured by the game loop."""
+        self._reported_cpu_ms = milliseconds
+
+    def render(self, scene, camera) -> None:
+        """Render a frame at the current scale and upscale it to the output."""
+        start = time.perf_counter()
+        if self.software:
+            self._render_software(scene, camera)
+        else:
+            self._render_gl(scene, camera)
+        render_ms = (time.perf_counter() - start) * 1000.0
+
+        # Frame cost: the slower of the CPU frame and the GPU work
+        self.cpu_ms = self._reported_cpu_ms if self._reported_cpu_ms is not None else render_ms
+        self._reported_cpu_ms = None
+        if self.enabled:
+            self.controller.update(max(self.cpu_ms, self.gpu_ms))
+
+    def get_image(self) -> np.ndarray:
+        """Return the last software frame upscaled to the output size."""
+        image = self.renderer.get_image()
+        if image.shape[:2] == (self.height, self.width):
+            return image
+        height, width = image.shape[:2]
+        key = (width, height, self.width, self.height)
+        if key != self._upscale_key:
+            # Nearest-neighbour lookup tables, rebuilt only when a size changes
+            self._upscale_rows = np.minimum((np.arange(self.height) + 0.5) * height / self.height, height - 1).astype(np.intp)
+            self._upscale_cols = np.minimum((np.arange(self.width) + 0.5) * width / self.width, width - 1).astype(np.intp)
+            self._upscale_key = key
+        return image[self._upscale_rows[:, None], self._upscale_cols[None, :]]
+
+    def resize(self, width: int, height: int) -> None:
+        """Change the output size, reallocating the offscreen target."""
+        self.width, self.height = width, height
+        if self.target is not None:
+            self.target.release()
+            self.target = RenderTarget(width, height)
+
+    def stats(self) -> Dict[str, float]:
+        """Scale and frame-time statistics."""
+        width, height = self.render_size
+        return {
+            "scale": self.scale,
+            "render_width": width,
+            "render_height": height,
+            "frame_ms": self.controller.frame_ms,
+            "average_ms": self.controller.average_ms,
+            "peak_ms": self.controller.peak_ms,
+            "cpu_ms": self.cpu_ms,
+            "gpu_ms": self.gpu_ms,
+            "target_ms": self.controller.target_ms,
+            "scale_changes": self.controller.changes,
+        }
+
+    def _render_software(self, scene, camera) -> None:
+        """Render on the CPU at the scaled size; get_image() upscales."""
+        size = self.render_size
+        if (self.renderer.width, self.renderer.height) != size:
+            self.renderer.resize(*size)
+        self.renderer.render(scene, camera)
+
+    def _render_gl(self, scene, camera) -> None:
+        """Render into the offscreen target's corner and blit it, filtered, to the bound framebuffer."""
+        renderer = self.renderer
+        width, height = self.render_size
+        previous_draw = int(glGetIntegerv(GL_DRAW_FRAMEBUFFER_BINDING))
+        previous_read = int(glGetIntegerv(GL_READ_FRAMEBUFFER_BINDING))
+        size = (renderer.width, renderer.height)
+
+        self._collect_gpu_times()
+        query = self._free_queries.pop() if self._free_queries else None
+        if query is not None:
+            glBeginQuery(GL_TIME_ELAPSED, query)
+
+        glBindFramebuffer(GL_FRAMEBUFFER, self.target.fbo)
+        renderer.width, renderer.height = width, height
+        # The overlay is drawn after the blit, at output resolution, so HUD text is never resampled
+        defer_overlay = renderer.defer_overlay
+        renderer.defer_overlay = True
+        try:
+            renderer.render(scene, camera)
+        finally:
+            renderer.width, renderer.height = size
+            renderer.defer_overlay = defer_overlay
+            glBindFramebuffer(GL_READ_FRAMEBUFFER, self.target.fbo)
+            glBindFramebuffer(GL_DRAW_FRAMEBUFFER, previous_draw)
+            filtering = GL_NEAREST if (width, height) == (self.width, self.height) else GL_LINEAR
+            glBlitFramebuffer(0, 0, width, height, 0, 0, self.width, self.height, GL_COLOR_BUFFER_BIT, filtering)
+            glBindFramebuffer(GL_READ_FRAMEBUFFER, previous_read)
+            glViewport(0, 0, self.width, self.height)
+            if not defer_overlay:
+                renderer.render_overlay(self.width, self.height)
+            if query is not None:
+                glEndQuery(GL_TIME_ELAPSED)
+                self._pending_queries.append(query)
+
+    def _collect_gpu_times(self) -> None:
+        """Read finished timer queries, oldest first, without waiting."""
+        while self._pending_queries:
+            query = self._pending_queries[0]
+            if not glGetQueryObjectiv(query, GL_QUERY_RESULT_AVAILABLE):
+                break
+            elapsed = ctypes.c_uint64(0)
+            glGetQueryObjectui64v(query, GL_QUERY_RESULT, ctypes.byref(elapsed))
+            self.gpu_ms = elapsed.value / 1e6
+            self._free_queries.append(self._pending_queries.popleft())
+
+    def release(self) -> None:
+        """Delete the offscreen target and timer queries."""
+        if self.software:
+            return
+        queries = self._free_queries + list(self._pending_queries)
+        if queries:
+            glDeleteQueries(len(queries), queries)
+        self._free_queries, self._pending_queries = [], deque()
+        if self.target is not None:
+            self.target.release()
+            self.target = None
+
+    def __repr__(self) -> str:
+        width, height = self.render_size
+        return f"DynamicResolution({self.width}x{self.height}, scale={self.scale:.2f}, render={width}x{height})"
@@ -0,0 +1,57 @@
+"""Tracks bound OpenGL state to skip redundant binds."""
+
+from OpenGL.GL import glUseProgram, glBindVertexArray, glActiveTexture, glBindTexture, GL_TEXTURE0, GL_TEXTURE_2D
+
+
+class GLStateCache:
+    """Shadow of the currently bound program, vertex array and 2D textures."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the shadowed state (e.g. after external GL code ran)."""
+        self.program = None
+        self.vertex_array = None
+        self.program_binds = 0
+        self.program_binds_skipped = 0
+        self.vertex_array_binds = 0
+        self.vertex_array_binds_skipped = 0
+        self.active_unit = None
+        self.textures = {}  # texture unit -> bound 2D texture
+        self.texture_binds = 0
+        self.texture_binds_skipped = 0
+
+    def use_program(self, program) -> None:
+        """glUseProgram, skipped when the program is already bound."""
+        if program == self.program:
+            self.program_binds_skipped += 1
+            return
+        glUseProgram(program)
+        self.program = program
+        self.program_binds += 1
+
+    def bind_vertex_array(self, vao) -> None:
+        """glBindVertexArray, skipped when the VAO is already bound."""
+        if vao == self.vertex_array:
+            self.vertex_array_binds_skipped += 1
+            return
+        glBindVertexArray(vao)
+        self.vertex_array = vao
+        self.vertex_array_binds += 1
+
+    def bind_texture(self, unit: int, texture) -> None:
+        """glBindTexture(GL_TEXTURE_2D) on a unit, skipped when already bound there."""
+        if self.textures.get(unit) == texture:
+            self.texture_binds_skipped += 1
+            return
+        if unit != self.active_unit:
+            glActiveTexture(GL_TEXTURE0 + unit)
+            self.active_unit = unit
+        glBindTexture(GL_TEXTURE_2D, texture)
+        self.textures[unit] = texture
+        self.texture_binds += 1
+
+    def forget_texture(self, texture) -> None:
+        """Drop a deleted texture from the shadow (GL unbinds it and may reuse its name)."""
+        self.textures = {unit: bound for unit, bound in self.textures.items() if bound != texture}
@@ -0,0 +1,38 @@
+"""Scene light gathering shared by the renderers."""
+
+from typing import Optional, Tuple
+import numpy as np
+
+# Upper bound on lights in the LightData block; ranged lights beyond it are
+# handled by clustered lighting
+MAX_LIGHTS = 32
+
+# Used when a scene has no light components
+DEFAULT_LIGHT_POSITION = (5.0, 5.0, 5.0)
+DEFAULT_LIGHT_COLOR = (1.0, 1.0, 1.0)
+
+
+def collect_lights(scene, max_lights: Optional[int] = None, default_position=DEFAULT_LIGHT_POSITION,
+                   default_color=DEFAULT_LIGHT_COLOR) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack the scene's lights into (N, 4) position and color arrays.
+
+    Positions hold the world position in xyz and the range in w (0 = no
+    falloff); colors hold color * intensity in rgb. Scenes without lights get
+    a single default light. At most `max_lights` lights are returned (all of
+    them when None).
+    """
+    objects = scene.get_lights()[:max_lights]
+    if not objects:
+        positions = np.array([(*default_position, 0.0)], dtype=np.float32)
+        colors = np.array([(*default_color, 1.0)], dtype=np.float32)
+        return positions, colors
+
+    world = scene.gather_world_matrices(objects)
+    positions = np.empty((len(objects), 4), dtype=np.float32)
+    colors = np.ones((len(objects), 4), dtype=np.float32)
+    positions[:, :3] = world[:, :3, 3]
+    lights = [obj.components["light"] for obj in objects]
+    positions[:, 3] = [light.range for light in lights]
+    colors[:, :3] = [light.color[:3] for light in lights]
+    colors[:, :3] *= np.array([light.intensity for light in lights], dtype=np.float32)[:, None]
+    return positions, colors
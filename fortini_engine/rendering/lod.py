@@ -0,0 +1,94 @@
+"""Per-object mesh LOD selection from projected screen size."""
+
+from typing import List, Sequence
+import numpy as np
+
+
+def projected_sizes(world_matrices: np.ndarray, centers: np.ndarray, radii: np.ndarray,
+                    view_projection: np.ndarray, projection_scale: float) -> np.ndarray:
+    """Bounding-sphere diameters of N placed local bounds, as fractions of the screen height.
+
+    Objects at or behind the camera plane get a huge size.
+    """
+    world_centers = np.einsum("nij,nj->ni", world_matrices[:, :3, :3], centers) + world_matrices[:, :3, 3]
+    scale = np.linalg.norm(world_matrices[:, :3, :3], axis=1).max(axis=1)
+    w = world_centers @ view_projection[3, :3] + view_projection[3, 3]
+    # NDC diameter (2 r P11 / w) over the NDC screen height (2)
+    return radii * scale * projection_scale / np.maximum(w, 1e-6)
+
+
+class LODSelector:
+    """Pick a `Mesh.lods` level for every visible object, with hysteresis.
+
+    The projected size is the bounding-sphere diameter as a fraction of the
+    screen height. An object moves to a coarser level only once its size is
+    `hysteresis` below the level's threshold, and back to a finer one only
+    once it is `hysteresis` above it, so objects near a threshold do not
+    flicker between levels. The current level is kept on `obj.lod_level`.
+    """
+
+    def __init__(self, hysteresis: float = 0.1, bias: float = 1.0):
+        self.hysteresis = hysteresis
+        self.bias = bias  # > 1 keeps finer levels longer
+        self.reduced = 0  # objects drawn below level 0 by the last select()
+
+    def select(self, renderables: Sequence, world_matrices: np.ndarray, indices,
+               view_projection: np.ndarray, projection_scale: float) -> List:
+        """Return the mesh to draw for every renderable; only `indices` are updated.
+
+        `projection_scale` is the projection matrix's [1, 1] entry. Bounds,
+        thresholds and the level -> mesh table are built once per distinct
+        mesh; sizes, levels and the chosen meshes are computed for all objects
+        at once. `reduced` is set to the number of objects drawn below level 0.
+        """
+        self.reduced = 0
+        meshes = [obj.mesh for obj in renderables]
+        rows = np.asarray(indices, dtype=np.intp)
+        visible = [meshes[i] for i in rows.tolist()]
+        chains = {id(mesh): mesh for mesh in visible if getattr(mesh, "lods", None)}
+        if not chains:
+            return meshes
+
+        slot_of = {key: slot for slot, key in enumerate(chains)}
+        slots = np.fromiter((slot_of.get(id(mesh), -1) for mesh in visible), dtype=np.intp, count=len(visible))
+        keep = slots >= 0
+        rows, slots = rows[keep], slots[keep]
+        count = len(rows)
+
+        # Per distinct mesh: bounds, thresholds padded with -inf, and the mesh of every level
+        chains = list(chains.values())
+        levels_available = max(len(mesh.lods) for mesh in chains)
+        centers = np.empty((len(chains), 3), dtype=np.float32)
+        radii = np.empty(len(chains), dtype=np.float32)
+        table = np.full((len(chains), levels_available), -np.inf, dtype=np.float32)
+        options = np.empty((len(chains), levels_available + 1), dtype=object)
+        for slot, mesh in enumerate(chains):
+            centers[slot], _half, radii[slot] = mesh.get_bounds()
+            thresholds = mesh.get_lod_thresholds()
+            table[slot, :len(thresholds)] = thresholds
+            for level in range(len(thresholds) + 1):
+                options[slot, level] = mesh.get_lod(level)
+
+        size = projected_sizes(
+            world_matrices[rows], centers[slots], radii[slots], view_projection, projection_scale,
+        ) * self.bias
+
+        objects = np.empty(len(renderables), dtype=object)
+        objects[:] = renderables
+        objects = objects[rows]
+        current = np.fromiter((getattr(obj, "lod_level", 0) for obj in objects), dtype=np.int64, count=count)
+        # Level = number of thresholds the size is below; keep the current level
+        # while it lies between the levels for the widened and narrowed sizes
+        thresholds = table[slots]
+        at_least = np.sum(size[:, None] * (1.0 + self.hysteresis) < thresholds, axis=1)
+        at_most = np.sum(size[:, None] * (1.0 - self.hysteresis) < thresholds, axis=1)
+        levels = np.clip(current, at_least, at_most)
+
+        for k in np.flatnonzero(levels != current).tolist():
+            objects[k].lod_level = int(levels[k])
+        self.reduced = int(np.count_nonzero(levels))
+
+        chosen = np.empty(len(meshes), dtype=object)
+        chosen[:] = meshes
+        chosen[rows] = options[slots, levels]
+        return chosen.tolist()
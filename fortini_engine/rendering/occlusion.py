@@ -0,0 +1,220 @@
+"""CPU hierarchical-Z occlusion culling.
+
+Objects flagged as occluders are rasterized into a small depth buffer with
+vectorized NumPy, a min/max depth pyramid is built from it, and the screen
+rectangle of every object's bounding box is compared against the pyramid.
+Occluders cover the pixels whose centers they contain, at their farthest
+depth inside the pixel; tested rectangles are grown by one pixel so partial
+coverage along silhouettes never hides an object (only gaps between occluders
+narrower than a buffer pixel count as closed). Objects crossing the near
+plane are never culled. No GL is involved, so results are deterministic and can be
+checked headless.
+"""
+
+from typing import Sequence
+import numpy as np
+from fortini_engine.rendering.culling import gather_bounds
+
+# Depth of an empty pixel (the far plane, in [0, 1] window depth)
+FAR_DEPTH = 1.0
+
+
+class OcclusionCuller:
+    """Low-resolution occluder depth buffer with a min/max pyramid."""
+
+    def __init__(self, width: int = 256, height: int = 128):
+        self.width = width
+        self.height = height
+        self.depth = np.full((height, width), FAR_DEPTH, dtype=np.float32)
+        self.max_levels = [self.depth]
+        self.min_levels = [self.depth]
+        self.view_projection = np.eye(4, dtype=np.float32)
+
+        # Upper bound on (triangle, pixel) pairs evaluated per batch
+        self.max_fragments = 1 << 20
+        self.occluder_triangles = 0
+
+    def begin(self, view_projection: np.ndarray) -> None:
+        """Clear the depth buffer for a new view."""
+        self.view_projection = np.asarray(view_projection, dtype=np.float64)
+        self.depth = np.full((self.height, self.width), FAR_DEPTH, dtype=np.float32)
+        self.max_levels = [self.depth]
+        self.min_levels = [self.depth]
+        self.occluder_triangles = 0
+
+    def add_occluders(self, meshes: Sequence, world_matrices: np.ndarray) -> None:
+        """Rasterize occluder meshes placed by (N, 4, 4) world matrices."""
+        for mesh, model in zip(meshes, world_matrices):
+            vertices = np.asarray(mesh.vertices, dtype=np.float64).reshape(-1, 3)
+            triangles = np.asarray(mesh.indices, dtype=np.int64).reshape(-1, 3)
+            if not len(triangles):
+                continue
+            mvp = self.view_projection @ model
+            clip = vertices @ mvp[:, :3].T + mvp[:, 3]
+            self._rasterize(clip[triangles])
+
+    def build_pyramid(self) -> None:
+        """Reduce the depth buffer into min and max mip chains down to 1x1."""
+        self.max_levels = [self.depth]
+        self.min_levels = [self.depth]
+        while self.max_levels[-1].shape != (1, 1):
+            self.max_levels.append(_reduce(self.max_levels[-1], np.maximum))
+            self.min_levels.append(_reduce(self.min_levels[-1], np.minimum))
+
+    def test(self, world_matrices: np.ndarray, centers: np.ndarray, half_extents: np.ndarray) -> np.ndarray:
+        """Return a mask of bounding boxes (local bounds placed by world matrices) not hidden by occluders."""
+        count = len(world_matrices)
+        visible = np.ones(count, dtype=bool)
+        if not count:
+            return visible
+
+        # Oriented box corners in clip space
+        signs = np.array([(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)], dtype=np.float64)
+        local = centers[:, None, :] + signs[None, :, :] * half_extents[:, None, :]
+        mvp = self.view_projection[None] @ world_matrices.astype(np.float64)
+        clip = np.einsum("nij,nkj->nki", mvp[:, :, :3], local) + mvp[:, None, :, 3]
+        w = clip[..., 3]
+
+        # Boxes reaching the camera plane cannot be bounded on screen
+        testable = np.all(w > 1e-6, axis=1)
+        rows = np.flatnonzero(testable)
+        if not rows.size:
+            return visible
+        clip, w = clip[rows], w[rows]
+        x = (clip[..., 0] / w * 0.5 + 0.5) * self.width
+        y = (clip[..., 1] / w * 0.5 + 0.5) * self.height
+        nearest = (clip[..., 2] / w * 0.5 + 0.5).min(axis=1)
+
+        x0 = np.clip(np.floor(x.min(axis=1)) - 1, 0, self.width - 1).astype(np.int64)
+        x1 = np.clip(np.floor(x.max(axis=1)) + 1, 0, self.width - 1).astype(np.int64)
+        y0 = np.clip(np.floor(y.min(axis=1)) - 1, 0, self.height - 1).astype(np.int64)
+        y1 = np.clip(np.floor(y.max(axis=1)) + 1, 0, self.height - 1).astype(np.int64)
+
+        # Coarse test on the level where the rectangle spans at most 2x2 texels
+        span = np.maximum(x1 - x0, y1 - y0) + 1
+        top = len(self.max_levels) - 1
+        level = np.clip(np.ceil(np.log2(span)), 0, top).astype(np.int64)
+        farthest = self._region(self.max_levels, level, x0, x1, y0, y1, 2, np.max)
+        occluded = nearest > farthest
+
+        # Undecided boxes (occluders both in front and behind) get a finer look
+        closest = self._region(self.min_levels, level, x0, x1, y0, y1, 2, np.min)
+        refine = np.flatnonzero(~occluded & (nearest > closest) & (level > 0))
+        if refine.size:
+            fine = np.maximum(level[refine] - 2, 0)
+            farthest = self._region(
+                self.max_levels, fine, x0[refine], x1[refine], y0[refine], y1[refine], 5, np.max,
+            )
+            occluded[refine] = nearest[refine] > farthest
+
+        visible[rows[occluded]] = False
+        return visible
+
+    def cull(self, view_projection: np.ndarray, occluders: Sequence, occluder_matrices: np.ndarray,
+             objects: Sequence, world_matrices: np.ndarray, indices) -> list:
+        """Rasterize `occluders` for this view and drop hidden objects from `indices`."""
+        self.begin(view_projection)
+        self.add_occluders([obj.mesh for obj in occluders], occluder_matrices)
+        self.build_pyramid()
+        indices = np.asarray(indices, dtype=np.intp)
+        if not indices.size:
+            return []
+        centers, half_extents, _radii = gather_bounds([objects[i] for i in indices])
+        visible = self.test(world_matrices[indices], centers, half_extents)
+        return indices[visible].tolist()
+
+    def _region(self, levels, level, x0, x1, y0, y1, window: int, reduce) -> np.ndarray:
+        """Reduce pyramid texels covering pixel rectangles, at most `window` per axis."""
+        result = np.empty(len(level), dtype=np.float32)
+        offsets = np.arange(window)
+        for l in np.unique(level):
+            rows = np.flatnonzero(level == l)
+            texels = levels[l]
+            h, w = texels.shape
+            tx0, tx1 = np.minimum(x0[rows] >> l, w - 1), np.minimum(x1[rows] >> l, w - 1)
+            ty0, ty1 = np.minimum(y0[rows] >> l, h - 1), np.minimum(y1[rows] >> l, h - 1)
+            # Clamping repeats edge texels, which leaves min/max unchanged
+            tx = np.minimum(tx0[:, None] + offsets, tx1[:, None])
+            ty = np.minimum(ty0[:, None] + offsets, ty1[:, None])
+            samples = texels[ty[:, :, None], tx[:, None, :]]
+            result[rows] = reduce(samples.reshape(len(rows), -1), axis=1)
+        return result
+
+    def _rasterize(self, tri_clip: np.ndarray) -> None:
+        """Write (T, 3, 4) clip-space triangles into the depth buffer."""
+        # Triangles crossing the near plane are skipped (fewer occluders is safe)
+        keep = np.all(tri_clip[..., 3] > 1e-6, axis=1)
+        tri_clip = tri_clip[keep]
+        if not len(tri_clip):
+            return
+        w = tri_clip[..., 3]
+        sx = (tri_clip[..., 0] / w * 0.5 + 0.5) * self.width
+        sy = (tri_clip[..., 1] / w * 0.5 + 0.5) * self.height
+        sz = tri_clip[..., 2] / w * 0.5 + 0.5
+
+        # Edge functions a*x + b*y + c, positive inside; edge i is opposite vertex i
+        x0, x1, x2 = sx[:, 0], sx[:, 1], sx[:, 2]
+        y0, y1, y2 = sy[:, 0], sy[:, 1], sy[:, 2]
+        area = (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
+        orient = np.sign(area)
+        a = np.stack((y1 - y2, y2 - y0, y0 - y1), axis=1) * orient[:, None]
+        b = np.stack((x2 - x1, x0 - x2, x1 - x0), axis=1) * orient[:, None]
+        c = np.stack((x1 * y2 - x2 * y1, x2 * y0 - x0 * y2, x0 * y1 - x1 * y0), axis=1) * orient[:, None]
+        area = np.abs(area)
+
+        # Depth plane and its steepest change across half a pixel
+        inv_area = 1.0 / np.where(area > 0, area, 1.0)
+        dzdx = np.sum(a * sz, axis=1) * inv_area
+        dzdy = np.sum(b * sz, axis=1) * inv_area
+        z_c = np.sum(c * sz, axis=1) * inv_area
+        slack = 0.5 * (np.abs(dzdx) + np.abs(dzdy))
+
+        # Pixel centers inside the bounding box
+        px0 = np.clip(np.ceil(sx.min(axis=1) - 0.5), 0, self.width).astype(np.int64)
+        px1 = np.clip(np.floor(sx.max(axis=1) - 0.5), -1, self.width - 1).astype(np.int64)
+        py0 = np.clip(np.ceil(sy.min(axis=1) - 0.5), 0, self.height).astype(np.int64)
+        py1 = np.clip(np.floor(sy.max(axis=1) - 0.5), -1, self.height - 1).astype(np.int64)
+        span_x = np.maximum(px1 - px0 + 1, 0)
+        span_y = np.maximum(py1 - py0 + 1, 0)
+        counts = np.where(area > 1e-9, span_x * span_y, 0)
+        live = np.flatnonzero(counts)
+        self.occluder_triangles += len(live)
+        if not live.size:
+            return
+
+        depth = self.depth.reshape(-1)
+        for tris in _batches(live, counts[live], self.max_fragments):
+            n = counts[tris]
+            owner = np.repeat(tris, n)
+            local = np.arange(int(n.sum())) - np.repeat(np.cumsum(n) - n, n)
+            px = px0[owner] + local % span_x[owner]
+            py = py0[owner] + local // span_x[owner]
+            cx, cy = px + 0.5, py + 0.5
+
+            # Covered centers, at the farthest depth the triangle reaches in the pixel
+            edges = a[owner] * cx[:, None] + b[owner] * cy[:, None] + c[owner]
+            inside = np.all(edges >= 0.0, axis=1)
+            z = dzdx[owner] * cx + dzdy[owner] * cy + z_c[owner] + slack[owner]
+            inside &= z >= 0.0
+            np.minimum.at(depth, (py * self.width + px)[inside], z[inside].astype(np.float32))
+
+
+def _reduce(level: np.ndarray, op) -> np.ndarray:
+    """Halve a depth level with `op` over 2x2 blocks (odd edges are repeated)."""
+    h, w = level.shape
+    if h % 2 or w % 2:
+        level = np.pad(level, ((0, h % 2), (0, w % 2)), mode="edge")
+    h2, w2 = level.shape[0] // 2, level.shape[1] // 2
+    return op.reduce(op.reduce(level.reshape(h2, 2, w2, 2), axis=3), axis=1)
+
+
+def _batches(rows: np.ndarray, counts: np.ndarray, limit: int):
+    """Split rows into consecutive groups whose counts sum to about `limit`."""
+    start = 0
+    totals = np.cumsum(counts)
+    while start < len(rows):
+        base = totals[start - 1] if start else 0
+        end = int(np.searchsorted(totals, base + limit, side="right"))
+        end = max(end, start + 1)
+        yield rows[start:end]
+        start = end
@@ -4,57 +4,207 @@ from OpenGL.GL import *
 from OpenGL.GL import shaders
 import numpy as np
 from pathlib import Path
+from typing import Any, Dict, List, Optional
 from fortini_engine.utils.logger import Logger
+from fortini_engine.utils.color import to_rgba
+from fortini_engine.utils.math_utils import Matrix4, MatrixPool
+from fortini_engine.rendering.culling import extract_frustum_planes, cull_bounds, gather_bounds
+from fortini_engine.rendering.occlusion import OcclusionCuller
+from fortini_engine.rendering.render_stats import RenderStats
+from fortini_engine.rendering.render_queue import RenderQueue, PASS_OPAQUE, PASS_TRANSPARENT, DEPTH_MAX, is_transparent
+from fortini_engine.rendering.command_buffer import CommandBuffer
+from fortini_engine.rendering.gl_state import GLStateCache
+from fortini_engine.rendering.buffer_arena import GeometryArena
+from fortini_engine.rendering.static_batch import StaticBatcher
+from fortini_engine.rendering.lod import LODSelector, projected_sizes
+from fortini_engine.rendering.lighting import MAX_LIGHTS, collect_lights
+from fortini_engine.rendering.clustered_lighting import ClusteredLighting
+from fortini_engine.rendering.textures import TextureManager
+from fortini_engine.rendering.particle_renderer import ParticleRenderer
+from fortini_engine.rendering.sprite_batch import SpriteBatch
+from fortini_engine.rendering.debug_draw import DEBUG_DRAW_ENABLED, DebugDraw, NullDebugDraw
+from fortini_engine.rendering.uniform_buffers import (
+    BLOCK_BINDINGS,
+    SAMPLER_UNITS,
+    OBJECT_FLOATS,
+    FrameUniforms,
+    LightUniforms,
+    ObjectUniformRing,
+)
+from fortini_engine.rendering.shader_sources import (
+    DEFAULT_VERTEX_SHADER,
+    INSTANCED_VERTEX_SHADER,
+    PHONG_FRAGMENT_SHADER,
+    PARTICLE_VERTEX_SHADER,
+    PARTICLE_FRAGMENT_SHADER,
+    SPRITE_VERTEX_SHADER,
+    SPRITE_FRAGMENT_SHADER,
+    DEBUG_VERTEX_SHADER,
+    DEBUG_FRAGMENT_SHADER,
+)
 
 
 class Shader:
-    """OpenGL Shader Program."""
+    """OpenGL Shader Program.
+
+    Active uniforms are reflected once after linking into a name -> location
+    table, and the last value uploaded to each location is shadowed so that
+    repeated identical uploads are skipped. Known uniform blocks (FrameData,
+    LightData, ObjectData, ClusterData) are attached to their shared binding
+    points, and known samplers to their fixed texture units.
+    """
 
     def __init__(self, vertex_src: str, fragment_src: str):
         self.program = None
+        self.uniforms: Dict[str, int] = {}
+        self.blocks: Dict[str, int] = {}
+        self._values: Dict[int, Any] = {}
+        self.uploads = 0
+        self.uploads_skipped = 0
         self._compile(vertex_src, fragment_src)
 
     def _compile(self, vertex_src: str, fragment_src: str) -> None:
         """Compile vertex and fragment shaders."""
         try:
+            # Validation runs against the sampler units before _bind_samplers
+            # assigns them (every sampler starts on unit 0), so it is skipped
             self.program = shaders.compileProgram(
                 shaders.compileShader(vertex_src, GL_VERTEX_SHADER),
                 shaders.compileShader(fragment_src, GL_FRAGMENT_SHADER),
+                validate=False,
             )
         except Exception as e:
             logger = Logger().get_logger(self.__class__.__name__)
             logger.error(f"Shader compilation failed: {e}")
             self.program = None
+            return
+
+        self._reflect_uniforms()
+        self._bind_uniform_blocks()
+        self._bind_samplers()
+
+    def _reflect_uniforms(self) -> None:
+        """Build the uniform location table from the linked program."""
+        self.uniforms.clear()
+        self._values.clear()
+        count = glGetProgramiv(self.program, GL_ACTIVE_UNIFORMS)
+        for i in range(count):
+            name, _size, _type = glGetActiveUniform(self.program, i)
+            if isinstance(name, bytes):
+                name = name.decode()
+            location = glGetUniformLocation(self.program, name)
+            if location < 0:
+                continue  # uniform block members have no location
+            self.uniforms[name] = location
+            # Arrays are reported as "name[0]"; also accept the bare name
+            if name.endswith("[0]"):
+                self.uniforms[name[:-3]] = location
+
+    def _bind_uniform_blocks(self) -> None:
+        """Attach the program's shared uniform blocks to their binding points."""
+        self.blocks.clear()
+        for name, binding in BLOCK_BINDINGS.items():
+            index = glGetUniformBlockIndex(self.program, name)
+            if index != GL_INVALID_INDEX:
+                glUniformBlockBinding(self.program, index, binding)
+                self.blocks[name] = binding
+
+    def _bind_samplers(self) -> None:
+        """Point the program's shared samplers at their texture units."""
+        units = [(self.uniforms[name], unit) for name, unit in SAMPLER_UNITS.items() if name in self.uniforms]
+        if not units:
+            return
+        previous = glGetIntegerv(GL_CURRENT_PROGRAM)
+        glUseProgram(self.program)
+        for location, unit in units:
+            glUniform1i(location, unit)
+        glUseProgram(previous)
+
+    def has_block(self, name: str) -> bool:
+        """Check whether the program uses a shared uniform block."""
+        return name in self.blocks
 
     def use(self) -> None:
         """Use this shader program."""
         if self.program:
             glUseProgram(self.program)
 
+    def has_uniform(self, name: str) -> bool:
+        """Check whether the program has an active uniform with this name."""
+        return name in self.uniforms
+
+    def get_uniform_location(self, name: str) -> int:
+        """Get a uniform location from the cache (-1 if inactive)."""
+        return self.uniforms.get(name, -1)
+
+    def _should_upload(self, loc: int, value) -> bool:
+        """Return False when `value` matches the last upload to `loc`."""
+        if loc < 0:
+            return False
+        if self._values.get(loc) == value:
+            self.uploads_skipped += 1
+            return False
+        self._values[loc] = value
+        self.uploads += 1
+        return True
+
     def set_mat4(self, name: str, mat: np.ndarray) -> None:
         """Set a 4x4 matrix uniform."""
-        loc = glGetUniformLocation(self.program, name)
+        loc = self.uniforms.get(name, -1)
+        if loc < 0:
+            return
+        previous = self._values.get(loc)
+        if previous is not None and np.array_equal(previous, mat):
+            self.uploads_skipped += 1
+            return
+        if previous is None:
+            self._values[loc] = previous = np.empty((4, 4), dtype=np.float32)
+        np.copyto(previous, mat)
+        self.uploads += 1
         glUniformMatrix4fv(loc, 1, GL_TRUE, mat)
 
     def set_vec3(self, name: str, x: float, y: float, z: float) -> None:
         """Set a 3D vector uniform."""
-        loc = glGetUniformLocation(self.program, name)
-        glUniform3f(loc, x, y, z)
+        loc = self.uniforms.get(name, -1)
+        if self._should_upload(loc, (x, y, z)):
+            glUniform3f(loc, x, y, z)
+
+    def set_vec4(self, name: str, x: float, y: float, z: float, w: float) -> None:
+        """Set a 4D vector uniform."""
+        loc = self.uniforms.get(name, -1)
+        if self._should_upload(loc, (x, y, z, w)):
+            glUniform4f(loc, x, y, z, w)
 
     def set_float(self, name: str, value: float) -> None:
         """Set a float uniform."""
-        loc = glGetUniformLocation(self.program, name)
-        glUniform1f(loc, value)
+        loc = self.uniforms.get(name, -1)
+        if self._should_upload(loc, value):
+            glUniform1f(loc, value)
 
     def set_int(self, name: str, value: int) -> None:
         """Set an int uniform."""
-        loc = glGetUniformLocation(self.program, name)
-        glUniform1i(loc, value)
+        loc = self.uniforms.get(name, -1)
+        if self._should_upload(loc, value):
+            glUniform1i(loc, value)
+
+    def invalidate(self) -> None:
+        """Forget shadowed values, forcing the next uploads through."""
+        self._values.clear()
+
+
+# Per-instance attributes follow the per-vertex ones in buffer_arena
+ATTRIB_INSTANCE_MODEL = 3  # mat4 occupies locations 3-6
+ATTRIB_INSTANCE_COLOR = 7
+ATTRIB_INSTANCE_PARAMS = 8
 
 
 class OpenGLRenderer:
     """OpenGL rendering engine."""
 
+    # Floats per instance, laid out like the ObjectData block:
+    # 4x4 model matrix (column-major) + RGBA color + material parameters
+    INSTANCE_FLOATS = OBJECT_FLOATS
+
     def __init__(self, width: int, height: int):
         self.width = width
         self.height = height
@@ -63,157 +213,675 @@ class OpenGLRenderer:
         # Don't call glEnable/glClearColor here — context might not be ready yet.
         # ViewportPanel.initializeGL() will handle GL state setup.
 
-        # Create default shader
+        # Create default shaders
         self.default_shader = self._create_default_shader()
+        self.instanced_shader = self._create_instanced_shader()
+
+        # Scratch matrices for per-frame temporaries, recycled every render()
+        self.matrix_pool = MatrixPool()
+
+        self.frustum_culling = True
+        self.stats = RenderStats()
+        self._frustum_planes = np.empty((6, 4), dtype=np.float32)
+
+        # Groups with at least this many objects are drawn instanced
+        self.instancing_threshold = 2
+        self._instance_vbo = None
+        self._instance_data = np.empty((0, self.INSTANCE_FLOATS), dtype=np.float32)
+
+        self._frame_uniforms = None
+        self._frame_shaders: Dict[Shader, tuple] = {}
+
+        self.render_queue = RenderQueue()
+        self.state = GLStateCache()
+
+        # All mesh geometry lives in shared, sub-allocated buffers
+        self.arena = GeometryArena(self.state)
+        self.arena.layout_listeners.append(self._setup_instance_attributes)
+
+        # Material textures: decoded on workers, streamed in under upload and memory budgets
+        self.textures = TextureManager(self.state)
+
+        # Particle emitters are drawn as instanced billboards after the transparent pass
+        self.particle_shader = Shader(PARTICLE_VERTEX_SHADER, PARTICLE_FRAGMENT_SHADER)
+        self.particles = ParticleRenderer(self.state, self.textures)
+
+        # Debug lines queued with self.debug.line/box/sphere/frustum() during the
+        # frame; a no-op stand-in in release builds (see debug_draw)
+        self.debug_shader = None
+        self.debug = NullDebugDraw()
+        if DEBUG_DRAW_ENABLED:
+            self.debug_shader = Shader(DEBUG_VERTEX_SHADER, DEBUG_FRAGMENT_SHADER)
+            self.debug = DebugDraw(self.state, self.debug_shader)
+
+        # Sprite components and sprites queued with self.sprites.draw*() are
+        # batched into one dynamic buffer and drawn last, over the 3D scene
+        self.sprite_shader = Shader(SPRITE_VERTEX_SHADER, SPRITE_FRAGMENT_SHADER)
+        self.sprites = SpriteBatch(self.state, self.textures, self.sprite_shader)
+        # Screen-space batch (HUD, text) in window pixels from the bottom-left corner, drawn over
+        # everything. With `defer_overlay` set, render() leaves it to a render_overlay() call,
+        # so DynamicResolution can draw it at full resolution after upscaling the scene
+        self.overlay = SpriteBatch(self.state, self.textures, self.sprite_shader)
+        self._overlay_projection = Matrix4()
+        self.defer_overlay = False
+
+        # Opaque objects flagged static are pre-transformed into merged batches
+        self.static_batching = True
+        self.static_batcher = StaticBatcher()
+        self._identity_matrices = np.empty((0, 4, 4), dtype=np.float32)
+
+        # Objects hidden behind designated occluders are dropped before queuing
+        self.occlusion_culling = True
+        self.occlusion = OcclusionCuller()
+
+        # Meshes with generated LODs are drawn at a level picked from projected size
+        self.lod_selection = True
+        self.lod = LODSelector()
+
+        # Camera and light data are shared by all programs through std140 blocks;
+        # per-draw model/material data goes through a ring of ObjectData slots
+        self.frame_block = None
+        self.light_block = None
+        self.object_ring = None
+
+        # Ranged lights are assigned to a view-space froxel grid each frame so
+        # fragments only loop over nearby lights; unranged lights stay in LightData
+        self.clustered_lighting = True
+        self.light_clusters = None
+        if self.default_shader.program:
+            self.frame_block = FrameUniforms()
+            self.light_block = LightUniforms()
+            self.object_ring = ObjectUniformRing()
+            self.light_clusters = ClusteredLighting()
+
+        # Draws are recorded into a command buffer and replayed (GL 4.2+);
+        # runs go through glMultiDrawElementsIndirect on GL 4.3+
+        self.command_buffers = True
+        self.command_buffer = CommandBuffer()
+        self.multi_draw_indirect = None  # detected on first render
+        self._base_instance = None
+        self._uploaded_instances = None
 
     def _create_default_shader(self) -> Shader:
         """Create default lighting shader."""
-        vertex_shader = """
-        #version 330 core
-        layout(location = 0) in vec3 position;
-        layout(location = 1) in vec3 normal;
-
-        uniform mat4 model;
-        uniform mat4 view;
-        uniform mat4 projection;
-
-        out vec3 FragPos;
-        out vec3 Normal;
-
-        void main()
-        {
-            FragPos = vec3(model * vec4(position, 1.0));
-            Normal = mat3(transpose(inverse(model))) * normal;
-            gl_Position = projection * view * vec4(FragPos, 1.0);
-        }
-        """
-
-        fragment_shader = """
-        #version 330 core
-        in vec3 FragPos;
-        in vec3 Normal;
-
-        uniform vec3 objectColor;
-        uniform vec3 lightPos;
-        uniform vec3 viewPos;
-        uniform vec3 lightColor;
-
-        out vec4 FragColor;
-
-        void main()
-        {
-            // Ambient
-            float ambientStrength = 0.1;
-            vec3 ambient = ambientStrength * lightColor;
-
-            // Diffuse
-            vec3 norm = normalize(Normal);
-            vec3 lightDir = normalize(lightPos - FragPos);
-            float diff = max(dot(norm, lightDir), 0.0);
-            vec3 diffuse = diff * lightColor;
-
-            // Specular
-            float specularStrength = 0.5;
-            vec3 viewDir = normalize(viewPos - FragPos);
-            vec3 reflectDir = reflect(-lightDir, norm);
-            float spec = pow(max(dot(viewDir, reflectDir), 0.0), 32.0);
-            vec3 specular = specularStrength * spec * lightColor;
-
-            vec3 result = (ambient + diffuse + specular) * objectColor;
-            FragColor = vec4(result, 1.0);
-        }
-        """
+        return Shader(DEFAULT_VERTEX_SHADER, PHONG_FRAGMENT_SHADER)
 
-        return Shader(vertex_shader, fragment_shader)
+    def _create_instanced_shader(self) -> Shader:
+        """Create the instanced variant of the default lighting shader."""
+        return Shader(INSTANCED_VERTEX_SHADER, PHONG_FRAGMENT_SHADER)
 
     def render(self, scene, camera) -> None:
         """Render a scene."""
+        self.matrix_pool.reset()
+        self.stats.reset()
+        self.arena.begin_frame()
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
         glViewport(0, 0, self.width, self.height)
 
         if not self.default_shader.program:
             return
-
-        self.default_shader.use()
+        self.textures.update()
 
         # Get matrices
-        view_matrix = camera.get_view_matrix().to_numpy()
-        proj_matrix = camera.get_projection_matrix().to_numpy()
-
-        # Set uniforms
-        self.default_shader.set_mat4("view", view_matrix)
-        self.default_shader.set_mat4("projection", proj_matrix)
-        self.default_shader.set_vec3("viewPos", camera.transform.position.x, camera.transform.position.y, camera.transform.position.z)
-        self.default_shader.set_vec3("lightColor", 1.0, 1.0, 1.0)
-        self.default_shader.set_vec3("lightPos", 5.0, 5.0, 5.0)
-
-        # Render objects
-        for obj in scene.get_all_objects():
-            if obj == camera or not obj.active:
+        view = camera.get_view_matrix()
+        projection = camera.get_projection_matrix()
+        self._frame_shaders = {}
+
+        # Resolve all dirty world matrices before reading them
+        scene.update_transforms()
+        self._update_frame_blocks(scene, view.to_numpy(), projection.to_numpy(), camera)
+
+        renderables = [
+            obj for obj in scene.get_all_objects()
+            if obj is not camera and obj.active and obj.mesh is not None
+        ]
+        self.stats.objects = len(renderables)
+        world_matrices = scene.gather_world_matrices(renderables)
+        # Occluders are taken before static batching merges them away
+        occluders = [i for i, obj in enumerate(renderables) if obj.occluder]
+        occluder_objects = [renderables[i] for i in occluders]
+        occluder_matrices = world_matrices[occluders]
+        if self.static_batching:
+            renderables, world_matrices = self._batch_static(renderables, world_matrices)
+
+        view_projection = Matrix4.multiply(projection, view, out=self.matrix_pool.acquire())
+        if self.frustum_culling and renderables:
+            visible = self._cull(renderables, world_matrices, view_projection.data)
+            self.stats.culled = len(renderables) - int(np.count_nonzero(visible))
+            indices = np.flatnonzero(visible).tolist()
+        else:
+            indices = range(len(renderables))
+
+        if self.occlusion_culling and occluders:
+            remaining = self.occlusion.cull(
+                view_projection.data, occluder_objects, occluder_matrices, renderables, world_matrices, indices,
+            )
+            self.stats.occluded = len(indices) - len(remaining)
+            indices = remaining
+
+        meshes = None
+        if self.lod_selection:
+            meshes = self.lod.select(renderables, world_matrices, indices, view_projection.data, projection.data[1, 1])
+            self.stats.lod_reduced = self.lod.reduced
+        if self.textures.streaming.residency:
+            self._report_texture_sizes(renderables, world_matrices, indices, view_projection.data, projection.data[1, 1])
+
+        self._queue_draws(renderables, indices, world_matrices, view.data, camera, meshes)
+
+        self.state.reset()
+        if self.command_buffers and self._supports_command_buffers():
+            self._execute_commands(world_matrices, indices)
+        else:
+            self._issue_queue(world_matrices)
+        self._render_particles(scene, view_projection.data, view.data)
+        self._render_debug()
+        self._render_sprites(scene, view_projection.data)
+        if not self.defer_overlay:
+            self.render_overlay()
+        self.state.bind_vertex_array(0)
+
+        for shader, (uploads, skipped) in self._frame_shaders.items():
+            self.stats.uniform_uploads += shader.uploads - uploads
+            self.stats.uniform_uploads_skipped += shader.uploads_skipped - skipped
+        self.stats.program_binds = self.state.program_binds
+        self.stats.program_binds_skipped = self.state.program_binds_skipped
+        self.stats.vao_binds = self.state.vertex_array_binds
+        self.stats.vao_binds_skipped = self.state.vertex_array_binds_skipped
+        self.stats.texture_binds = self.state.texture_binds
+        self.stats.texture_binds_skipped = self.state.texture_binds_skipped
+        self.stats.texture_upload_bytes = self.textures.uploaded_bytes
+        self.stats.texture_memory = self.textures.resident_bytes
+        self.stats.streamed_texture_memory = self.textures.streaming.stats()["resident_bytes"]
+
+    def _issue_queue(self, world_matrices: np.ndarray) -> None:
+        """Issue queued draws directly, in sort-key order."""
+        items = self.render_queue.sorted()
+
+        # Per-object draws read their model and material from the ObjectData ring,
+        # written for the whole frame in one upload
+        singles = [item for item in items if not isinstance(item[4], np.ndarray)]
+        rows = np.array([item[4] for item in singles], dtype=np.intp)
+        materials = np.array([_material_row(item[2]) for item in singles], dtype=np.float32).reshape(-1, 8)
+        self.object_ring.write(self._pack_instances(world_matrices[rows], materials))
+
+        current_pass = PASS_OPAQUE
+        slot = 0
+        for render_pass, mesh, material, shader, members in items:
+            if render_pass != current_pass:
+                self._begin_pass(render_pass)
+                current_pass = render_pass
+
+            self._bind_texture(material)
+            if isinstance(members, np.ndarray):
+                self._use_shader(self.instanced_shader)
+                self._render_instanced(mesh, world_matrices[members], material)
                 continue
 
-            if obj.mesh is None:
+            self._use_shader(shader)
+            self._set_object_data(shader, slot, world_matrices[members], material)
+            slot += 1
+            self._render_mesh(mesh)
+
+        if current_pass != PASS_OPAQUE:
+            self._begin_pass(PASS_OPAQUE)
+
+    def _update_frame_blocks(self, scene, view: np.ndarray, projection: np.ndarray, camera) -> None:
+        """Upload the camera, light and cluster data shared by every program."""
+        camera_pos = camera.transform.position
+        positions, colors = collect_lights(scene)
+        self._frame_uniforms = (view, projection, camera_pos, positions[0], colors[0])
+        self.stats.lights = len(positions)
+
+        self.frame_block.set(view, projection, (camera_pos.x, camera_pos.y, camera_pos.z))
+        uploads = int(self.frame_block.upload())
+
+        ranged = positions[:, 3] > 0.0
+        if self.clustered_lighting and ranged.any():
+            uploads += self.light_clusters.update(
+                view, projection, camera.near_plane, camera.far_plane,
+                positions[ranged], colors[ranged], self.width, self.height,
+            )
+            self.light_clusters.bind()
+            positions, colors = positions[~ranged], colors[~ranged]
+            self.stats.clustered_lights = self.light_clusters.light_count
+            self.stats.light_cluster_entries = self.light_clusters.entries
+        else:
+            uploads += self.light_clusters.disable()
+
+        self.light_block.set(positions[:MAX_LIGHTS], colors[:MAX_LIGHTS])
+        self.stats.uniform_block_uploads += uploads + int(self.light_block.upload())
+
+    def _set_object_data(self, shader: Shader, slot: int, model: np.ndarray, material) -> None:
+        """Point a per-object draw at its ObjectData slot (or set plain uniforms)."""
+        if shader.has_block("ObjectData"):
+            self.object_ring.bind(slot)
+            return
+        # Custom shaders declaring plain uniforms
+        shader.set_mat4("model", model)
+        shader.set_vec4("objectColor", *to_rgba(material.color if material else (1.0, 1.0, 1.0, 1.0)))
+
+    def _pack_instances(self, world_matrices: np.ndarray, material_rows, out: np.ndarray = None) -> np.ndarray:
+        """Pack model matrices and material rows (see _material_row) into ObjectData-layout rows."""
+        count = len(world_matrices)
+        data = out if out is not None else np.empty((count, self.INSTANCE_FLOATS), dtype=np.float32)
+        # GLSL reads matrices column by column
+        data[:, :16] = world_matrices.transpose(0, 2, 1).reshape(count, 16)
+        data[:, 16:] = material_rows
+        return data
+
+    def _supports_command_buffers(self) -> bool:
+        """Detect base-instance and multi-draw-indirect support once."""
+        if self._base_instance is None:
+            version = glGetString(GL_VERSION)
+            try:
+                major, minor = (int(part) for part in version.decode().split()[0].split(".")[:2])
+            except (AttributeError, ValueError):
+                major, minor = 0, 0
+            self._base_instance = (major, minor) >= (4, 2) and bool(glDrawElementsInstancedBaseVertexBaseInstance)
+            self.multi_draw_indirect = (major, minor) >= (4, 3) and bool(glMultiDrawElementsIndirect)
+            self.logger.info(
+                f"Command buffers: {'enabled' if self._base_instance else 'unavailable'} "
+                f"(multi-draw indirect: {self.multi_draw_indirect})"
+            )
+        return self._base_instance and bool(self.instanced_shader.program)
+
+    def _execute_commands(self, world_matrices: np.ndarray, indices) -> None:
+        """Record the queue into the command buffer (or reuse it) and replay it."""
+        buffer = self.command_buffer
+        keys = self.render_queue.build_keys()
+        # Front-to-back order inside an opaque state is only an optimization,
+        # so opaque depth bits don't invalidate a recording
+        opaque = (keys >> np.uint64(62)) == PASS_OPAQUE
+        keys = np.where(opaque, keys & ~np.uint64(DEPTH_MAX), keys)
+        signature = (keys.tobytes(), np.asarray(indices, dtype=np.intp).tobytes(), self.instancing_threshold)
+
+        reused = signature == buffer.signature
+        if reused:
+            # Materials keep their sort ids when their texture is swapped
+            reused = all(_material_texture(m) is t for m, t in zip(buffer.materials, buffer.textures))
+        if reused:
+            for mesh in buffer.meshes:
+                self.arena.ensure(mesh)
+            reused = buffer.generation == self.arena.generation
+        if not reused:
+            self._record(buffer)
+            buffer.signature = signature
+
+        self._upload_instances(buffer, world_matrices, reused)
+        # Draws of custom shaders take their data from the ObjectData ring
+        slots = [
+            buffer.commands[run.first:run.first + run.count, 4]
+            for run in buffer.runs if run.shader is not self.instanced_shader
+        ]
+        slots = np.concatenate(slots) if slots else np.empty(0, dtype=np.uint32)
+        self.object_ring.write(self._instance_data[slots])
+        if self.multi_draw_indirect and not buffer.uploaded:
+            buffer.upload()
+        self._replay(buffer, world_matrices)
+
+        self.stats.commands = buffer.count
+        self.stats.commands_reused = int(reused)
+
+    def _record(self, buffer: CommandBuffer) -> None:
+        """Turn the sorted queue into command records."""
+        items = self.render_queue.sorted()
+        # Upload everything first: uploads may compact and move other meshes
+        for item in items:
+            self.arena.ensure(item[1])
+
+        buffer.clear()
+        for render_pass, mesh, material, shader, members in items:
+            alloc = mesh.gpu_allocation
+            if alloc is None:
                 continue
+            if shader is self.default_shader:
+                shader = self.instanced_shader
+            buffer.add(
+                render_pass, shader, self.arena.vao, mesh, material, alloc, np.atleast_1d(members),
+                _material_texture(material),
+            )
+        buffer.generation = self.arena.generation
+
+    def _upload_instances(self, buffer: CommandBuffer, world_matrices: np.ndarray, reused: bool) -> None:
+        """Fill the instance buffer with every recorded slot's matrix and color."""
+        count = buffer.instance_count
+        if not count:
+            return  # nothing visible; the arena may not even have a VAO yet
+        if len(self._instance_data) < count:
+            self._instance_data = np.empty((max(count, 2 * len(self._instance_data)), self.INSTANCE_FLOATS), dtype=np.float32)
+        data = self._instance_data[:count]
+        data[:, :16] = world_matrices[buffer.instance_sources[:count]].transpose(0, 2, 1).reshape(count, 16)
+        materials = np.array([_material_row(m) for m in buffer.materials], dtype=np.float32).reshape(-1, 8)
+        data[:, 16:] = np.repeat(materials, buffer.commands[:buffer.count, 1], axis=0)
+
+        if reused and self._uploaded_instances is not None and np.array_equal(data, self._uploaded_instances):
+            return
+        glBindBuffer(GL_ARRAY_BUFFER, self._instance_vbo)
+        glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STREAM_DRAW)
+        self._uploaded_instances = data.copy()
+
+    def _replay(self, buffer: CommandBuffer, world_matrices: np.ndarray) -> None:
+        """Issue the recorded commands, one multi-draw per state run where possible."""
+        commands = buffer.commands
+        if self.multi_draw_indirect:
+            glBindBuffer(GL_DRAW_INDIRECT_BUFFER, buffer.indirect_buffer)
+
+        current_pass = PASS_OPAQUE
+        ring_slot = 0
+        for run in buffer.runs:
+            if run.render_pass != current_pass:
+                self._begin_pass(run.render_pass)
+                current_pass = run.render_pass
+            shader = run.shader
+            self._use_shader(shader)
+            self.state.bind_vertex_array(run.vao)
+            if run.texture is not None:
+                self.textures.bind(run.texture)
+            rows = commands[run.first:run.first + run.count].tolist()
+
+            if shader is not self.instanced_shader:
+                for command, (count, _, first, base_vertex, slot) in enumerate(rows, run.first):
+                    model = world_matrices[buffer.instance_sources[slot]]
+                    self._set_object_data(shader, ring_slot, model, buffer.materials[command])
+                    ring_slot += 1
+                    glDrawElementsBaseVertex(GL_TRIANGLES, count, GL_UNSIGNED_INT, ctypes.c_void_p(first * 4), base_vertex)
+                self.stats.draw_calls += run.count
+            elif self.multi_draw_indirect:
+                glMultiDrawElementsIndirect(GL_TRIANGLES, GL_UNSIGNED_INT, buffer.offset(run.first), run.count, 0)
+                self.stats.draw_calls += 1
+            else:
+                for count, instances, first, base_vertex, base_instance in rows:
+                    glDrawElementsInstancedBaseVertexBaseInstance(
+                        GL_TRIANGLES, count, GL_UNSIGNED_INT, ctypes.c_void_p(first * 4),
+                        instances, base_vertex, base_instance,
+                    )
+                self.stats.draw_calls += run.count
+
+        if current_pass != PASS_OPAQUE:
+            self._begin_pass(PASS_OPAQUE)
+        if self.multi_draw_indirect:
+            glBindBuffer(GL_DRAW_INDIRECT_BUFFER, 0)
+
+        instances = buffer.commands[:buffer.count, 1]
+        self.stats.instanced_draws += int(np.count_nonzero(instances > 1))
+        self.stats.instances += int(instances[instances > 1].sum())
+        self.stats.triangles += buffer.triangle_count()
+
+    def _batch_static(self, renderables, world_matrices: np.ndarray):
+        """Replace static opaque renderables with their static batches."""
+        is_static = np.fromiter(
+            (obj.static and not is_transparent(obj.material) for obj in renderables),
+            dtype=bool, count=len(renderables),
+        )
+        if not is_static.any() and not self.static_batcher.batches:
+            return renderables, world_matrices
+
+        static_indices = np.flatnonzero(is_static)
+        dynamic_indices = np.flatnonzero(~is_static)
+        batches = self.static_batcher.update(
+            [renderables[i] for i in static_indices.tolist()],
+            world_matrices[static_indices],
+            self.arena.update_vertices,
+        )
+        self.stats.static_batches = len(batches)
+        self.stats.static_objects = len(static_indices)
+
+        if len(self._identity_matrices) != len(batches):
+            self._identity_matrices = np.broadcast_to(
+                np.eye(4, dtype=np.float32), (len(batches), 4, 4)
+            ).copy()
+        # Batches are already in world space and go through culling like any object
+        renderables = [renderables[i] for i in dynamic_indices.tolist()] + batches
+        world_matrices = np.concatenate((world_matrices[dynamic_indices], self._identity_matrices))
+        return renderables, world_matrices
+
+    def _queue_draws(self, renderables, indices, world_matrices: np.ndarray, view: np.ndarray, camera, meshes=None) -> None:
+        """Fill the render queue with this frame's visible draws (`meshes` overrides obj.mesh per renderable)."""
+        queue = self.render_queue
+        queue.clear()
+        queue.near = camera.near_plane
+        queue.far = camera.far_plane
+
+        # View-space distance of every object's origin
+        depths = -(world_matrices[:, :3, 3] @ view[2, :3] + view[2, 3])
+
+        for (mesh, material, shader), members in self._group(renderables, indices, meshes).items():
+            if is_transparent(material):
+                # Transparent objects are sorted individually, back-to-front
+                for i in members:
+                    queue.add(PASS_TRANSPARENT, shader, material, mesh, depths[i], (PASS_TRANSPARENT, mesh, material, shader, i))
+            elif (
+                shader is self.default_shader
+                and len(members) >= self.instancing_threshold
+                and self.instanced_shader.program
+            ):
+                members = np.array(members, dtype=np.intp)
+                queue.add(
+                    PASS_OPAQUE, self.instanced_shader, material, mesh, depths[members].min(),
+                    (PASS_OPAQUE, mesh, material, shader, members),
+                )
+            else:
+                for i in members:
+                    queue.add(PASS_OPAQUE, shader, material, mesh, depths[i], (PASS_OPAQUE, mesh, material, shader, i))
+
+    def _begin_pass(self, render_pass: int) -> None:
+        """Switch blend/depth-write state for a render pass."""
+        if render_pass == PASS_TRANSPARENT:
+            glEnable(GL_BLEND)
+            glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+            glDepthMask(GL_FALSE)
+        else:
+            glDisable(GL_BLEND)
+            glDepthMask(GL_TRUE)
+
+    def _group(self, renderables, indices, meshes=None) -> Dict[tuple, List[int]]:
+        """Bucket visible renderables by (mesh, material, shader)."""
+        groups: Dict[tuple, List[int]] = {}
+        for i in indices:
+            obj = renderables[i]
+            material = obj.material
+            shader = material.shader if material and isinstance(material.shader, Shader) else self.default_shader
+            mesh = meshes[i] if meshes is not None else obj.mesh
+            groups.setdefault((mesh, material, shader), []).append(i)
+        return groups
+
+    def _report_texture_sizes(self, renderables, world_matrices: np.ndarray, indices,
+                              view_projection: np.ndarray, projection_scale: float) -> None:
+        """Tell texture streaming how many pixels tall each visible textured object is."""
+        textured = [i for i in indices if _material_texture(renderables[i].material) is not None]
+        if not textured:
+            return
+        objects = [renderables[i] for i in textured]
+        centers, _half_extents, radii = gather_bounds(objects)
+        sizes = projected_sizes(world_matrices[textured], centers, radii, view_projection, projection_scale)
+        for obj, pixels in zip(objects, (sizes * self.height).tolist()):
+            self.textures.report_screen_size(obj.material.texture, pixels)
+
+    def _bind_texture(self, material) -> None:
+        """Bind a material's texture (if any) to the material texture unit."""
+        texture = _material_texture(material)
+        if texture is not None:
+            self.textures.bind(texture)
+
+    def _use_shader(self, shader: Shader) -> None:
+        """Bind a shader, uploading per-frame uniforms on its first use this frame.
+
+        Programs using the shared FrameData/LightData blocks need no uploads;
+        plain `view`/`projection`/`viewPos`/`lightPos`/`lightColor` uniforms of
+        custom shaders are set from the camera and the first light.
+        """
+        self.state.use_program(shader.program)
+        if shader in self._frame_shaders:
+            return
 
-            model_matrix = obj.transform.get_matrix().to_numpy()
-            self.default_shader.set_mat4("model", model_matrix)
+        self._frame_shaders[shader] = (shader.uploads, shader.uploads_skipped)
+        if not shader.uniforms:
+            return
+        view_matrix, proj_matrix, camera_pos, light_pos, light_color = self._frame_uniforms
+        shader.set_mat4("view", view_matrix)
+        shader.set_mat4("projection", proj_matrix)
+        shader.set_vec3("viewPos", camera_pos.x, camera_pos.y, camera_pos.z)
+        shader.set_vec3("lightColor", *light_color[:3].tolist())
+        shader.set_vec3("lightPos", *light_pos[:3].tolist())
+
+    def _render_particles(self, scene, view_projection: np.ndarray, view: np.ndarray) -> None:
+        """Draw the scene's particle emitters, one instanced billboard draw each."""
+        emitters = scene.get_particle_emitters()
+        if not emitters or not self.particle_shader.program:
+            return
+        self._use_shader(self.particle_shader)
+        planes = extract_frustum_planes(view_projection, out=self._frustum_planes)
+        draws, particles = self.particles.draw(self.particle_shader, emitters, planes, view)
+        self.stats.draw_calls += draws
+        self.stats.instanced_draws += draws
+        self.stats.particle_draws = draws
+        self.stats.particles = particles
+
+    def _render_debug(self) -> None:
+        """Draw this frame's debug lines: depth-tested, then overlay."""
+        if not self.debug.line_count or self.debug_shader is None or not self.debug_shader.program:
+            self.debug.clear()
+            return
+        self._use_shader(self.debug_shader)
+        draws, lines = self.debug.flush()
+        self.stats.draw_calls += draws
+        self.stats.debug_lines = lines
+
+    def _render_sprites(self, scene, view_projection: np.ndarray) -> None:
+        """Draw the scene's sprites and the queued sprite batch in layer order."""
+        objects = scene.get_sprites()
+        if objects:
+            self.sprites.add_sprites(objects, scene.gather_world_matrices(objects))
+        if not self.sprite_shader.program:
+            self.sprites.clear()
+            return
 
-            # Set object color
-            if obj.material:
-                self.default_shader.set_vec3("objectColor", *obj.material.color[:3])
-            else:
-                self.default_shader.set_vec3("objectColor", 1.0, 1.0, 1.0)
+        if self.sprites.count:
+            self._use_shader(self.sprite_shader)
+            self.sprites.flush(view_projection)
+            self._count_sprites(self.sprites)
 
-            self._render_mesh(obj.mesh)
+    def render_overlay(self, width: Optional[int] = None, height: Optional[int] = None) -> None:
+        """Draw the overlay batch over the bound framebuffer, in pixels of the given (default: renderer) size."""
+        if not self.sprite_shader.program:
+            self.overlay.clear()
+            return
+        if not self.overlay.count:
+            return
+        width = self.width if width is None else width
+        height = self.height if height is None else height
+        glViewport(0, 0, width, height)
+        screen = Matrix4.orthographic(0.0, width, 0.0, height, -1.0, 1.0, out=self._overlay_projection)
+        self.overlay.flush(screen.data)
+        self.state.bind_vertex_array(0)
+        self._count_sprites(self.overlay)
+
+    def _count_sprites(self, batch: SpriteBatch) -> None:
+        """Add a flushed sprite batch's counters to the frame stats."""
+        self.stats.draw_calls += batch.draw_calls
+        self.stats.sprite_draws += batch.draw_calls
+        self.stats.sprites += batch.drawn
+        self.stats.sprites_culled += batch.culled
+
+    def _cull(self, renderables, world_matrices: np.ndarray, view_projection: np.ndarray) -> np.ndarray:
+        """Frustum-test all renderables at once; returns a visibility mask."""
+        planes = extract_frustum_planes(view_projection, out=self._frustum_planes)
+
+        centers, half_extents, radii = gather_bounds(renderables)
+        return cull_bounds(planes, world_matrices, centers, half_extents, radii)
 
     def _render_mesh(self, mesh) -> None:
         """Render a mesh."""
-        if mesh.vao is None:
-            self._setup_mesh_buffers(mesh)
-
-        if mesh.vao:
-            glBindVertexArray(mesh.vao)
-            glDrawElements(GL_TRIANGLES, len(mesh.indices), GL_UNSIGNED_INT, None)
-            glBindVertexArray(0)
-
-    def _setup_mesh_buffers(self, mesh) -> None:
-        """Setup OpenGL buffers for a mesh."""
-        vao = glGenVertexArrays(1)
-        glBindVertexArray(vao)
-
-        # Vertices
-        vbo = glGenBuffers(1)
-        glBindBuffer(GL_ARRAY_BUFFER, vbo)
-        glBufferData(GL_ARRAY_BUFFER, mesh.vertices.nbytes, mesh.vertices, GL_STATIC_DRAW)
-        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 12, ctypes.c_void_p(0))
-        glEnableVertexAttribArray(0)
-
-        # Normals
-        if len(mesh.normals) > 0:
-            nbo = glGenBuffers(1)
-            glBindBuffer(GL_ARRAY_BUFFER, nbo)
-            glBufferData(GL_ARRAY_BUFFER, mesh.normals.nbytes, mesh.normals, GL_STATIC_DRAW)
-            glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 12, ctypes.c_void_p(0))
-            glEnableVertexAttribArray(1)
-
-        # Indices
-        ebo = glGenBuffers(1)
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
-        glBufferData(GL_ELEMENT_ARRAY_BUFFER, mesh.indices.nbytes, mesh.indices, GL_STATIC_DRAW)
-
-        glBindVertexArray(0)
-        glBindBuffer(GL_ARRAY_BUFFER, 0)
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
-
-        mesh.vao = vao
-        mesh.vbo = vbo
-        mesh.ebo = ebo
+        alloc = self.arena.ensure(mesh)
+        if alloc is None:
+            return
+
+        self.state.bind_vertex_array(self.arena.vao)
+        glDrawElementsBaseVertex(
+            GL_TRIANGLES, alloc.index_count, GL_UNSIGNED_INT,
+            ctypes.c_void_p(alloc.index_byte_offset), alloc.vertex_offset,
+        )
+        self.stats.draw_calls += 1
+        self.stats.triangles += alloc.index_count // 3
+
+    def _render_instanced(self, mesh, world_matrices: np.ndarray, material) -> None:
+        """Draw every instance of a mesh with one instanced draw call."""
+        alloc = self.arena.ensure(mesh)
+        if alloc is None:
+            return
+
+        count = len(world_matrices)
+        if len(self._instance_data) < count:
+            self._instance_data = np.empty((max(count, 2 * len(self._instance_data)), self.INSTANCE_FLOATS), dtype=np.float32)
+        data = self._pack_instances(world_matrices, _material_row(material), out=self._instance_data[:count])
+
+        glBindBuffer(GL_ARRAY_BUFFER, self._instance_vbo)
+        glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STREAM_DRAW)
+        self._uploaded_instances = None
+
+        self.state.bind_vertex_array(self.arena.vao)
+        glDrawElementsInstancedBaseVertex(
+            GL_TRIANGLES, alloc.index_count, GL_UNSIGNED_INT,
+            ctypes.c_void_p(alloc.index_byte_offset), count, alloc.vertex_offset,
+        )
+
+        self.stats.draw_calls += 1
+        self.stats.instanced_draws += 1
+        self.stats.instances += count
+        self.stats.triangles += (alloc.index_count // 3) * count
+
+    def _setup_instance_attributes(self, vao) -> None:
+        """Attach the shared instance buffer to a VAO (locations 3-8)."""
+        if self._instance_vbo is None:
+            self._instance_vbo = glGenBuffers(1)
+        stride = self.INSTANCE_FLOATS * 4
+        self.state.bind_vertex_array(vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self._instance_vbo)
+        for column in range(4):
+            location = ATTRIB_INSTANCE_MODEL + column
+            glVertexAttribPointer(location, 4, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(column * 16))
+            glEnableVertexAttribArray(location)
+            glVertexAttribDivisor(location, 1)
+        glVertexAttribPointer(ATTRIB_INSTANCE_COLOR, 4, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(64))
+        glEnableVertexAttribArray(ATTRIB_INSTANCE_COLOR)
+        glVertexAttribDivisor(ATTRIB_INSTANCE_COLOR, 1)
+        glVertexAttribPointer(ATTRIB_INSTANCE_PARAMS, 4, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(80))
+        glEnableVertexAttribArray(ATTRIB_INSTANCE_PARAMS)
+        glVertexAttribDivisor(ATTRIB_INSTANCE_PARAMS, 1)
 
     def cleanup(self) -> None:
         """Clean up OpenGL resources."""
         self.logger.info("Cleaning up OpenGL resources")
-        if self.default_shader.program:
-            glDeleteProgram(self.default_shader.program)
+        for shader in (self.default_shader, self.instanced_shader, self.particle_shader, self.sprite_shader,
+                       self.debug_shader):
+            if shader is not None and shader.program:
+                glDeleteProgram(shader.program)
+        if self._instance_vbo is not None:
+            glDeleteBuffers(1, [self._instance_vbo])
+            self._instance_vbo = None
+        self.command_buffer.release()
+        self.particles.release()
+        self.sprites.release()
+        self.overlay.release()
+        self.debug.release()
+        self.textures.release()
+        for block in (self.frame_block, self.light_block, self.object_ring, self.light_clusters):
+            if block is not None:
+                block.release()
+        self.arena.release()
+
+
+def _material_row(material) -> tuple:
+    """ObjectData color and material parameters (x: shininess, y: textured) of a material."""
+    if material is None:
+        return (1.0, 1.0, 1.0, 1.0, 32.0, 0.0, 0.0, 0.0)
+    textured = 1.0 if material.texture is not None else 0.0
+    return (*to_rgba(material.color), float(material.shininess), textured, 0.0, 0.0)
+
+
+def _material_texture(material):
+    """The texture (Texture, name, path or GL id) a material samples, if any."""
+    return material.texture if material is not None else None
 
 
 import ctypes
@@ -0,0 +1,123 @@
+"""Instanced billboard drawing of particle emitters.
+
+Each emitter's live particles are packed into a shared stream buffer as
+(position, size, color) rows and drawn with one instanced draw of a unit quad
+that the vertex shader turns to face the camera. Emitters are culled by the
+bounds of their particles and drawn back to front after the transparent pass,
+depth-tested without depth writes. Particles inside one emitter are not
+sorted, which is exact for additive emitters and usually unnoticeable for
+alpha-blended ones.
+"""
+
+from typing import List
+import ctypes
+from OpenGL.GL import *
+import numpy as np
+from fortini_engine.rendering.culling import cull_bounds
+
+# Vertex attribute locations of the particle program
+ATTRIB_CORNER = 0
+ATTRIB_PARTICLE_CENTER = 1
+ATTRIB_PARTICLE_COLOR = 2
+
+# Floats per particle instance: xyz + size, rgba
+PARTICLE_FLOATS = 8
+
+# Triangle strip of the unit quad, centered on the origin
+QUAD_CORNERS = np.array([(-0.5, -0.5), (0.5, -0.5), (-0.5, 0.5), (0.5, 0.5)], dtype=np.float32)
+
+
+class ParticleRenderer:
+    """Draws ParticleEmitter components, one instanced draw per emitter."""
+
+    def __init__(self, state, textures):
+        self.state = state
+        self.textures = textures
+        self.vao = None
+        self._quad_vbo = None
+        self._instance_vbo = None
+        self._instance_data = np.empty((0, PARTICLE_FLOATS), dtype=np.float32)
+
+    def draw(self, shader, emitters: List, planes: np.ndarray, view: np.ndarray) -> tuple:
+        """Draw the particles of emitter objects visible inside `planes`; returns (draws, particles)."""
+        components = [obj.components["particles"] for obj in emitters]
+        components = [emitter for emitter in components if emitter.count > 0]
+        if not components:
+            return 0, 0
+
+        # All emitters are culled at once as world-space boxes
+        lows = np.array([emitter.bounds_min for emitter in components], dtype=np.float32)
+        highs = np.array([emitter.bounds_max for emitter in components], dtype=np.float32)
+        centers = (lows + highs) * 0.5
+        half_extents = (highs - lows) * 0.5
+        identity = np.broadcast_to(np.eye(4, dtype=np.float32), (len(components), 4, 4))
+        visible = cull_bounds(planes, identity, centers, half_extents, np.linalg.norm(half_extents, axis=1))
+        if not visible.any():
+            return 0, 0
+
+        # Back to front by view-space depth of the box centers
+        depths = -(centers @ view[2, :3] + view[2, 3])
+        order = [i for i in np.argsort(-depths).tolist() if visible[i]]
+
+        self._ensure_buffers()
+        self.state.bind_vertex_array(self.vao)
+        glEnable(GL_BLEND)
+        glDepthMask(GL_FALSE)
+        draws = particles = 0
+        for i in order:
+            emitter = components[i]
+            count = emitter.count
+            if len(self._instance_data) < count:
+                self._instance_data = np.empty((max(count, 2 * len(self._instance_data)), PARTICLE_FLOATS), dtype=np.float32)
+            data = emitter.pack(self._instance_data)
+
+            textured = emitter.texture is not None and self.textures.bind(emitter.texture)
+            shader.set_int("textured", 1 if textured else 0)
+            if emitter.additive:
+                glBlendFunc(GL_SRC_ALPHA, GL_ONE)
+            else:
+                glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+            glBindBuffer(GL_ARRAY_BUFFER, self._instance_vbo)
+            glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STREAM_DRAW)
+            glDrawArraysInstanced(GL_TRIANGLE_STRIP, 0, 4, count)
+            draws += 1
+            particles += count
+
+        glDisable(GL_BLEND)
+        glDepthMask(GL_TRUE)
+        return draws, particles
+
+    def _ensure_buffers(self) -> None:
+        """Create the quad and instance buffers and their VAO on first use."""
+        if self.vao is not None:
+            return
+        self.vao = glGenVertexArrays(1)
+        self._quad_vbo = glGenBuffers(1)
+        self._instance_vbo = glGenBuffers(1)
+        self.state.bind_vertex_array(self.vao)
+
+        glBindBuffer(GL_ARRAY_BUFFER, self._quad_vbo)
+        glBufferData(GL_ARRAY_BUFFER, QUAD_CORNERS.nbytes, QUAD_CORNERS, GL_STATIC_DRAW)
+        glVertexAttribPointer(ATTRIB_CORNER, 2, GL_FLOAT, GL_FALSE, 8, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(ATTRIB_CORNER)
+
+        stride = PARTICLE_FLOATS * 4
+        glBindBuffer(GL_ARRAY_BUFFER, self._instance_vbo)
+        glVertexAttribPointer(ATTRIB_PARTICLE_CENTER, 4, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(ATTRIB_PARTICLE_CENTER)
+        glVertexAttribDivisor(ATTRIB_PARTICLE_CENTER, 1)
+        glVertexAttribPointer(ATTRIB_PARTICLE_COLOR, 4, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(16))
+        glEnableVertexAttribArray(ATTRIB_PARTICLE_COLOR)
+        glVertexAttribDivisor(ATTRIB_PARTICLE_COLOR, 1)
+
+    def release(self) -> None:
+        """Delete the VAO and buffers."""
+        if self.vao is None:
+            return
+        glDeleteBuffers(2, [self._quad_vbo, self._instance_vbo])
+        glDeleteVertexArrays(1, [self.vao])
+        self.vao = self._quad_vbo = self._instance_vbo = None
+
+    def __repr__(self) -> str:
+        return f"ParticleRenderer(capacity={len(self._instance_data)})"
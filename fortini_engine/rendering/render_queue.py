@@ -0,0 +1,129 @@
+"""Render queue ordered by packed 64-bit sort keys."""
+
+import weakref
+from typing import Any, List
+import numpy as np
+from fortini_engine.utils.logger import Logger
+
+# Render passes, drawn in this order
+PASS_OPAQUE = 0
+PASS_TRANSPARENT = 1
+
+# Key layout (bits, most significant first):
+#   opaque:      pass(2) | shader(12) | material(12) | mesh(14) | depth(24)
+#   transparent: pass(2) | inverted depth(24) | shader(12) | material(12) | mesh(14)
+# Opaque draws are grouped by state and go front-to-back within a state;
+# transparent draws go strictly back-to-front.
+SHADER_BITS = 12
+MATERIAL_BITS = 12
+MESH_BITS = 14
+DEPTH_BITS = 24
+DEPTH_MAX = (1 << DEPTH_BITS) - 1
+
+
+def is_transparent(material) -> bool:
+    """Whether a material is drawn in the blended transparent pass."""
+    return material is not None and len(material.color) > 3 and material.color[3] < 1.0
+
+
+class SortIdRegistry:
+    """Assigns small, stable integer ids to objects for use in sort keys.
+
+    Ids of collected objects are reused. Once all `bits` worth of ids are
+    live, further objects share the last id (logged once) rather than
+    wrapping onto ids other live objects hold.
+    """
+
+    def __init__(self, bits: int):
+        self.mask = (1 << bits) - 1
+        self._ids = weakref.WeakKeyDictionary()
+        self._next = 1  # 0 is reserved for None
+        self._free: List[int] = []
+        self._exhausted = False
+        self.logger = Logger().get_logger(self.__class__.__name__)
+
+    def get(self, obj) -> int:
+        """Return the id of `obj`, assigning one on first use."""
+        if obj is None:
+            return 0
+        sort_id = self._ids.get(obj)
+        if sort_id is None:
+            if self._free:
+                sort_id = self._free.pop()
+            elif self._next < self.mask:
+                sort_id = self._next
+                self._next += 1
+            else:
+                # Overflow bucket: shared, never recycled
+                sort_id = self.mask
+                if not self._exhausted:
+                    self._exhausted = True
+                    self.logger.warning(f"All {self.mask} sort ids in use; new objects now share id {self.mask}")
+                self._ids[obj] = sort_id
+                return sort_id
+            self._ids[obj] = sort_id
+            weakref.finalize(obj, self._free.append, sort_id)
+        return sort_id
+
+
+class RenderQueue:
+    """Collects draws for a frame and returns them in sort-key order."""
+
+    def __init__(self):
+        self._shader_ids = SortIdRegistry(SHADER_BITS)
+        self._material_ids = SortIdRegistry(MATERIAL_BITS)
+        self._mesh_ids = SortIdRegistry(MESH_BITS)
+        self.near = 0.1
+        self.far = 1000.0
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop all queued draws."""
+        self._passes: List[int] = []
+        self._shaders: List[int] = []
+        self._materials: List[int] = []
+        self._meshes: List[int] = []
+        self._depths: List[float] = []
+        self._items: List[Any] = []
+        self.keys = np.empty(0, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, render_pass: int, shader, material, mesh, depth: float, item: Any) -> None:
+        """Queue a draw; `item` is returned by sorted() untouched."""
+        self._passes.append(render_pass)
+        self._shaders.append(self._shader_ids.get(shader))
+        self._materials.append(self._material_ids.get(material))
+        self._meshes.append(self._mesh_ids.get(mesh))
+        self._depths.append(depth)
+        self._items.append(item)
+
+    def build_keys(self) -> np.ndarray:
+        """Pack the queued draws into 64-bit sort keys."""
+        passes = np.array(self._passes, dtype=np.uint64)
+        shaders = np.array(self._shaders, dtype=np.uint64)
+        materials = np.array(self._materials, dtype=np.uint64)
+        meshes = np.array(self._meshes, dtype=np.uint64)
+
+        depths = np.array(self._depths, dtype=np.float64)
+        depths = (depths - self.near) / max(self.far - self.near, 1e-6)
+        depths = (np.clip(depths, 0.0, 1.0) * DEPTH_MAX).astype(np.uint64)
+
+        state = (shaders << np.uint64(MATERIAL_BITS + MESH_BITS)) | (materials << np.uint64(MESH_BITS)) | meshes
+        state_bits = np.uint64(SHADER_BITS + MATERIAL_BITS + MESH_BITS)
+
+        opaque = (state << np.uint64(DEPTH_BITS)) | depths
+        transparent = ((np.uint64(DEPTH_MAX) - depths) << state_bits) | state
+        keys = np.where(passes == PASS_TRANSPARENT, transparent, opaque)
+        keys |= passes << np.uint64(62)
+        self.keys = keys
+        return keys
+
+    def sorted(self) -> List[Any]:
+        """Return the queued items ordered by sort key."""
+        if not self._items:
+            return []
+        order = np.argsort(self.build_keys(), kind="stable")
+        items = self._items
+        return [items[i] for i in order.tolist()]
@@ -0,0 +1,54 @@
+"""Per-frame rendering statistics."""
+
+from typing import Dict
+
+
+class RenderStats:
+    """Counters collected by a renderer during one frame."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all counters at the start of a frame."""
+        self.objects = 0       # renderables considered this frame
+        self.culled = 0        # rejected by frustum culling
+        self.occluded = 0      # frustum-visible but hidden behind occluders
+        self.draw_calls = 0
+        self.instanced_draws = 0
+        self.instances = 0     # objects drawn through instanced calls
+        self.triangles = 0
+        self.static_objects = 0  # objects merged into static batches
+        self.static_batches = 0
+        self.lod_reduced = 0     # objects drawn with a simplified LOD mesh
+        self.particle_draws = 0  # instanced billboard draws, one per visible emitter
+        self.particles = 0       # live particles drawn
+        self.sprite_draws = 0    # sprite batch draws, one per texture run
+        self.sprites = 0         # sprites drawn
+        self.sprites_culled = 0  # sprites outside the view
+        self.debug_lines = 0     # debug-draw lines drawn
+        self.program_binds = 0
+        self.program_binds_skipped = 0
+        self.vao_binds = 0
+        self.vao_binds_skipped = 0
+        self.texture_binds = 0
+        self.texture_binds_skipped = 0
+        self.texture_upload_bytes = 0   # mip data streamed to the GPU this frame
+        self.texture_memory = 0         # bytes of resident textures
+        self.streamed_texture_memory = 0  # part of texture_memory held by mip-streamed textures
+        self.uniform_uploads = 0
+        self.uniform_uploads_skipped = 0  # identical values not re-sent
+        self.uniform_block_uploads = 0    # shared FrameData/LightData blocks sent
+        self.lights = 0                   # scene lights (or the default light)
+        self.clustered_lights = 0         # ranged lights assigned to the froxel grid
+        self.light_cluster_entries = 0    # (cluster, light) pairs after assignment
+        self.commands = 0         # draw records replayed from the command buffer
+        self.commands_reused = 0  # 1 when last frame's recording was replayed as-is
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters as a dictionary."""
+        return dict(vars(self))
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{key}={value}" for key, value in self.as_dict().items())
+        return f"RenderStats({fields})"
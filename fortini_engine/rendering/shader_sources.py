@@ -0,0 +1,288 @@
+"""GLSL sources for the built-in shaders."""
+
+from fortini_engine.rendering.lighting import MAX_LIGHTS
+
+# std140 blocks shared by all programs; layouts must match uniform_buffers
+FRAME_BLOCK = """
+layout(std140) uniform FrameData
+{
+    mat4 view;
+    mat4 projection;
+    vec4 viewPos;
+};
+"""
+
+LIGHT_BLOCK = f"""
+#define MAX_LIGHTS {MAX_LIGHTS}
+""" + """
+layout(std140) uniform LightData
+{
+    ivec4 lightCount;
+    vec4 lightPositions[MAX_LIGHTS];  // xyz: world position, w: range (0 = no falloff)
+    vec4 lightColors[MAX_LIGHTS];     // rgb: color * intensity
+};
+"""
+
+# Clustered lighting: ranged lights assigned per froxel on the CPU (see
+# clustered_lighting); the grid and light tables are texture buffers
+CLUSTER_BLOCK = """
+layout(std140) uniform ClusterData
+{
+    uvec4 clusterDims;   // xyz: tiles x, tiles y, depth slices; w: enabled
+    vec4 clusterDepth;   // x: log-depth scale, y: log-depth bias
+    vec4 clusterTile;    // xy: tile size in pixels
+};
+
+uniform samplerBuffer clusterLights;         // two texels per light: position/range, color
+uniform usamplerBuffer clusterGrid;          // per cluster: (offset, count)
+uniform usamplerBuffer clusterLightIndices;  // light indices, grouped by cluster
+"""
+
+OBJECT_BLOCK = """
+layout(std140) uniform ObjectData
+{
+    mat4 model;
+    vec4 objectColor;
+    vec4 materialParams;  // x: shininess, y: 1 when the material has a texture
+};
+"""
+
+# Per-object path: model matrix and material come from the ObjectData ring
+DEFAULT_VERTEX_SHADER = """
+#version 330 core
+layout(location = 0) in vec3 position;
+layout(location = 1) in vec3 normal;
+layout(location = 2) in vec2 uv;
+""" + FRAME_BLOCK + OBJECT_BLOCK + """
+out vec3 FragPos;
+out vec3 Normal;
+out vec2 TexCoord;
+out vec4 ObjectColor;
+out float Shininess;
+out float Textured;
+
+void main()
+{
+    FragPos = vec3(model * vec4(position, 1.0));
+    Normal = mat3(transpose(inverse(model))) * normal;
+    TexCoord = uv;
+    ObjectColor = objectColor;
+    Shininess = materialParams.x;
+    Textured = materialParams.y;
+    gl_Position = projection * view * vec4(FragPos, 1.0);
+}
+"""
+
+# Instanced path: model matrix (locations 3-6), color (location 7) and
+# material parameters (location 8) are per-instance vertex attributes
+INSTANCED_VERTEX_SHADER = """
+#version 330 core
+layout(location = 0) in vec3 position;
+layout(location = 1) in vec3 normal;
+layout(location = 2) in vec2 uv;
+layout(location = 3) in mat4 instanceModel;
+layout(location = 7) in vec4 instanceColor;
+layout(location = 8) in vec4 instanceParams;
+""" + FRAME_BLOCK + """
+out vec3 FragPos;
+out vec3 Normal;
+out vec2 TexCoord;
+out vec4 ObjectColor;
+out float Shininess;
+out float Textured;
+
+void main()
+{
+    FragPos = vec3(instanceModel * vec4(position, 1.0));
+    Normal = mat3(transpose(inverse(instanceModel))) * normal;
+    TexCoord = uv;
+    ObjectColor = instanceColor;
+    Shininess = instanceParams.x;
+    Textured = instanceParams.y;
+    gl_Position = projection * view * vec4(FragPos, 1.0);
+}
+"""
+
+PHONG_FRAGMENT_SHADER = """
+#version 330 core
+in vec3 FragPos;
+in vec3 Normal;
+in vec2 TexCoord;
+in vec4 ObjectColor;
+in float Shininess;
+in float Textured;
+""" + FRAME_BLOCK + LIGHT_BLOCK + CLUSTER_BLOCK + """
+uniform sampler2D materialTexture;
+
+out vec4 FragColor;
+
+vec3 pointLight(vec4 position, vec3 color, vec3 norm, vec3 viewDir)
+{
+    float ambientStrength = 0.1;
+    float specularStrength = 0.5;
+
+    vec3 toLight = position.xyz - FragPos;
+    float range = position.w;
+    float attenuation = 1.0;
+    if (range > 0.0)
+    {
+        float falloff = clamp(1.0 - length(toLight) / range, 0.0, 1.0);
+        attenuation = falloff * falloff;
+    }
+
+    // Ambient + diffuse + specular
+    vec3 lightDir = normalize(toLight);
+    float diff = max(dot(norm, lightDir), 0.0);
+    vec3 reflectDir = reflect(-lightDir, norm);
+    float spec = pow(max(dot(viewDir, reflectDir), 0.0), Shininess);
+    return (ambientStrength + diff + specularStrength * spec) * attenuation * color;
+}
+
+void main()
+{
+    vec3 norm = normalize(Normal);
+    vec3 viewDir = normalize(viewPos.xyz - FragPos);
+
+    vec3 lighting = vec3(0.0);
+    for (int i = 0; i < lightCount.x; ++i)
+        lighting += pointLight(lightPositions[i], lightColors[i].rgb, norm, viewDir);
+
+    if (clusterDims.w != 0u)
+    {
+        // Only the lights assigned to this fragment's froxel
+        float depth = max(-(view * vec4(FragPos, 1.0)).z, 1e-6);
+        float slice = clamp(floor(log(depth) * clusterDepth.x + clusterDepth.y), 0.0, float(clusterDims.z - 1u));
+        uvec2 tile = min(uvec2(gl_FragCoord.xy / clusterTile.xy), clusterDims.xy - 1u);
+        int cluster = int(tile.x + clusterDims.x * (tile.y + clusterDims.y * uint(slice)));
+        uvec2 range = texelFetch(clusterGrid, cluster).xy;
+        for (uint i = 0u; i < range.y; ++i)
+        {
+            int light = int(texelFetch(clusterLightIndices, int(range.x + i)).x);
+            lighting += pointLight(texelFetch(clusterLights, 2 * light), texelFetch(clusterLights, 2 * light + 1).rgb, norm, viewDir);
+        }
+    }
+
+    vec4 albedo = ObjectColor;
+    if (Textured > 0.5)
+        albedo *= texture(materialTexture, TexCoord);
+    FragColor = vec4(lighting * albedo.rgb, albedo.a);
+}
+"""
+
+# Particles: a unit quad (location 0) expanded into a camera-facing billboard
+# per instance; center and size (location 1) and color (location 2) are
+# per-instance attributes
+PARTICLE_VERTEX_SHADER = """
+#version 330 core
+layout(location = 0) in vec2 corner;
+layout(location = 1) in vec4 particleCenter;  // xyz: world position, w: size
+layout(location = 2) in vec4 particleColor;
+""" + FRAME_BLOCK + """
+out vec2 TexCoord;
+out vec4 ParticleColor;
+
+void main()
+{
+    // Rows of the view rotation are the camera axes in world space
+    vec3 right = vec3(view[0][0], view[1][0], view[2][0]);
+    vec3 up = vec3(view[0][1], view[1][1], view[2][1]);
+    vec3 position = particleCenter.xyz + (right * corner.x + up * corner.y) * particleCenter.w;
+    TexCoord = corner + 0.5;
+    ParticleColor = particleColor;
+    gl_Position = projection * view * vec4(position, 1.0);
+}
+"""
+
+PARTICLE_FRAGMENT_SHADER = """
+#version 330 core
+in vec2 TexCoord;
+in vec4 ParticleColor;
+
+uniform sampler2D materialTexture;
+uniform int textured;
+
+out vec4 FragColor;
+
+void main()
+{
+    vec4 color = ParticleColor;
+    if (textured != 0)
+        color *= texture(materialTexture, TexCoord);
+    else
+        color.a *= 1.0 - smoothstep(0.25, 0.5, length(TexCoord - 0.5));  // soft disc
+    if (color.a <= 0.0)
+        discard;
+    FragColor = color;
+}
+"""
+
+# Sprites: one instance per quad from the sprite batch; the corner comes from
+# gl_VertexID (a 4-vertex strip) and the batch sets its own view-projection,
+# so the same program serves world and screen-space batches
+SPRITE_VERTEX_SHADER = """
+#version 330 core
+layout(location = 0) in vec4 spriteAxes;    // xy: quad x axis, zw: quad y axis
+layout(location = 1) in vec4 spriteOrigin;  // xy: center, z: depth, w: layer
+layout(location = 2) in vec4 spriteUV;      // (u0, v0, u1, v1)
+layout(location = 3) in vec4 spriteColor;
+
+uniform mat4 viewProjection;
+
+out vec2 TexCoord;
+out vec4 SpriteColor;
+
+void main()
+{
+    vec2 corner = vec2(gl_VertexID & 1, gl_VertexID >> 1);
+    vec2 offset = corner - 0.5;
+    vec2 position = spriteOrigin.xy + offset.x * spriteAxes.xy + offset.y * spriteAxes.zw;
+    TexCoord = mix(spriteUV.xy, spriteUV.zw, corner);
+    SpriteColor = spriteColor;
+    gl_Position = viewProjection * vec4(position, spriteOrigin.z, 1.0);
+}
+"""
+
+SPRITE_FRAGMENT_SHADER = """
+#version 330 core
+in vec2 TexCoord;
+in vec4 SpriteColor;
+
+uniform sampler2D materialTexture;
+
+out vec4 FragColor;
+
+void main()
+{
+    vec4 color = SpriteColor * texture(materialTexture, TexCoord);
+    if (color.a <= 0.0)
+        discard;
+    FragColor = color;
+}
+"""
+
+# Debug lines: world-space positions with per-vertex colors, unlit
+DEBUG_VERTEX_SHADER = """
+#version 330 core
+layout(location = 0) in vec3 position;
+layout(location = 1) in vec4 color;
+""" + FRAME_BLOCK + """
+out vec4 LineColor;
+
+void main()
+{
+    LineColor = color;
+    gl_Position = projection * view * vec4(position, 1.0);
+}
+"""
+
+DEBUG_FRAGMENT_SHADER = """
+#version 330 core
+in vec4 LineColor;
+
+out vec4 FragColor;
+
+void main()
+{
+    FragColor = LineColor;
+}
+"""
@@ -0,0 +1,376 @@
+"""Headless CPU rendering backend.
+
+`SoftwareRenderer` has the same `render(scene, camera)` interface as
+`OpenGLRenderer` but rasterizes with vectorized NumPy into in-memory color and
+depth buffers, so scenes can be rendered on machines without a GPU (CI render
+tests, server-side thumbnails).
+
+Triangles are binned into small screen tiles; each (triangle, tile) pair is
+tested against the tile's pixel centers in large batches and the nearest
+fragment per pixel wins the z-test. Lighting is deferred: only the surviving fragment of
+each pixel is shaded, with the same Phong model as the default GL shader.
+Transparent objects match GL blending instead: every fragment that passes the
+opaque depth buffer is shaded and blended, in triangle order, so the back
+faces of a translucent object show through its front faces.
+"""
+
+from typing import Dict, List, Tuple
+import numpy as np
+from fortini_engine.utils.logger import Logger
+from fortini_engine.utils.color import to_rgba
+from fortini_engine.utils.math_utils import normal_matrices
+from fortini_engine.rendering.culling import extract_frustum_planes, cull_bounds, gather_bounds
+from fortini_engine.rendering.occlusion import OcclusionCuller
+from fortini_engine.rendering.render_stats import RenderStats
+from fortini_engine.rendering.lighting import collect_lights
+from fortini_engine.rendering.lod import LODSelector
+from fortini_engine.rendering.render_queue import is_transparent
+
+
+class SoftwareRenderer:
+    """NumPy rasterizer writing to an in-memory image."""
+
+    # Phong parameters matching PHONG_FRAGMENT_SHADER
+    AMBIENT_STRENGTH = 0.1
+    SPECULAR_STRENGTH = 0.5
+
+    def __init__(self, width: int, height: int, tile_size: int = 8):
+        self.logger = Logger().get_logger(self.__class__.__name__)
+        self.tile_size = tile_size
+        self.clear_color = (0.1, 0.1, 0.1, 1.0)
+
+        self.frustum_culling = True
+        self.stats = RenderStats()
+        self._frustum_planes = np.empty((6, 4), dtype=np.float32)
+
+        self.occlusion_culling = True
+        self.occlusion = OcclusionCuller()
+
+        self.lod_selection = True
+        self.lod = LODSelector()
+
+        # Upper bound on (triangle, pixel) tests evaluated per batch
+        self.max_fragments = 1 << 20
+
+        self.resize(width, height)
+
+    def resize(self, width: int, height: int) -> None:
+        """Reallocate the color and depth buffers."""
+        self.width = width
+        self.height = height
+        self.color_buffer = np.zeros((height, width, 4), dtype=np.float32)
+        self.depth_buffer = np.full((height, width), np.inf, dtype=np.float32)
+
+        # Pixel offsets inside a tile, row-major
+        ts = self.tile_size
+        local = np.arange(ts * ts)
+        self._tile_x = (local % ts).astype(np.int32)
+        self._tile_y = (local // ts).astype(np.int32)
+        self._tiles_x = (width + ts - 1) // ts
+        self._tiles_y = (height + ts - 1) // ts
+
+    def render(self, scene, camera) -> None:
+        """Render a scene."""
+        self.stats.reset()
+        self.color_buffer[:] = self.clear_color
+        self.depth_buffer[:] = np.inf
+
+        view = camera.get_view_matrix().to_numpy()
+        projection = camera.get_projection_matrix().to_numpy()
+        view_projection = projection @ view
+        self._view_pos = camera.transform.position_array.astype(np.float32)
+
+        scene.update_transforms()
+        self._light_positions, self._light_colors = collect_lights(scene)
+        renderables = [
+            obj for obj in scene.get_all_objects()
+            if obj is not camera and obj.active and obj.mesh is not None
+        ]
+        self.stats.objects = len(renderables)
+        world_matrices = scene.gather_world_matrices(renderables)
+
+        if self.frustum_culling and renderables:
+            visible = self._cull(renderables, world_matrices, view_projection)
+            self.stats.culled = len(renderables) - int(np.count_nonzero(visible))
+            indices = np.flatnonzero(visible).tolist()
+        else:
+            indices = range(len(renderables))
+
+        occluders = [i for i, obj in enumerate(renderables) if obj.occluder]
+        if self.occlusion_culling and occluders:
+            remaining = self.occlusion.cull(
+                view_projection, [renderables[i] for i in occluders], world_matrices[occluders],
+                renderables, world_matrices, indices,
+            )
+            self.stats.occluded = len(indices) - len(remaining)
+            indices = remaining
+
+        meshes = [obj.mesh for obj in renderables]
+        if self.lod_selection:
+            meshes = self.lod.select(renderables, world_matrices, indices, view_projection, projection[1, 1])
+            self.stats.lod_reduced = self.lod.reduced
+
+        opaque: Dict[tuple, List[int]] = {}
+        transparent: List[int] = []
+        for i in indices:
+            obj = renderables[i]
+            if is_transparent(obj.material):
+                transparent.append(i)
+            else:
+                opaque.setdefault((meshes[i], obj.material), []).append(i)
+
+        # All opaque geometry is rasterized in one pass with depth writes
+        batches = [
+            self._assemble(mesh, material, world_matrices[members], view_projection)
+            for (mesh, material), members in opaque.items()
+        ]
+        if batches:
+            self._draw(*(np.concatenate(parts) for parts in zip(*batches)), blend=False)
+        self.stats.draw_calls += len(batches)
+
+        # Transparent objects are blended back-to-front without depth writes
+        depths = -(world_matrices[transparent, :3, 3] @ view[2, :3] + view[2, 3])
+        for order in np.argsort(-depths, kind="stable"):
+            i = transparent[order]
+            obj = renderables[i]
+            self._draw(*self._assemble(meshes[i], obj.material, world_matrices[i:i + 1], view_projection), blend=True)
+            self.stats.draw_calls += 1
+
+    def get_image(self) -> np.ndarray:
+        """Return the last frame as an (height, width, 4) uint8 RGBA array, top row first."""
+        return (np.clip(self.color_buffer, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+
+    def _cull(self, renderables, world_matrices: np.ndarray, view_projection: np.ndarray) -> np.ndarray:
+        """Frustum-test all renderables at once; returns a visibility mask."""
+        planes = extract_frustum_planes(view_projection, out=self._frustum_planes)
+
+        centers, half_extents, radii = gather_bounds(renderables)
+        return cull_bounds(planes, world_matrices, centers, half_extents, radii)
+
+    def _assemble(self, mesh, material, models: np.ndarray, view_projection: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Transform a mesh drawn with K model matrices into per-triangle arrays.
+
+        Returns (clip, world, normals, materials) shaped (T, 3, 4), (T, 3, 3),
+        (T, 3, 3) and (T, 5); material rows are RGBA color and shininess.
+        """
+        vertices = np.asarray(mesh.vertices, dtype=np.float32).reshape(-1, 3)
+        faces = np.asarray(mesh.indices, dtype=np.intp).reshape(-1, 3)
+        normals = np.asarray(mesh.normals, dtype=np.float32).reshape(-1, 3)
+        if len(normals) != len(vertices):
+            normals = np.zeros_like(vertices)
+
+        bases = models[:, :3, :3]
+        world = vertices @ bases.transpose(0, 2, 1) + models[:, None, :3, 3]
+        # Normals transform by the inverse-transpose of the model basis; the
+        # cofactor form stays finite for zero-scale objects, whose triangles
+        # then have no area and rasterize to nothing
+        world_normals = normals @ normal_matrices(bases).transpose(0, 2, 1)
+        clip = world @ view_projection[:, :3].T + view_projection[:, 3]
+
+        count = len(models) * len(faces)
+        if material is None:
+            row = np.array((1.0, 1.0, 1.0, 1.0, 32.0), dtype=np.float32)
+        else:
+            row = np.array((*to_rgba(material.color), material.shininess), dtype=np.float32)
+        return (
+            clip[:, faces].reshape(count, 3, 4),
+            world[:, faces].reshape(count, 3, 3),
+            world_normals[:, faces].reshape(count, 3, 3),
+            np.broadcast_to(row, (count, 5)),
+        )
+
+    def _draw(self, clip: np.ndarray, world: np.ndarray, normals: np.ndarray, materials: np.ndarray, blend: bool) -> None:
+        """Rasterize triangles and shade the visible fragments."""
+        w = clip[..., 3]
+        # Triangles crossing the near plane are dropped rather than clipped
+        in_front = np.all((w > 1e-6) & (clip[..., 2] >= -w), axis=1)
+        outside = np.zeros(len(clip), dtype=bool)
+        for axis in range(3):
+            outside |= np.all(clip[..., axis] > w, axis=1)
+            outside |= np.all(clip[..., axis] < -w, axis=1)
+        keep = np.flatnonzero(in_front & ~outside)
+        if not keep.size:
+            return
+        clip, world, normals, materials = clip[keep], world[keep], normals[keep], materials[keep]
+        self.stats.triangles += len(keep)
+
+        inv_w = 1.0 / clip[..., 3]
+        ndc = clip[..., :3] * inv_w[..., None]
+        sx = (ndc[..., 0] * 0.5 + 0.5) * self.width
+        sy = (0.5 - ndc[..., 1] * 0.5) * self.height  # row 0 is the top of the image
+        sz = ndc[..., 2] * 0.5 + 0.5
+
+        # Edge equations: barycentric b_i(x, y) = a_i * x + b_i * y + c_i
+        x0, x1, x2 = sx[:, 0], sx[:, 1], sx[:, 2]
+        y0, y1, y2 = sy[:, 0], sy[:, 1], sy[:, 2]
+        area = (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
+        valid = np.abs(area) > 1e-12
+        area = np.where(valid, area, 1.0)
+        edge_a = np.stack((y1 - y2, y2 - y0, y0 - y1), axis=1) / area[:, None]
+        edge_b = np.stack((x2 - x1, x0 - x2, x1 - x0), axis=1) / area[:, None]
+        edge_c = np.stack((x1 * y2 - x2 * y1, x2 * y0 - x0 * y2, x0 * y1 - x1 * y0), axis=1) / area[:, None]
+
+        # Pixel range covered by each triangle's bounds (pixel centers at +0.5)
+        px0 = np.clip(np.ceil(sx.min(axis=1) - 0.5), 0, self.width - 1).astype(np.int64)
+        px1 = np.clip(np.floor(sx.max(axis=1) - 0.5), -1, self.width - 1).astype(np.int64)
+        py0 = np.clip(np.ceil(sy.min(axis=1) - 0.5), 0, self.height - 1).astype(np.int64)
+        py1 = np.clip(np.floor(sy.max(axis=1) - 0.5), -1, self.height - 1).astype(np.int64)
+        valid &= (px0 <= px1) & (py0 <= py1)
+
+        triangles, tiles = self._bin(np.flatnonzero(valid), px0, px1, py0, py1)
+
+        frame_tri = np.full(self.width * self.height, -1, dtype=np.int64)
+        frame_bary = np.zeros((self.width * self.height, 2), dtype=np.float32)
+        depth = self.depth_buffer.reshape(-1)
+        fragments = []  # blended (pixel, triangle, b0, b1) per chunk
+
+        pixels_per_tile = self.tile_size * self.tile_size
+        chunk = max(1, self.max_fragments // pixels_per_tile)
+        for start in range(0, len(triangles), chunk):
+            tri = triangles[start:start + chunk]
+            tile = tiles[start:start + chunk]
+            px = (tile % self._tiles_x * self.tile_size)[:, None] + self._tile_x
+            py = (tile // self._tiles_x * self.tile_size)[:, None] + self._tile_y
+
+            fx = px + np.float32(0.5)
+            fy = py + np.float32(0.5)
+            b0 = edge_a[tri, 0, None] * fx + edge_b[tri, 0, None] * fy + edge_c[tri, 0, None]
+            b1 = edge_a[tri, 1, None] * fx + edge_b[tri, 1, None] * fy + edge_c[tri, 1, None]
+            b2 = 1.0 - b0 - b1
+            z = b0 * sz[tri, 0, None] + b1 * sz[tri, 1, None] + b2 * sz[tri, 2, None]
+            covered = (
+                (b0 >= 0) & (b1 >= 0) & (b2 >= 0)
+                & (px < self.width) & (py < self.height)
+                & (z >= 0.0) & (z <= 1.0)
+            )
+
+            rows, cols = np.nonzero(covered)
+            if not rows.size:
+                continue
+            pixel = py[rows, cols] * self.width + px[rows, cols]
+            z = z[rows, cols]
+
+            if blend:
+                # Transparent fragments are tested but not written, and all of them blend
+                passed = z < depth[pixel]
+                rows, cols = rows[passed], cols[passed]
+                fragments.append((pixel[passed], tri[rows], b0[rows, cols], b1[rows, cols]))
+                continue
+
+            # Keep the nearest fragment per pixel, then z-test it against the buffer
+            order = np.lexsort((z, pixel))
+            pixel, z, rows, cols = pixel[order], z[order], rows[order], cols[order]
+            first = np.ones(len(pixel), dtype=bool)
+            first[1:] = pixel[1:] != pixel[:-1]
+            pixel, z, rows, cols = pixel[first], z[first], rows[first], cols[first]
+
+            passed = z < depth[pixel]
+            pixel, rows, cols = pixel[passed], rows[passed], cols[passed]
+            depth[pixel] = z[passed]
+            frame_tri[pixel] = tri[rows]
+            frame_bary[pixel, 0] = b0[rows, cols]
+            frame_bary[pixel, 1] = b1[rows, cols]
+
+        target = self.color_buffer.reshape(-1, 4)
+        if not blend:
+            pixel = np.flatnonzero(frame_tri >= 0)
+            if pixel.size:
+                tri = frame_tri[pixel]
+                target[pixel, :3] = self._shade(tri, frame_bary[pixel], inv_w, world, normals, materials)
+                target[pixel, 3] = materials[tri, 3]
+            return
+        if not fragments:
+            return
+
+        # Like GL with depth writes off, every fragment blends in triangle
+        # submission order, so overlapping faces of one object all contribute
+        pixel, tri, bary0, bary1 = (np.concatenate(parts) for parts in zip(*fragments))
+        order = np.lexsort((tri, pixel))
+        pixel, tri = pixel[order], tri[order]
+        bary = np.stack((bary0[order], bary1[order]), axis=1)
+        rgb = self._shade(tri, bary, inv_w, world, normals, materials)
+        alpha = materials[tri, 3:4]
+
+        # Composite one layer at a time; a layer holds at most one fragment per pixel
+        first = np.ones(len(pixel), dtype=bool)
+        first[1:] = pixel[1:] != pixel[:-1]
+        position = np.arange(len(pixel))
+        layer = position - np.maximum.accumulate(np.where(first, position, 0))
+        for k in range(int(layer.max()) + 1):
+            sel = np.flatnonzero(layer == k)
+            p, a = pixel[sel], alpha[sel]
+            target[p, :3] = rgb[sel] * a + target[p, :3] * (1.0 - a)
+
+    def _bin(self, candidates: np.ndarray, px0, px1, py0, py1) -> Tuple[np.ndarray, np.ndarray]:
+        """Expand triangles into (triangle, tile) pairs for every tile their bounds touch."""
+        ts = self.tile_size
+        tx0, tx1 = px0[candidates] // ts, px1[candidates] // ts
+        ty0, ty1 = py0[candidates] // ts, py1[candidates] // ts
+        span_x = tx1 - tx0 + 1
+        counts = span_x * (ty1 - ty0 + 1)
+        total = int(counts.sum())
+
+        triangles = np.repeat(candidates, counts)
+        # Position of each pair within its triangle's tile rectangle
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        span_x = np.repeat(span_x, counts)
+        tile_x = np.repeat(tx0, counts) + offsets % span_x
+        tile_y = np.repeat(ty0, counts) + offsets // span_x
+        tiles = tile_y * self._tiles_x + tile_x
+
+        # Grouping pairs by tile keeps each batch's pixel writes local
+        order = np.argsort(tiles, kind="stable")
+        return triangles[order], tiles[order]
+
+    def _shade(self, tri, barycentrics, inv_w, world, normals, materials) -> np.ndarray:
+        """Phong-lit RGB of fragments given by triangle and first two barycentrics."""
+        bary = np.empty((len(tri), 3), dtype=np.float32)
+        bary[:, :2] = barycentrics
+        bary[:, 2] = 1.0 - bary[:, 0] - bary[:, 1]
+
+        # Perspective-correct interpolation weights
+        weights = bary * inv_w[tri]
+        weights /= weights.sum(axis=1, keepdims=True)
+        frag_pos = np.einsum("ni,nij->nj", weights, world[tri])
+        norm = np.einsum("ni,nij->nj", weights, normals[tri])
+
+        norm = _normalize(norm)
+        view_dir = _normalize(self._view_pos - frag_pos)
+        material = materials[tri]
+        shininess = material[:, 4]
+
+        lighting = np.zeros_like(frag_pos)
+        for position, color in zip(self._light_positions, self._light_colors):
+            to_light = position[:3] - frag_pos
+            if position[3] > 0.0:
+                # Ranged lights only touch fragments inside their sphere
+                distance = np.linalg.norm(to_light, axis=1)
+                lit = np.flatnonzero(distance < position[3])
+                if not lit.size:
+                    continue
+                falloff = 1.0 - distance[lit] / position[3]
+                attenuation = falloff * falloff
+            else:
+                lit = slice(None)
+                attenuation = 1.0
+
+            n, v, light_dir = norm[lit], view_dir[lit], _normalize(to_light[lit])
+            n_dot_l = np.sum(n * light_dir, axis=1)
+            diffuse = np.maximum(n_dot_l, 0.0)
+            reflect_dir = 2.0 * n_dot_l[:, None] * n - light_dir
+            specular = self.SPECULAR_STRENGTH * np.maximum(np.sum(v * reflect_dir, axis=1), 0.0) ** shininess[lit]
+            lighting[lit] += ((self.AMBIENT_STRENGTH + diffuse + specular) * attenuation)[:, None] * color[:3]
+
+        return lighting * material[:, :3]
+
+    def cleanup(self) -> None:
+        """Release the frame buffers."""
+        self.logger.info("Cleaning up software renderer")
+        self.color_buffer = np.zeros((0, 0, 4), dtype=np.float32)
+        self.depth_buffer = np.zeros((0, 0), dtype=np.float32)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Normalize rows, leaving zero-length rows at zero."""
+    lengths = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, lengths, out=np.zeros_like(vectors), where=lengths > 0)
@@ -0,0 +1,368 @@
+"""Batched 2D sprite rendering.
+
+Sprites are accumulated per frame as rows of a growable NumPy array: an
+affine placement of the unit quad, a layer, a uv rectangle, a color and the
+index of the texture they sample. On flush, quads outside the view are culled
+in clip space and the rest are sorted by layer and then texture (atlas pages
+are shared textures). The sorted rows go into one dynamic vertex buffer as
+per-instance data, and each run of quads sharing a texture is one instanced
+draw whose vertex shader expands the quad corners. A frame of sprites from a
+single atlas page is one draw call.
+
+Sorting by texture inside a layer does not keep submission order between
+quads of different textures; overlapping sprites that must stack in a given
+order belong in different layers.
+"""
+from typing import Dict, List, Optional, Tuple
+import ctypes
+import math
+from OpenGL.GL import *
+import numpy as np
+from fortini_engine.utils.color import to_rgba
+from fortini_engine.assets.texture import AtlasPage
+
+# Vertex attribute locations of the sprite program, one vec4 per row quarter
+ATTRIB_SPRITE_AXES = 0
+ATTRIB_SPRITE_ORIGIN = 1
+ATTRIB_SPRITE_UV = 2
+ATTRIB_SPRITE_COLOR = 3
+
+# Row layout of a queued sprite: the quad corner (cx, cy) in [-0.5, 0.5]
+# lands at (tx, ty) + cx * (ax, ay) + cy * (bx, by)
+SPRITE_FLOATS = 16
+_AXIS_A = slice(0, 2)
+_AXIS_B = slice(2, 4)
+_TRANSLATION = slice(4, 6)
+_Z = 6
+_LAYER = 7
+_UV = slice(8, 12)
+_COLOR = slice(12, 16)
+
+FULL_UV = (0.0, 0.0, 1.0, 1.0)
+WHITE = (1.0, 1.0, 1.0, 1.0)
+
+
+class SpriteBatch:
+    """Collects textured quads for a frame and draws them in as few calls as possible."""
+
+    def __init__(self, state, textures, shader, capacity: int = 1024):
+        self.state = state
+        self.textures = textures
+        self.shader = shader
+
+        self._sprites = np.zeros((capacity, SPRITE_FLOATS), dtype=np.float32)
+        self._texture_ids = np.zeros(capacity, dtype=np.int32)
+        self._texture_keys: List = []
+        self._texture_index: Dict = {}
+        self._atlases: Dict[int, object] = {}
+        self.count = 0
+        self._sprite_cache: Optional[_SpriteCache] = None
+
+        self.vao = None
+        self._instance_vbo = None
+
+        # Totals of the last flush
+        self.draw_calls = 0
+        self.drawn = 0
+        self.culled = 0
+
+    def draw(self, texture, x: float, y: float, width: float, height: float, rotation: float = 0.0,
+             uv: Tuple[float, float, float, float] = FULL_UV, color: Tuple[float, ...] = WHITE,
+             layer: float = 0.0, z: float = 0.0) -> None:
+        """Queue one quad centered on (x, y), rotated by `rotation` degrees."""
+        row = self._reserve(1).start
+        self._texture_ids[row] = self._texture_id(texture)
+        sprite = self._sprites[row]
+        cos, sin = math.cos(math.radians(rotation)), math.sin(math.radians(rotation))
+        sprite[:6] = (cos * width, sin * width, -sin * height, cos * height, x, y)
+        sprite[_Z] = z
+        sprite[_LAYER] = layer
+        sprite[_UV] = uv
+        sprite[_COLOR] = to_rgba(color)
+
+    def draw_region(self, atlas, region, x: float, y: float, width: Optional[float] = None,
+                    height: Optional[float] = None, **kwargs) -> None:
+        """Queue a quad showing an atlas region (name or AtlasRegion); the size defaults to its pixel size."""
+        if isinstance(region, str):
+            region = atlas.regions[region]
+        self.draw(
+            self.atlas_page(atlas, region), x, y,
+            region.width if width is None else width, region.height if height is None else height,
+            uv=region.uv, **kwargs,
+        )
+
+    def draw_many(self, texture, positions: np.ndarray, sizes, rotations=None, uvs=None, colors=None,
+                  layers=None, z: float = 0.0) -> None:
+        """Queue N quads sampling one texture from arrays.
+
+        `positions` is (N, 2); `sizes` is (N, 2) or a single (width, height);
+        `rotations` (degrees), `layers`, `uvs` (N, 4) and `colors` (N, 4) are
+        optional per-quad arrays or single values.
+        """
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 2)
+        count = len(positions)
+        if count == 0:
+            return
+        sizes = np.broadcast_to(np.asarray(sizes, dtype=np.float32), (count, 2))
+        rows = self._reserve(count)
+        self._texture_ids[rows] = self._texture_id(texture)
+        sprites = self._sprites[rows]
+        if rotations is None:
+            sprites[:, 0] = sizes[:, 0]
+            sprites[:, 1:3] = 0.0
+            sprites[:, 3] = sizes[:, 1]
+        else:
+            angles = np.radians(np.asarray(rotations, dtype=np.float32))
+            cos, sin = np.cos(angles), np.sin(angles)
+            sprites[:, 0] = cos * sizes[:, 0]
+            sprites[:, 1] = sin * sizes[:, 0]
+            sprites[:, 2] = -sin * sizes[:, 1]
+            sprites[:, 3] = cos * sizes[:, 1]
+        sprites[:, _TRANSLATION] = positions
+        sprites[:, _Z] = z
+        sprites[:, _LAYER] = 0.0 if layers is None else layers
+        sprites[:, _UV] = FULL_UV if uvs is None else uvs
+        sprites[:, _COLOR] = WHITE if colors is None else colors
+
+    def draw_text(self, font, text: str, x: float, y: float, color: Tuple[float, ...] = WHITE,
+                  scale: float = 1.0, layer: float = 0.0, z: float = 0.0):
+        """Queue a string with its top-left corner at (x, y), `scale` units per font pixel; returns its layout.
+
+        The font's cached layout is reused as long as the string is unchanged.
+        """
+        layout = font.layout(text)
+        count = len(layout.rows)
+        if count == 0:
+            return layout
+        atlas = font.atlas
+        self._atlases[id(atlas)] = atlas
+        page_ids = np.array([self._texture_id(page) for page in atlas.pages], dtype=np.int32)
+        rows = self._reserve(count)
+        self._texture_ids[rows] = page_ids[layout.pages]
+        sprites = self._sprites[rows]
+        sprites[:] = layout.rows
+        sprites[:, :4] *= scale
+        sprites[:, _TRANSLATION] *= scale
+        sprites[:, _TRANSLATION] += (x, y)
+        sprites[:, _Z] = z
+        sprites[:, _LAYER] = layer
+        sprites[:, _COLOR] = to_rgba(color)
+        return layout
+
+    def add_rows(self, texture_ids: np.ndarray, rows: np.ndarray) -> None:
+        """Queue prepared sprite rows (see SPRITE_FLOATS) with per-row ids from texture_id()."""
+        count = len(rows)
+        if count == 0:
+            return
+        reserved = self._reserve(count)
+        self._sprites[reserved] = rows
+        self._texture_ids[reserved] = texture_ids
+
+    def add_sprites(self, objects, world_matrices: np.ndarray) -> None:
+        """Queue the Sprite components of objects, placed by their (N, 4, 4) world matrices.
+
+        Sprite attributes are kept from the previous call for the same sprites
+        and only re-read for sprites whose revision changed.
+        """
+        count = len(objects)
+        if count == 0:
+            return
+        components = [obj.components["sprite"] for obj in objects]
+        revisions = np.fromiter((sprite.revision for sprite in components), dtype=np.int64, count=count)
+        cache = self._sprite_cache
+        if cache is None or cache.components != components:
+            cache = self._sprite_cache = _SpriteCache(components)
+            changed = range(count)
+        else:
+            changed = np.flatnonzero(revisions != cache.revisions).tolist()
+        if changed:
+            cache.refresh(components, changed)
+            cache.revisions = revisions
+
+        for atlas in cache.atlases.values():
+            self._atlases[id(atlas)] = atlas
+        frame_ids = np.array([self._texture_id(key) for key in cache.keys], dtype=np.int32)
+        attributes = cache.attributes
+        rows = self._reserve(count)
+        self._texture_ids[rows] = frame_ids[cache.key_ids]
+        sprites = self._sprites[rows]
+        # The quad's x and y axes are the matrix's first two columns scaled by the sprite size
+        sprites[:, _AXIS_A] = world_matrices[:, :2, 0] * attributes[:, 0:1]
+        sprites[:, _AXIS_B] = world_matrices[:, :2, 1] * attributes[:, 1:2]
+        sprites[:, _TRANSLATION] = world_matrices[:, :2, 3]
+        sprites[:, _Z] = world_matrices[:, 2, 3]
+        sprites[:, _LAYER] = attributes[:, 2]
+        sprites[:, _UV] = attributes[:, 3:7]
+        sprites[:, _COLOR] = attributes[:, 7:11]
+
+    def texture_id(self, texture) -> int:
+        """Small integer standing for a texture key during this frame."""
+        return self._texture_id(texture)
+
+    def atlas_page(self, atlas, region) -> AtlasPage:
+        """Texture key of the page holding an atlas region; the atlas is uploaded on flush."""
+        self._atlases[id(atlas)] = atlas
+        return atlas.pages[region.page]
+
+    def flush(self, view_projection: np.ndarray) -> int:
+        """Cull, sort and draw the queued quads, then clear the batch; returns the draw count."""
+        count = self.count
+        self.draw_calls = self.drawn = self.culled = 0
+        if count == 0:
+            self.clear()
+            return 0
+
+        sprites = self._sprites[:count]
+        vp = np.asarray(view_projection, dtype=np.float32)
+        visible = self._cull(sprites, vp)
+        order = np.flatnonzero(visible) if visible is not None else np.arange(count)
+        self.culled = count - len(order)
+        if len(order) == 0:
+            self.clear()
+            return 0
+
+        texture_ids = self._texture_ids[:count][order]
+        order = order[np.lexsort((texture_ids, sprites[order, _LAYER]))]
+        texture_ids = self._texture_ids[:count][order]
+        data = sprites[order]
+
+        self._ensure_buffers()
+        self.state.use_program(self.shader.program)
+        self.shader.set_mat4("viewProjection", vp)
+        for atlas in self._atlases.values():
+            self.textures.sync_atlas(atlas)
+        glBindBuffer(GL_ARRAY_BUFFER, self._instance_vbo)
+        glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STREAM_DRAW)
+
+        depth_test = glIsEnabled(GL_DEPTH_TEST)
+        glDisable(GL_DEPTH_TEST)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        self.state.bind_vertex_array(self.vao)
+
+        # One instanced draw per run of quads sharing a texture
+        starts = np.concatenate(([0], np.flatnonzero(texture_ids[1:] != texture_ids[:-1]) + 1, [len(order)]))
+        for start, end in zip(starts[:-1].tolist(), starts[1:].tolist()):
+            self._bind(self._texture_keys[texture_ids[start]])
+            self._point_attributes(start)
+            glDrawArraysInstanced(GL_TRIANGLE_STRIP, 0, 4, end - start)
+            self.draw_calls += 1
+
+        glDisable(GL_BLEND)
+        if depth_test:
+            glEnable(GL_DEPTH_TEST)
+        self.drawn = len(order)
+        self.clear()
+        return self.draw_calls
+
+    def clear(self) -> None:
+        """Drop the queued quads."""
+        self.count = 0
+        self._texture_keys = []
+        self._texture_index = {}
+        self._atlases = {}
+
+    def _reserve(self, count: int) -> slice:
+        """Rows for `count` more quads, growing the arrays by doubling."""
+        start = self.count
+        end = start + count
+        if end > len(self._sprites):
+            capacity = max(end, 2 * len(self._sprites))
+            sprites = np.zeros((capacity, SPRITE_FLOATS), dtype=np.float32)
+            sprites[:start] = self._sprites[:start]
+            texture_ids = np.zeros(capacity, dtype=np.int32)
+            texture_ids[:start] = self._texture_ids[:start]
+            self._sprites, self._texture_ids = sprites, texture_ids
+        self.count = end
+        return slice(start, end)
+
+    def _texture_id(self, texture) -> int:
+        """Index of a texture key in this frame's key list."""
+        index = self._texture_index.get(texture)
+        if index is None:
+            index = self._texture_index[texture] = len(self._texture_keys)
+            self._texture_keys.append(texture)
+        return index
+
+    def _bind(self, key) -> None:
+        """Bind a texture key; atlas pages bind their page texture, None binds white."""
+        if isinstance(key, AtlasPage):
+            key = key.texture
+        if key is None or not self.textures.bind(key):
+            self.textures.bind_fallback()
+
+    @staticmethod
+    def _cull(sprites: np.ndarray, view_projection: np.ndarray) -> Optional[np.ndarray]:
+        """Mask of quads whose bounds overlap the view; None (no culling) for perspective projections.
+
+        With an affine view-projection (orthographic cameras) each quad's
+        clip-space box is its center plus the absolute projected half extents.
+        """
+        if not np.array_equal(view_projection[3], (0.0, 0.0, 0.0, 1.0)):
+            return None
+        xy = view_projection[:2]
+        centers = sprites[:, _TRANSLATION] @ xy[:, :2].T + np.outer(sprites[:, _Z], xy[:, 2]) + xy[:, 3]
+        half = (np.abs(sprites[:, _AXIS_A]) + np.abs(sprites[:, _AXIS_B])) * 0.5
+        extents = half @ np.abs(xy[:, :2]).T
+        return np.all(np.abs(centers) <= 1.0 + extents, axis=1)
+
+    def _ensure_buffers(self) -> None:
+        """Create the VAO and instance buffer on first use; corners come from gl_VertexID."""
+        if self.vao is not None:
+            return
+        self.vao = glGenVertexArrays(1)
+        self._instance_vbo = glGenBuffers(1)
+        self.state.bind_vertex_array(self.vao)
+        for location in (ATTRIB_SPRITE_AXES, ATTRIB_SPRITE_ORIGIN, ATTRIB_SPRITE_UV, ATTRIB_SPRITE_COLOR):
+            glEnableVertexAttribArray(location)
+            glVertexAttribDivisor(location, 1)
+
+    def _point_attributes(self, first: int) -> None:
+        """Point the per-instance attributes at row `first` of the instance buffer."""
+        stride = SPRITE_FLOATS * 4
+        glBindBuffer(GL_ARRAY_BUFFER, self._instance_vbo)
+        for column, location in enumerate((ATTRIB_SPRITE_AXES, ATTRIB_SPRITE_ORIGIN, ATTRIB_SPRITE_UV, ATTRIB_SPRITE_COLOR)):
+            glVertexAttribPointer(location, 4, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(first * stride + column * 16))
+
+    def release(self) -> None:
+        """Delete the VAO and instance buffer."""
+        if self.vao is None:
+            return
+        glDeleteBuffers(1, [self._instance_vbo])
+        glDeleteVertexArrays(1, [self.vao])
+        self.vao = self._instance_vbo = None
+
+    def __repr__(self) -> str:
+        return f"SpriteBatch(queued={self.count}, capacity={len(self._sprites)})"
+
+
+class _SpriteCache:
+    """Sprite component attributes of the last add_sprites() call, refreshed per changed sprite."""
+
+    def __init__(self, components: List):
+        count = len(components)
+        self.components = components
+        self.revisions = np.zeros(count, dtype=np.int64)
+        self.attributes = np.zeros((count, 11), dtype=np.float32)  # size, layer, uv, color
+        self.key_ids = np.zeros(count, dtype=np.intp)
+        self.keys: List = []          # distinct texture keys, indexed by key_ids
+        self._key_index: Dict = {}
+        self.atlases: Dict[int, object] = {}
+
+    def refresh(self, components: List, changed) -> None:
+        """Re-read the attributes and texture keys of sprites at the `changed` indices."""
+        attributes = self.attributes
+        key_ids = self.key_ids
+        for i in changed:
+            sprite = components[i]
+            attributes[i] = (*sprite.size, sprite.layer, *sprite.uv, *sprite.color)
+            if sprite.atlas is None:
+                key = sprite.texture
+            else:
+                key = sprite.atlas.pages[sprite.region.page]
+                self.atlases[id(sprite.atlas)] = sprite.atlas
+            key_id = self._key_index.get(key)
+            if key_id is None:
+                key_id = self._key_index[key] = len(self.keys)
+                self.keys.append(key)
+            key_ids[i] = key_id
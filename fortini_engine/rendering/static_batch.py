@@ -0,0 +1,175 @@
+"""Static batching of objects that never move.
+
+Objects flagged `static` have their mesh vertices pre-transformed by their
+world matrix and merged per material into combined meshes, so the renderer
+draws each batch once with an identity model matrix. When a member moves or
+is flagged with `mark_static_dirty()`, only its slice of the batch is
+re-transformed; batches are rebuilt from scratch only when membership or a
+member's vertex count changes.
+"""
+
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from fortini_engine.assets.manager import Mesh
+from fortini_engine.utils.math_utils import normal_matrices
+
+
+class StaticBatch:
+    """A merged mesh holding the pre-transformed geometry of several objects."""
+
+    def __init__(self, material, members: List, world_matrices: np.ndarray):
+        self.material = material
+        self.members = members
+        self.active = True
+        name = material.name if material is not None else "Default"
+        self.mesh = Mesh(f"StaticBatch_{name}")
+        self.baked_matrices = world_matrices.copy()
+        self.vertex_ranges = np.zeros((len(members), 2), dtype=np.int64)  # (start, count)
+        self._build()
+
+    def _build(self) -> None:
+        """Transform and concatenate every member's geometry."""
+        vertex_counts = [len(obj.mesh.vertices) for obj in self.members]
+        total = sum(vertex_counts)
+        starts = np.concatenate([[0], np.cumsum(vertex_counts)[:-1]]).astype(np.int64)
+        self.vertex_ranges[:, 0] = starts
+        self.vertex_ranges[:, 1] = vertex_counts
+
+        self.mesh.vertices = np.empty((total, 3), dtype=np.float32)
+        self.mesh.normals = np.zeros((total, 3), dtype=np.float32)
+        self.mesh.uv_coords = np.zeros((total, 2), dtype=np.float32)
+        indices = []
+        for i, obj in enumerate(self.members):
+            self._bake_member(i)
+            indices.append(np.asarray(obj.mesh.indices, dtype=np.uint32).ravel() + np.uint32(starts[i]))
+        self.mesh.indices = np.concatenate(indices) if indices else np.array([], dtype=np.uint32)
+
+    def _bake_member(self, i: int) -> None:
+        """Write member `i`'s world-space vertices into its slice of the batch."""
+        mesh = self.members[i].mesh
+        start, count = self.vertex_ranges[i]
+        end = start + count
+        matrix = self.baked_matrices[i]
+        basis = matrix[:3, :3]
+
+        vertices = np.asarray(mesh.vertices, dtype=np.float32).reshape(-1, 3)
+        self.mesh.vertices[start:end] = vertices @ basis.T + matrix[:3, 3]
+
+        normals = np.asarray(mesh.normals, dtype=np.float32).reshape(-1, 3)
+        if len(normals) == count:
+            # Normals transform by the inverse-transpose of the basis (cofactor
+            # form, so zero-scale members bake instead of raising)
+            transformed = normals @ normal_matrices(basis).T
+            lengths = np.linalg.norm(transformed, axis=1, keepdims=True)
+            self.mesh.normals[start:end] = np.divide(
+                transformed, lengths, out=np.zeros_like(transformed), where=lengths > 0
+            )
+        else:
+            self.mesh.normals[start:end] = 0.0
+
+        uvs = np.asarray(mesh.uv_coords, dtype=np.float32).reshape(-1, 2)
+        self.mesh.uv_coords[start:end] = uvs if len(uvs) == count else 0.0
+
+    def refresh(
+        self,
+        world_matrices: np.ndarray,
+        on_vertices_changed: Optional[Callable[[Mesh, int, int], None]] = None,
+    ) -> int:
+        """Re-bake members that moved or were flagged dirty; returns how many.
+
+        Falls back to a full rebuild when a member's vertex count changed.
+        """
+        moved = np.any(world_matrices != self.baked_matrices, axis=(1, 2))
+        flagged = np.fromiter((obj.static_dirty for obj in self.members), dtype=bool, count=len(self.members))
+        dirty = np.flatnonzero(moved | flagged)
+        if not dirty.size:
+            return 0
+
+        self.baked_matrices[dirty] = world_matrices[dirty]
+        for i in dirty.tolist():
+            self.members[i].static_dirty = False
+
+        if any(len(self.members[i].mesh.vertices) != self.vertex_ranges[i, 1] for i in dirty.tolist()):
+            self._build()
+            return len(dirty)
+
+        for i in dirty.tolist():
+            self._bake_member(i)
+            if on_vertices_changed is not None:
+                start, count = self.vertex_ranges[i]
+                on_vertices_changed(self.mesh, int(start), int(count))
+        self.mesh.invalidate_bounds()
+        return len(dirty)
+
+    def __repr__(self) -> str:
+        return f"StaticBatch(material={self.material}, members={len(self.members)}, vertices={len(self.mesh.vertices)})"
+
+
+class StaticBatcher:
+    """Maintains the static batches for the static objects of a scene."""
+
+    def __init__(self, max_batch_vertices: int = 262144):
+        self.max_batch_vertices = max_batch_vertices
+        self.batches: List[StaticBatch] = []
+        self._membership = ()
+        self._member_slices: List[np.ndarray] = []
+
+    def update(
+        self,
+        objects: List,
+        world_matrices: np.ndarray,
+        on_vertices_changed: Optional[Callable[[Mesh, int, int], None]] = None,
+    ) -> List[StaticBatch]:
+        """Sync batches with the current static objects and their world matrices.
+
+        Rebuilds all batches when the set of static objects changed, otherwise
+        only re-bakes members that moved or were flagged dirty.
+        """
+        membership = tuple((id(obj), id(obj.mesh), id(obj.material)) for obj in objects)
+        if membership != self._membership:
+            self._rebuild(objects, world_matrices)
+            self._membership = membership
+            return self.batches
+
+        for batch, order in zip(self.batches, self._member_slices):
+            batch.refresh(world_matrices[order], on_vertices_changed)
+        return self.batches
+
+    def _rebuild(self, objects: List, world_matrices: np.ndarray) -> None:
+        """Group objects per material and build batches from scratch."""
+        groups: Dict[int, List[int]] = {}
+        materials = {}
+        for i, obj in enumerate(objects):
+            key = id(obj.material)
+            materials[key] = obj.material
+            groups.setdefault(key, []).append(i)
+
+        self.batches = []
+        self._member_slices = []
+        for key, members in groups.items():
+            # Split large groups so batches stay cullable and index ranges small
+            chunk: List[int] = []
+            chunk_vertices = 0
+            for i in members + [None]:
+                count = len(objects[i].mesh.vertices) if i is not None else 0
+                if chunk and (i is None or chunk_vertices + count > self.max_batch_vertices):
+                    order = np.array(chunk, dtype=np.intp)
+                    self.batches.append(StaticBatch(materials[key], [objects[j] for j in chunk], world_matrices[order]))
+                    self._member_slices.append(order)
+                    chunk, chunk_vertices = [], 0
+                if i is not None:
+                    chunk.append(i)
+                    chunk_vertices += count
+
+        for obj in objects:
+            obj.static_dirty = False
+
+    def clear(self) -> None:
+        """Drop all batches."""
+        self.batches = []
+        self._membership = ()
+        self._member_slices = []
+
+    @property
+    def object_count(self) -> int:
+        return sum(len(batch.members) for batch in self.batches)
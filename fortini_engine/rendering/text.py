@@ -0,0 +1,146 @@
+"""Text rendering from a glyph atlas.
+
+A `Font` rasterizes each glyph once with pygame's font module into a
+TextureAtlas and lays strings out into sprite-batch rows. Layouts are cached
+per font, keyed by the string, so text that does not change from one frame
+to the next (labels, or a score between updates) is never laid out again.
+Drawing a cached layout only offsets, scales and tints a copy of its rows
+(see SpriteBatch.draw_text).
+
+Glyphs are stored white, with coverage in alpha, so one atlas serves every
+text color. Layout uses per-glyph advances without kerning.
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import string
+import numpy as np
+from fortini_engine.assets.texture import TextureAtlas, AtlasRegion
+from fortini_engine.rendering.sprite_batch import SPRITE_FLOATS
+
+# Characters rasterized when a font is created
+DEFAULT_CHARACTERS = string.ascii_letters + string.digits + string.punctuation + " "
+
+
+class Glyph:
+    """A rasterized character: its atlas region and horizontal advance, in pixels."""
+
+    __slots__ = ("region", "advance", "width", "height")
+
+    def __init__(self, region: Optional[AtlasRegion], advance: int, width: int, height: int):
+        self.region = region  # None for blank glyphs (spaces)
+        self.advance = advance
+        self.width = width
+        self.height = height
+
+
+class TextLayout:
+    """A laid-out string: sprite rows relative to its top-left corner, in font pixels."""
+
+    __slots__ = ("text", "rows", "pages", "width", "height")
+
+    def __init__(self, text: str, rows: np.ndarray, pages: np.ndarray, width: float, height: float):
+        self.text = text
+        self.rows = rows    # (N, SPRITE_FLOATS), one per visible glyph
+        self.pages = pages  # (N,) atlas page index of each glyph
+        self.width = width
+        self.height = height
+
+    def __repr__(self) -> str:
+        return f"TextLayout({self.text!r}, glyphs={len(self.rows)}, size=({self.width}, {self.height}))"
+
+
+class Font:
+    """A pygame font whose glyphs live in a texture atlas, with a layout cache."""
+
+    def __init__(self, path: Optional[str] = None, size: int = 16, atlas: Optional[TextureAtlas] = None,
+                 antialias: bool = True, characters: str = DEFAULT_CHARACTERS, cache_size: int = 256):
+        import pygame
+
+        if not pygame.font.get_init():
+            pygame.font.init()
+        self.path = path
+        self.size = size
+        self.antialias = antialias
+        self.font = pygame.font.Font(path, size)
+        self.line_height = self.font.get_linesize()
+        self.atlas = atlas or TextureAtlas(page_size=512)
+        self.glyphs: Dict[str, Glyph] = {}
+        self.cache_size = cache_size
+        self._layouts: "OrderedDict[str, TextLayout]" = OrderedDict()
+        self.layouts_built = 0  # cache misses, total
+        self.glyph(characters)
+
+    def glyph(self, characters: str) -> Glyph:
+        """Rasterize any new characters into the atlas; returns the glyph of the last one."""
+        glyph = None
+        for char in characters:
+            glyph = self.glyphs.get(char)
+            if glyph is None:
+                glyph = self.glyphs[char] = self._rasterize(char)
+        return glyph
+
+    def layout(self, text: str) -> TextLayout:
+        """The (cached) layout of a string; newlines start new lines."""
+        layout = self._layouts.get(text)
+        if layout is not None:
+            self._layouts.move_to_end(text)
+            return layout
+
+        rows: List[Tuple] = []
+        pages: List[int] = []
+        width = 0.0
+        for line_index, line in enumerate(text.split("\n")):
+            top = -line_index * self.line_height
+            pen = 0.0
+            for char in line:
+                glyph = self.glyph(char)
+                if glyph.region is not None:
+                    # Unit quad scaled to the glyph box, centered below the line top
+                    rows.append((
+                        glyph.width, 0.0, 0.0, glyph.height,
+                        pen + glyph.width * 0.5, top - glyph.height * 0.5, 0.0, 0.0,
+                        *glyph.region.uv, 1.0, 1.0, 1.0, 1.0,
+                    ))
+                    pages.append(glyph.region.page)
+                pen += glyph.advance
+            width = max(width, pen)
+
+        height = (text.count("\n") + 1) * self.line_height
+        layout = TextLayout(
+            text,
+            np.array(rows, dtype=np.float32).reshape(-1, SPRITE_FLOATS),
+            np.array(pages, dtype=np.intp),
+            width, height,
+        )
+        self._layouts[text] = layout
+        self.layouts_built += 1
+        if len(self._layouts) > self.cache_size:
+            self._layouts.popitem(last=False)
+        return layout
+
+    def measure(self, text: str) -> Tuple[float, float]:
+        """(width, height) of a string in font pixels."""
+        layout = self.layout(text)
+        return layout.width, layout.height
+
+    def _rasterize(self, char: str) -> Glyph:
+        """Render one character and pack it (white, coverage in alpha) into the atlas."""
+        import pygame
+
+        # White on black: the red channel is the glyph's coverage
+        surface = self.font.render(char, self.antialias, (255, 255, 255), (0, 0, 0))
+        width, height = surface.get_size()
+        metrics = self.font.metrics(char)[0]
+        advance = metrics[4] if metrics is not None else width
+        if width == 0 or height == 0 or char.isspace():
+            return Glyph(None, advance, width, height)
+
+        coverage = np.frombuffer(pygame.image.tobytes(surface, "RGB", True), dtype=np.uint8).reshape(height, width, 3)
+        pixels = np.full((height, width, 4), 255, dtype=np.uint8)
+        pixels[..., 3] = coverage[..., 0]
+        region = self.atlas.add(f"{id(self)}:{char}", pixels)
+        return Glyph(region, advance, width, height)
+
+    def __repr__(self) -> str:
+        return f"Font({self.path!r}, size={self.size}, glyphs={len(self.glyphs)}, layouts={len(self._layouts)})"
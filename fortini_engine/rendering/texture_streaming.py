@@ -0,0 +1,255 @@
+"""Texture streaming by mip residency.
+
+Mip-chain textures (.ftex, see assets.texture) keep only the mip levels their
+on-screen size needs. The renderer reports the projected size of every visible
+object sampling a streamed texture, and each texture wants the coarsest level
+that still gives about one texel per screen pixel across its largest user.
+Wanted levels are fitted to the streaming memory budget by dropping the
+finest level of the largest textures first; the small tail of levels at or
+below `tail_size` is always resident.
+
+Changing residency rebuilds a texture's GL storage at the new size: the
+levels from the target down are read from disk on the texture manager's
+workers, uploaded into a staging texture within the manager's per-frame upload
+budget, and swapped in once complete. The old levels stay visible meanwhile,
+and dropped levels really release their memory.
+"""
+
+import heapq
+import math
+from typing import Dict, Optional
+from fortini_engine.assets.texture import MipChainFile, mip_chain_bytes
+
+# requested_frame of textures no object has reported yet
+NEVER = -(1 << 30)
+
+
+class MipResidency:
+    """Streaming state of one mip-chain texture."""
+
+    __slots__ = ("texture", "file", "tail_level", "wanted_level", "target_level",
+                 "requested_frame", "reading", "staging", "staging_level")
+
+    def __init__(self, texture):
+        self.texture = texture
+        self.file: Optional[MipChainFile] = None  # set once the header is read
+        self.tail_level = 0      # coarsest level that must always be resident
+        self.wanted_level = 0    # finest level requested by this frame's objects
+        self.target_level = 0    # wanted level after fitting the budget
+        self.requested_frame = NEVER
+        self.reading = False     # a level read is running on a worker
+        self.staging = None      # texture being uploaded to replace the current storage
+        self.staging_level = 0
+
+    @property
+    def resident_level(self) -> Optional[int]:
+        """Finest mip level currently sampled, None before the first swap."""
+        return self.texture.base_level if self.texture.resident else None
+
+    def level_for(self, pixels: float) -> int:
+        """Coarsest level with at least one texel per pixel across `pixels`."""
+        size = max(self.file.width, self.file.height)
+        level = math.floor(math.log2(size / max(pixels, 1.0)))
+        return min(max(level, 0), self.tail_level)
+
+    def level_bytes(self, level: int) -> int:
+        """Size of a single level."""
+        width, height = self.file.level_size(level)
+        return width * height * 4
+
+    def chain_bytes(self, level: int) -> int:
+        """Size of the storage holding `level` and every coarser level."""
+        width, height = self.file.level_size(level)
+        return mip_chain_bytes(width, height, self.file.levels - level)
+
+    def __repr__(self) -> str:
+        return (f"MipResidency('{self.texture.name}', resident={self.resident_level}, "
+                f"target={self.target_level}, wanted={self.wanted_level})")
+
+
+class TextureStreamer:
+    """Keeps the resident mips of streamed textures matched to their on-screen size."""
+
+    def __init__(self, manager, budget_bytes: int = 128 << 20, tail_size: int = 64,
+                 texel_ratio: float = 1.0, linger_frames: int = 30, max_transitions: int = 4):
+        self.manager = manager
+        self.budget_bytes = budget_bytes
+        self.tail_size = tail_size
+        self.texel_ratio = texel_ratio          # texels wanted per screen pixel
+        self.linger_frames = linger_frames      # unseen textures fall back to their tail after this
+        self.max_transitions = max_transitions  # residency changes in flight at once
+
+        self.residency: Dict[str, MipResidency] = {}
+        self._reads: Dict[object, tuple] = {}  # future -> (residency, first level)
+
+        self.wanted_bytes = 0  # memory the wanted levels would need
+        self.target_bytes = 0  # memory after fitting the budget
+        self.levels_loaded = 0   # this frame
+        self.levels_dropped = 0  # this frame
+        self.bytes_read = 0      # this frame
+
+    def add(self, texture) -> None:
+        """Start streaming a mip-chain texture: read its header and tail levels."""
+        self.forget(texture)
+        entry = MipResidency(texture)
+        self.residency[texture.name] = entry
+        self._read(entry, None)
+
+    def forget(self, texture) -> None:
+        """Stop streaming a texture (evicted or released); in-flight reads are ignored."""
+        entry = self.residency.pop(texture.name, None)
+        if entry is not None and entry.staging is not None:
+            self.manager.discard(entry.staging)
+            entry.staging = None
+
+    def request(self, texture, pixels: float) -> None:
+        """Report an object `pixels` tall on screen that samples `texture`."""
+        entry = self.residency.get(texture.name)
+        if entry is None or entry.file is None:
+            return
+        level = entry.level_for(pixels * self.texel_ratio)
+        if entry.requested_frame != self.manager.frame:
+            entry.requested_frame = self.manager.frame
+            entry.wanted_level = level
+        else:
+            entry.wanted_level = min(entry.wanted_level, level)
+
+    def update(self) -> None:
+        """Per-frame work: finish reads and swaps, refit the budget, start new transitions."""
+        self.levels_loaded = 0
+        self.levels_dropped = 0
+        self.bytes_read = 0
+        self._collect_reads()
+        self._finish_transitions()
+        self._fit_budget()
+        self._start_transitions()
+
+    def stats(self) -> Dict[str, int]:
+        """Residency totals for tuning the budgets."""
+        entries = list(self.residency.values())
+        return {
+            "streamed": len(entries),
+            "resident_bytes": sum(entry.texture.size_bytes for entry in entries),
+            "budget_bytes": self.budget_bytes,
+            "wanted_bytes": self.wanted_bytes,
+            "target_bytes": self.target_bytes,
+            "transitions": len(self._reads) + sum(entry.staging is not None for entry in entries),
+            "levels_loaded": self.levels_loaded,
+            "levels_dropped": self.levels_dropped,
+            "bytes_read": self.bytes_read,
+        }
+
+    def report(self) -> Dict[str, tuple]:
+        """Per texture: (resident level, target level, wanted level)."""
+        return {
+            name: (entry.resident_level, entry.target_level, entry.wanted_level)
+            for name, entry in self.residency.items()
+        }
+
+    def _read(self, entry: MipResidency, first: Optional[int]) -> None:
+        """Read levels `first`.. on a worker (None: header and tail levels)."""
+        entry.reading = True
+        path = entry.texture.path
+        future = self.manager.executor.submit(_read_levels, path, entry.file, first, self.tail_size)
+        self._reads[future] = (entry, first)
+
+    def _collect_reads(self) -> None:
+        """Turn finished reads into staging uploads."""
+        for future in [f for f in self._reads if f.done()]:
+            entry, _first = self._reads.pop(future)
+            entry.reading = False
+            if self.residency.get(entry.texture.name) is not entry:
+                continue  # forgotten while reading
+            try:
+                file, first, levels = future.result()
+            except Exception as e:
+                self.residency.pop(entry.texture.name, None)
+                self.manager.mark_failed(entry.texture, e)
+                continue
+            if entry.file is None:
+                entry.file = file
+                entry.tail_level = entry.wanted_level = entry.target_level = first
+            texture = entry.texture
+            texture.width, texture.height, texture.levels = file.width, file.height, file.levels
+            self.bytes_read += sum(level.nbytes for level in levels)
+            entry.staging = self.manager.stage(f"{texture.name}@{first}", levels, texture.wrap)
+            entry.staging_level = first
+
+    def _finish_transitions(self) -> None:
+        """Swap fully uploaded staging textures in."""
+        for entry in self.residency.values():
+            staging = entry.staging
+            if staging is None or staging.resident_level != 0:
+                continue
+            current = entry.resident_level
+            level = entry.staging_level
+            if current is None:
+                self.levels_loaded += entry.file.levels - level
+            elif level < current:
+                self.levels_loaded += current - level
+            else:
+                self.levels_dropped += level - current
+            self.manager.adopt(entry.texture, staging, level)
+            entry.staging = None
+
+    def _fit_budget(self) -> None:
+        """Pick each texture's target level: its wanted level, coarsened to fit the budget."""
+        entries = [entry for entry in self.residency.values() if entry.file is not None]
+        frame = self.manager.frame
+        total = 0
+        for entry in entries:
+            seen = frame - entry.requested_frame <= self.linger_frames
+            entry.target_level = entry.wanted_level if seen else entry.tail_level
+            total += entry.chain_bytes(entry.target_level)
+        self.wanted_bytes = total
+
+        # Drop the largest finest level first until everything fits
+        heap = [(-entry.level_bytes(entry.target_level), i) for i, entry in enumerate(entries)
+                if entry.target_level < entry.tail_level]
+        heapq.heapify(heap)
+        while total > self.budget_bytes and heap:
+            negative_bytes, i = heapq.heappop(heap)
+            entry = entries[i]
+            total += negative_bytes
+            entry.target_level += 1
+            if entry.target_level < entry.tail_level:
+                heapq.heappush(heap, (-entry.level_bytes(entry.target_level), i))
+        self.target_bytes = total
+
+    def _start_transitions(self) -> None:
+        """Start reads for textures whose resident level differs from their target."""
+        in_flight = len(self._reads) + sum(entry.staging is not None for entry in self.residency.values())
+        changes = [
+            entry for entry in self.residency.values()
+            if entry.file is not None and not entry.reading and entry.staging is None
+            and entry.resident_level is not None and entry.resident_level != entry.target_level
+        ]
+        # Drops first (they free memory), then the largest upgrades
+        changes.sort(key=lambda entry: (entry.target_level < entry.resident_level,
+                                        -abs(entry.target_level - entry.resident_level)))
+        for entry in changes:
+            if in_flight >= self.max_transitions:
+                break
+            self._read(entry, entry.target_level)
+            in_flight += 1
+
+    def release(self) -> None:
+        """Drop all streaming state and staging textures."""
+        for entry in list(self.residency.values()):
+            self.forget(entry.texture)
+        self._reads.clear()
+
+    def __repr__(self) -> str:
+        return f"TextureStreamer(textures={len(self.residency)}, budget_bytes={self.budget_bytes})"
+
+
+def _read_levels(path: str, file: Optional[MipChainFile], first: Optional[int], tail_size: int) -> tuple:
+    """Worker task: read levels `first`.. of a mip-chain file (None: from the tail)."""
+    if file is None:
+        file = MipChainFile(path)
+    if first is None:
+        first = next(
+            (level for level in range(file.levels) if max(file.level_size(level)) <= tail_size),
+            file.levels - 1,
+        )
+    return file, first, file.read_levels(first)
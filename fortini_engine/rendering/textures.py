@@ -0,0 +1,376 @@
+"""GPU textures: background decoding, PBO-streamed uploads and an LRU memory budget.
+
+Image files are decoded and mipmapped on a worker pool (see assets.texture), so
+the render thread only ever copies finished pixels. Each frame `update()`
+collects finished decodes and streams mip levels into GL through a ring of
+pixel unpack buffers, coarsest level first and within a byte budget, so a big
+load spreads over several frames and a texture becomes usable (blurry) as
+soon as its smallest levels arrive. Textures not bound recently are evicted,
+least recently used first, whenever resident memory exceeds the budget;
+evicted textures are reloaded the next time they are bound. Mip-chain files
+(.ftex) are streamed by mip residency instead (see texture_streaming).
+"""
+
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+from OpenGL.GL import *
+import numpy as np
+from fortini_engine.assets.manager import AssetManager
+from fortini_engine.assets.texture import MIP_CHAIN_SUFFIX, decode_image, generate_mipmaps, mip_chain_bytes
+from fortini_engine.rendering.texture_streaming import TextureStreamer
+from fortini_engine.rendering.uniform_buffers import SAMPLER_UNITS
+from fortini_engine.utils.logger import Logger
+
+MATERIAL_TEXTURE_UNIT = SAMPLER_UNITS["materialTexture"]
+
+# Texture states
+TEXTURE_LOADING = "loading"      # decoding on a worker
+TEXTURE_UPLOADING = "uploading"  # levels waiting for upload budget
+TEXTURE_RESIDENT = "resident"
+TEXTURE_EVICTED = "evicted"
+TEXTURE_FAILED = "failed"
+
+
+class Texture:
+    """A 2D RGBA8 texture and its upload progress."""
+
+    def __init__(self, name: str, path: Optional[str] = None, mipmaps: bool = True, wrap=GL_REPEAT):
+        self.name = name
+        self.path = path
+        self.mipmaps = mipmaps
+        self.wrap = wrap
+        self.state = TEXTURE_LOADING
+        self.width = 0
+        self.height = 0
+        self.levels = 0
+        self.gl_id = None
+        self.source: Optional[List[np.ndarray]] = None  # in-memory levels, kept for re-upload
+        self.pending: List[tuple] = []  # (level, pixels) still to upload, finest first
+        self.resident_level: Optional[int] = None  # finest uploaded level
+        self.base_level = 0  # source mip stored in GL level 0 (streamed textures drop fine levels)
+        self.size_bytes = 0  # GPU memory allocated for the mip chain
+        self.last_used = -1  # frame of the last bind
+
+    @property
+    def resident(self) -> bool:
+        """Whether at least one mip level can be sampled."""
+        return self.resident_level is not None
+
+    def __repr__(self) -> str:
+        return f"Texture(name='{self.name}', size=({self.width}, {self.height}), levels={self.levels}, state={self.state})"
+
+
+class TextureManager:
+    """Loads, uploads, binds and evicts textures for a renderer."""
+
+    def __init__(self, state, budget_bytes: int = 256 << 20, upload_budget_bytes: int = 4 << 20,
+                 workers: int = 2, pixel_buffers: int = 3):
+        self.state = state
+        self.logger = Logger().get_logger(self.__class__.__name__)
+        self.budget_bytes = budget_bytes
+        self.upload_budget_bytes = upload_budget_bytes  # per frame
+
+        # Least recently bound first
+        self.textures: "OrderedDict[str, Texture]" = OrderedDict()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="TextureDecode")
+        self._decoding: Dict[object, Texture] = {}  # future -> texture
+        self._uploads: deque = deque()
+
+        self._pixel_buffer_count = pixel_buffers
+        self._pixel_buffers = None
+        self._next_pixel_buffer = 0
+        self._fallback = None
+
+        # Mip-chain files keep only the mips their on-screen size needs
+        self.streaming = TextureStreamer(self)
+
+        self.frame = 0
+        self.resident_bytes = 0
+        self.uploaded_bytes = 0  # this frame
+        self.evictions = 0       # total
+
+    def load(self, path, name: Optional[str] = None, mipmaps: bool = True) -> Texture:
+        """Start decoding an image file; returns its texture immediately."""
+        name = name or str(path)
+        texture = self.textures.get(name)
+        if texture is None:
+            texture = Texture(name, str(path), mipmaps)
+            self.textures[name] = texture
+            AssetManager().register_texture(name, texture)
+            self._request(texture)
+        return texture
+
+    def create(self, name: str, image: np.ndarray, mipmaps: bool = True, wrap=GL_REPEAT) -> Texture:
+        """Create (or replace the pixels of) a texture from an RGBA array, bottom row first."""
+        levels = generate_mipmaps(image) if mipmaps else [np.ascontiguousarray(image, dtype=np.uint8)]
+        texture = self.textures.get(name)
+        if texture is None:
+            texture = Texture(name, None, mipmaps, wrap)
+            self.textures[name] = texture
+            AssetManager().register_texture(name, texture)
+        texture.source = levels
+        self.queue_levels(texture, levels)
+        return texture
+
+    def sync_atlas(self, atlas, prefix: str = "atlas") -> None:
+        """Upload changed atlas pages, one unmipmapped texture per page."""
+        for index, page in enumerate(atlas.pages):
+            if page.dirty or page.texture is None:
+                page.texture = self.create(f"{prefix}:{id(atlas)}:{index}", page.pixels, mipmaps=False, wrap=GL_CLAMP_TO_EDGE)
+                page.dirty = False
+
+    def get(self, name: str) -> Optional[Texture]:
+        """Get a texture by name."""
+        return self.textures.get(name)
+
+    def resolve(self, key):
+        """Turn a material texture (Texture, name, file path or GL id) into a Texture or GL id.
+
+        Names are looked up here and then in the AssetManager; unknown strings
+        are loaded as file paths.
+        """
+        if key is None or isinstance(key, Texture):
+            return key
+        if isinstance(key, (str, Path)):
+            texture = self.textures.get(str(key))
+            if texture is None:
+                texture = AssetManager().get_texture(str(key))
+            return texture if texture is not None else self.load(key)
+        return int(key)
+
+    def bind(self, key, unit: int = MATERIAL_TEXTURE_UNIT) -> bool:
+        """Bind a texture to a unit; non-resident textures bind a white fallback. Returns True if the real texture was bound."""
+        target = self.resolve(key)
+        if target is None:
+            return False
+        if not isinstance(target, Texture):
+            self.state.bind_texture(unit, target)
+            return True
+
+        self.textures.move_to_end(target.name)
+        target.last_used = self.frame
+        if target.state == TEXTURE_EVICTED:
+            self._request(target)
+        if target.resident:
+            self.state.bind_texture(unit, target.gl_id)
+            return True
+        self.state.bind_texture(unit, self._fallback_texture())
+        return False
+
+    def bind_fallback(self, unit: int = MATERIAL_TEXTURE_UNIT) -> None:
+        """Bind the white fallback texture, for untextured draws in textured programs."""
+        self.state.bind_texture(unit, self._fallback_texture())
+
+    def update(self) -> None:
+        """Per-frame work: collect decodes, stream uploads, enforce the budget."""
+        self.frame += 1
+        self.uploaded_bytes = 0
+        for future in [f for f in self._decoding if f.done()]:
+            texture = self._decoding.pop(future)
+            try:
+                levels = future.result()
+            except Exception as e:
+                self.mark_failed(texture, e)
+                continue
+            self.queue_levels(texture, levels)
+
+        self.streaming.update()
+        self._stream_uploads()
+        self._enforce_budget()
+
+    def report_screen_size(self, key, pixels: float) -> None:
+        """Report the on-screen size (pixels) of an object sampling a texture, for mip streaming."""
+        target = self.resolve(key)
+        if isinstance(target, Texture) and target.path and target.path.endswith(MIP_CHAIN_SUFFIX):
+            self.streaming.request(target, pixels)
+
+    def evict(self, texture: Texture) -> None:
+        """Free a texture's GPU memory; it is reloaded on its next bind."""
+        self._free(texture)
+        texture.state = TEXTURE_EVICTED
+        self.streaming.forget(texture)
+        self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Texture counts and memory use."""
+        states = [texture.state for texture in self.textures.values()]
+        return {
+            "textures": len(states),
+            "resident": states.count(TEXTURE_RESIDENT),
+            "loading": states.count(TEXTURE_LOADING) + states.count(TEXTURE_UPLOADING),
+            "resident_bytes": self.resident_bytes,
+            "uploaded_bytes": self.uploaded_bytes,
+            "evictions": self.evictions,
+        }
+
+    def _request(self, texture: Texture) -> None:
+        """(Re)load a texture's pixels: from memory if kept, otherwise on a worker."""
+        if texture.source is not None:
+            self.queue_levels(texture, texture.source)
+            return
+        texture.state = TEXTURE_LOADING
+        if texture.path.endswith(MIP_CHAIN_SUFFIX):
+            self.streaming.add(texture)
+            return
+        future = self.executor.submit(_decode, texture.path, texture.mipmaps)
+        self._decoding[future] = texture
+
+    def queue_levels(self, texture: Texture, levels: List[np.ndarray]) -> None:
+        """Schedule a full mip chain for upload."""
+        height, width = levels[0].shape[:2]
+        if texture.gl_id is not None and (width, height, len(levels)) != (texture.width, texture.height, texture.levels):
+            self._free(texture)
+        texture.width, texture.height, texture.levels = width, height, len(levels)
+        texture.pending = list(enumerate(levels))
+        texture.state = TEXTURE_UPLOADING
+        if texture not in self._uploads:
+            self._uploads.append(texture)
+
+    def mark_failed(self, texture: Texture, error: Exception) -> None:
+        """Log a load error; the texture keeps binding the fallback."""
+        self.logger.error(f"Failed to load texture '{texture.name}': {error}")
+        texture.state = TEXTURE_FAILED
+
+    def stage(self, name: str, levels: List[np.ndarray], wrap=GL_REPEAT) -> Texture:
+        """Queue levels for upload into a new, unregistered texture; see adopt()."""
+        staging = Texture(name, None, len(levels) > 1, wrap)
+        self.queue_levels(staging, levels)
+        return staging
+
+    def adopt(self, texture: Texture, staging: Texture, base_level: int) -> None:
+        """Move a fully uploaded staging texture's GL object into `texture`, replacing its storage."""
+        self._free(texture)
+        texture.gl_id, texture.size_bytes = staging.gl_id, staging.size_bytes
+        texture.resident_level = 0
+        texture.base_level = base_level
+        texture.state = TEXTURE_RESIDENT
+        staging.gl_id, staging.size_bytes, staging.resident_level = None, 0, None
+
+    def discard(self, texture: Texture) -> None:
+        """Delete a texture's GL object without marking it evicted (e.g. abandoned staging)."""
+        self._free(texture)
+
+    def _free(self, texture: Texture) -> None:
+        """Delete a texture's GL object and drop its pending uploads."""
+        if texture.gl_id is not None:
+            glDeleteTextures(1, [texture.gl_id])
+            self.state.forget_texture(texture.gl_id)
+            self.resident_bytes -= texture.size_bytes
+        if texture in self._uploads:
+            self._uploads.remove(texture)
+        texture.gl_id = None
+        texture.size_bytes = 0
+        texture.resident_level = None
+        texture.pending = []
+
+    def _stream_uploads(self) -> None:
+        """Upload pending mip levels, coarsest first, until the frame's budget is spent."""
+        while self._uploads:
+            texture = self._uploads[0]
+            level, pixels = texture.pending[-1]
+            # At least one level per frame, so oversized levels still get through
+            if self.uploaded_bytes and self.uploaded_bytes + pixels.nbytes > self.upload_budget_bytes:
+                break
+            if texture.gl_id is None:
+                self._allocate(texture)
+            texture.pending.pop()
+            self._upload_level(texture, level, pixels)
+            if not texture.pending:
+                self._uploads.popleft()
+                texture.state = TEXTURE_RESIDENT
+
+    def _allocate(self, texture: Texture) -> None:
+        """Create the GL texture with storage for the full mip chain."""
+        texture.gl_id = glGenTextures(1)
+        self.state.bind_texture(MATERIAL_TEXTURE_UNIT, texture.gl_id)
+        for level in range(texture.levels):
+            glTexImage2D(
+                GL_TEXTURE_2D, level, GL_RGBA8,
+                max(1, texture.width >> level), max(1, texture.height >> level),
+                0, GL_RGBA, GL_UNSIGNED_BYTE, None,
+            )
+        min_filter = GL_LINEAR_MIPMAP_LINEAR if texture.levels > 1 else GL_LINEAR
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, min_filter)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, texture.wrap)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, texture.wrap)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAX_LEVEL, texture.levels - 1)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_BASE_LEVEL, texture.levels - 1)
+        texture.resident_level = None
+        texture.size_bytes = mip_chain_bytes(texture.width, texture.height, texture.levels)
+        self.resident_bytes += texture.size_bytes
+
+    def _upload_level(self, texture: Texture, level: int, pixels: np.ndarray) -> None:
+        """Copy one mip level through the next pixel buffer and start the GPU transfer."""
+        if self._pixel_buffers is None:
+            self._pixel_buffers = list(np.atleast_1d(glGenBuffers(self._pixel_buffer_count)))
+        buffer = self._pixel_buffers[self._next_pixel_buffer]
+        self._next_pixel_buffer = (self._next_pixel_buffer + 1) % len(self._pixel_buffers)
+
+        height, width = pixels.shape[:2]
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, buffer)
+        # Orphan the previous contents so the copy never waits on an earlier transfer
+        glBufferData(GL_PIXEL_UNPACK_BUFFER, pixels.nbytes, None, GL_STREAM_DRAW)
+        glBufferSubData(GL_PIXEL_UNPACK_BUFFER, 0, pixels.nbytes, pixels)
+        self.state.bind_texture(MATERIAL_TEXTURE_UNIT, texture.gl_id)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        # With an unpack buffer bound, the data argument is an offset into it
+        glTexSubImage2D(GL_TEXTURE_2D, level, 0, 0, width, height, GL_RGBA, GL_UNSIGNED_BYTE, None)
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0)
+
+        # Sampling starts at the finest level uploaded so far
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_BASE_LEVEL, level)
+        texture.resident_level = level
+        self.uploaded_bytes += pixels.nbytes
+
+    def _enforce_budget(self) -> None:
+        """Evict least recently bound textures until resident memory fits the budget."""
+        if self.resident_bytes <= self.budget_bytes:
+            return
+        for texture in list(self.textures.values()):
+            if self.resident_bytes <= self.budget_bytes:
+                break
+            # Textures bound last frame are still in use
+            if texture.gl_id is None or texture.last_used >= self.frame - 1:
+                continue
+            self.evict(texture)
+
+    def _fallback_texture(self):
+        """1x1 white texture bound while a texture is not resident."""
+        if self._fallback is None:
+            self._fallback = glGenTextures(1)
+            self.state.bind_texture(MATERIAL_TEXTURE_UNIT, self._fallback)
+            glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+            white = np.full(4, 255, dtype=np.uint8)
+            glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, 1, 1, 0, GL_RGBA, GL_UNSIGNED_BYTE, white)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        return self._fallback
+
+    def release(self) -> None:
+        """Stop the workers and delete all GL textures and buffers."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self._decoding.clear()
+        self.streaming.release()
+        self._uploads.clear()
+        for texture in self.textures.values():
+            self._free(texture)
+            texture.state = TEXTURE_EVICTED
+        if self._fallback is not None:
+            glDeleteTextures(1, [self._fallback])
+            self.state.forget_texture(self._fallback)
+            self._fallback = None
+        if self._pixel_buffers is not None:
+            glDeleteBuffers(len(self._pixel_buffers), self._pixel_buffers)
+            self._pixel_buffers = None
+
+    def __repr__(self) -> str:
+        return f"TextureManager(textures={len(self.textures)}, resident_bytes={self.resident_bytes})"
+
+
+def _decode(path: str, mipmaps: bool) -> List[np.ndarray]:
+    """Worker task: decode an image file and build its mip chain."""
+    image = decode_image(path)
+    return generate_mipmaps(image) if mipmaps else [image]
@@ -0,0 +1,162 @@
+"""std140 uniform buffer objects shared by all shader programs.
+
+Four blocks are bound at fixed binding points, so programs declaring them
+pick the data up without per-program uploads:
+
+- FrameData (binding 0): view, projection, viewPos; uploaded once per frame.
+- LightData (binding 1): light count and arrays of positions/colors.
+- ObjectData (binding 2): model matrix, color and material parameters; one
+  aligned slot per draw in a ring buffer, selected with glBindBufferRange.
+- ClusterData (binding 3): froxel grid parameters for clustered lighting.
+
+Samplers used by shared shader code get fixed texture units (SAMPLER_UNITS).
+
+The GLSL declarations live in shader_sources.
+"""
+
+from typing import Dict
+from OpenGL.GL import *
+import numpy as np
+from fortini_engine.rendering.lighting import MAX_LIGHTS
+
+FRAME_BLOCK_BINDING = 0
+LIGHT_BLOCK_BINDING = 1
+OBJECT_BLOCK_BINDING = 2
+CLUSTER_BLOCK_BINDING = 3
+
+BLOCK_BINDINGS: Dict[str, int] = {
+    "FrameData": FRAME_BLOCK_BINDING,
+    "LightData": LIGHT_BLOCK_BINDING,
+    "ObjectData": OBJECT_BLOCK_BINDING,
+    "ClusterData": CLUSTER_BLOCK_BINDING,
+}
+
+# Texture units for samplers declared in the shared shader code; the material
+# texture takes unit 0 and the clustered lighting tables the high units
+SAMPLER_UNITS: Dict[str, int] = {
+    "materialTexture": 0,
+    "clusterLights": 13,
+    "clusterGrid": 14,
+    "clusterLightIndices": 15,
+}
+
+# std140 sizes in floats
+FRAME_FLOATS = 16 + 16 + 4  # mat4 view, mat4 projection, vec4 viewPos
+LIGHT_FLOATS = 4 + 4 * MAX_LIGHTS + 4 * MAX_LIGHTS  # ivec4 count, vec4 positions[], vec4 colors[]
+OBJECT_FLOATS = 16 + 4 + 4  # mat4 model, vec4 objectColor, vec4 materialParams
+CLUSTER_FLOATS = 4 + 4 + 4  # uvec4 clusterDims, vec4 clusterDepth, vec4 clusterTile
+
+
+class UniformBuffer:
+    """A uniform block backed by a float32 array, re-uploaded only when it changes."""
+
+    def __init__(self, binding: int, floats: int):
+        self.binding = binding
+        self.data = np.zeros(floats, dtype=np.float32)
+        self._uploaded = None
+        self.uploads = 0
+        self.buffer = glGenBuffers(1)
+        glBindBuffer(GL_UNIFORM_BUFFER, self.buffer)
+        glBufferData(GL_UNIFORM_BUFFER, self.data.nbytes, None, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+        glBindBufferBase(GL_UNIFORM_BUFFER, binding, self.buffer)
+
+    def upload(self) -> bool:
+        """Send `data` to the GPU if it differs from the last upload."""
+        if self._uploaded is not None and np.array_equal(self._uploaded, self.data):
+            return False
+        glBindBuffer(GL_UNIFORM_BUFFER, self.buffer)
+        glBufferSubData(GL_UNIFORM_BUFFER, 0, self.data.nbytes, self.data)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+        # Other code may have rebound the binding point
+        glBindBufferBase(GL_UNIFORM_BUFFER, self.binding, self.buffer)
+        self._uploaded = self.data.copy()
+        self.uploads += 1
+        return True
+
+    def release(self) -> None:
+        """Delete the buffer."""
+        if self.buffer is not None:
+            glDeleteBuffers(1, [self.buffer])
+            self.buffer = None
+
+
+class FrameUniforms(UniformBuffer):
+    """Per-frame camera block (FrameData)."""
+
+    def __init__(self):
+        super().__init__(FRAME_BLOCK_BINDING, FRAME_FLOATS)
+
+    def set(self, view: np.ndarray, projection: np.ndarray, view_pos) -> None:
+        """Write camera matrices (row-major) and position."""
+        # std140 matrices are column-major
+        self.data[0:16] = view.T.ravel()
+        self.data[16:32] = projection.T.ravel()
+        self.data[32:35] = view_pos
+        self.data[35] = 1.0
+
+
+class LightUniforms(UniformBuffer):
+    """Scene light list block (LightData)."""
+
+    def __init__(self):
+        super().__init__(LIGHT_BLOCK_BINDING, LIGHT_FLOATS)
+
+    def set(self, positions: np.ndarray, colors: np.ndarray) -> None:
+        """Write (N, 4) light positions (w = range) and colors."""
+        count = min(len(positions), MAX_LIGHTS)
+        self.data[:] = 0.0
+        # The count is an int in GLSL; store its bit pattern
+        self.data[0:1].view(np.int32)[0] = count
+        start = 4
+        self.data[start:start + 4 * count] = positions[:count].ravel()
+        start += 4 * MAX_LIGHTS
+        self.data[start:start + 4 * count] = colors[:count].ravel()
+
+
+class ObjectUniformRing:
+    """Ring of ObjectData slots; each frame writes its draws into the next region."""
+
+    def __init__(self, regions: int = 3, capacity: int = 256):
+        alignment = int(glGetIntegerv(GL_UNIFORM_BUFFER_OFFSET_ALIGNMENT))
+        slot_bytes = OBJECT_FLOATS * 4
+        self.stride = (slot_bytes + alignment - 1) // alignment * alignment
+        self.regions = regions
+        self.capacity = capacity  # slots per region
+        self.region = 0
+        self.buffer = glGenBuffers(1)
+        self._allocate()
+
+    def _allocate(self) -> None:
+        """(Re)create storage for all regions."""
+        glBindBuffer(GL_UNIFORM_BUFFER, self.buffer)
+        glBufferData(GL_UNIFORM_BUFFER, self.regions * self.capacity * self.stride, None, GL_STREAM_DRAW)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+
+    def write(self, rows: np.ndarray) -> None:
+        """Upload (N, OBJECT_FLOATS) slot rows into the next region in one call."""
+        count = len(rows)
+        if count > self.capacity:
+            self.capacity = max(count, 2 * self.capacity)
+            self._allocate()
+        self.region = (self.region + 1) % self.regions
+        if not count:
+            return
+
+        floats_per_slot = self.stride // 4
+        data = np.zeros((count, floats_per_slot), dtype=np.float32)
+        data[:, :OBJECT_FLOATS] = rows
+        glBindBuffer(GL_UNIFORM_BUFFER, self.buffer)
+        glBufferSubData(GL_UNIFORM_BUFFER, self.region * self.capacity * self.stride, data.nbytes, data)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+
+    def bind(self, slot: int) -> None:
+        """Bind slot `slot` of the current region to the ObjectData binding point."""
+        offset = (self.region * self.capacity + slot) * self.stride
+        glBindBufferRange(GL_UNIFORM_BUFFER, OBJECT_BLOCK_BINDING, self.buffer, offset, OBJECT_FLOATS * 4)
+
+    def release(self) -> None:
+        """Delete the buffer."""
+        if self.buffer is not None:
+            glDeleteBuffers(1, [self.buffer])
+            self.buffer = None
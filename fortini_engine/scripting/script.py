@@ -31,11 +31,11 @@ class ScriptingAPI:
 
     def get_position(self) -> tuple:
         """Get position."""
-        return self.game_object.transform.position.to_tuple()
+        return tuple(self.game_object.transform.position_array.tolist())
 
     def get_scale(self) -> tuple:
         """Get scale."""
-        return self.game_object.transform.scale.to_tuple()
+        return tuple(self.game_object.transform.scale_array.tolist())
 
     def set_active(self, active: bool) -> None:
         """Set object active state."""
@@ -1,6 +1,19 @@
 """Utility modules for the Fortini Engine."""
 
 from fortini_engine.utils.logger import Logger
-from fortini_engine.utils.math_utils import Vector3, Matrix4, Quaternion
+from fortini_engine.utils.color import to_rgba
+from fortini_engine.utils.math_utils import (
+    Vector3,
+    Matrix4,
+    MatrixPool,
+    Quaternion,
+    Vector3Array,
+    QuaternionArray,
+    compose_trs,
+    normal_matrices,
+)
 
-__all__ = ["Logger", "Vector3", "Matrix4", "Quaternion"]
+__all__ = [
+    "Logger", "Vector3", "Matrix4", "MatrixPool", "Quaternion", "Vector3Array", "QuaternionArray",
+    "compose_trs", "normal_matrices", "to_rgba",
+]
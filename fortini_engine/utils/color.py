@@ -0,0 +1,8 @@
+"""Color helpers."""
+
+from typing import Sequence, Tuple
+
+
+def to_rgba(color: Sequence[float]) -> Tuple[float, ...]:
+    """Pad an RGB or RGBA color to four components (alpha defaults to 1)."""
+    return tuple(color[:4]) if len(color) >= 4 else (*color[:3], 1.0)
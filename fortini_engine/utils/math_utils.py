@@ -1,12 +1,18 @@
 """Math utilities for 3D graphics."""
 
+import math
 import numpy as np
 from typing import Union, Tuple
 
 
+_IDENTITY = np.identity(4, dtype=np.float32)
+
+
 class Vector3:
     """3D Vector representation."""
 
+    __slots__ = ("x", "y", "z")
+
     def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0):
         self.x = x
         self.y = y
@@ -23,7 +29,7 @@ class Vector3:
         return NotImplemented
 
     def __mul__(self, scalar: float):
-        if isinstance(scalar, (int, float)):
+        if isinstance(scalar, (int, float, np.floating)):
             return Vector3(self.x * scalar, self.y * scalar, self.z * scalar)
         return NotImplemented
 
@@ -32,7 +38,7 @@ class Vector3:
 
     def magnitude(self) -> float:
         """Calculate vector magnitude."""
-        return np.sqrt(self.x**2 + self.y**2 + self.z**2)
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
 
     def normalize(self):
         """Normalize the vector (returns new Vector3)."""
@@ -72,6 +78,8 @@ class Vector3:
 class Quaternion:
     """Quaternion for 3D rotations."""
 
+    __slots__ = ("x", "y", "z", "w")
+
     def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0, w: float = 1.0):
         self.x = x
         self.y = y
@@ -85,12 +93,12 @@ class Quaternion:
     @staticmethod
     def from_euler_angles(pitch: float, yaw: float, roll: float):
         """Create quaternion from Euler angles (in radians)."""
-        cy = np.cos(yaw * 0.5)
-        sy = np.sin(yaw * 0.5)
-        cp = np.cos(pitch * 0.5)
-        sp = np.sin(pitch * 0.5)
-        cr = np.cos(roll * 0.5)
-        sr = np.sin(roll * 0.5)
+        cy = math.cos(yaw * 0.5)
+        sy = math.sin(yaw * 0.5)
+        cp = math.cos(pitch * 0.5)
+        sp = math.sin(pitch * 0.5)
+        cr = math.cos(roll * 0.5)
+        sr = math.sin(roll * 0.5)
 
         w = cr * cp * cy + sr * sp * sy
         x = sr * cp * cy - cr * sp * sy
@@ -99,107 +107,346 @@ class Quaternion:
 
         return Quaternion(x, y, z, w)
 
+    def to_tuple(self) -> Tuple[float, float, float, float]:
+        """Convert to tuple (x, y, z, w)."""
+        return (self.x, self.y, self.z, self.w)
+
     def __repr__(self) -> str:
         return f"Quaternion({self.x:.2f}, {self.y:.2f}, {self.z:.2f}, {self.w:.2f})"
 
 
+class Vector3Array:
+    """Structure-of-arrays storage for N 3D vectors.
+
+    Wraps an (N, 3) float32 array (possibly a view into another buffer, such as
+    a `TransformStore`) and applies every operation to all elements at once.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data=None, count: int = 0):
+        if data is None:
+            data = np.zeros((count, 3), dtype=np.float32)
+        self.data = np.asarray(data, dtype=np.float32).reshape(-1, 3)
+
+    @staticmethod
+    def from_vectors(vectors) -> "Vector3Array":
+        """Pack a sequence of Vector3 (or 3-tuples) into an array."""
+        return Vector3Array(
+            [v.to_tuple() if isinstance(v, Vector3) else tuple(v) for v in vectors]
+        )
+
+    def to_vectors(self):
+        """Unpack into a list of Vector3."""
+        return [Vector3(*row) for row in self.data.tolist()]
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Vector3(*self.data[index].tolist())
+        return Vector3Array(self.data[index])
+
+    def __setitem__(self, index, value) -> None:
+        self.data[index] = _as_components(value)
+
+    def __add__(self, other):
+        return Vector3Array(self.data + _as_components(other))
+
+    def __iadd__(self, other):
+        self.data += _as_components(other)
+        return self
+
+    def __sub__(self, other):
+        return Vector3Array(self.data - _as_components(other))
+
+    def __isub__(self, other):
+        self.data -= _as_components(other)
+        return self
+
+    def __mul__(self, scalar):
+        return Vector3Array(self.data * _as_scalars(scalar))
+
+    def __rmul__(self, scalar):
+        return self.__mul__(scalar)
+
+    def __imul__(self, scalar):
+        self.data *= _as_scalars(scalar)
+        return self
+
+    def scale(self, factors) -> "Vector3Array":
+        """Scale by one factor or N per-element factors."""
+        return self * factors
+
+    def dot(self, other) -> np.ndarray:
+        """Element-wise dot products, shape (N,)."""
+        return np.einsum("ij,ij->i", self.data, np.broadcast_to(_as_components(other), self.data.shape))
+
+    def cross(self, other) -> "Vector3Array":
+        """Element-wise cross products."""
+        return Vector3Array(np.cross(self.data, _as_components(other)))
+
+    def magnitude(self) -> np.ndarray:
+        """Element-wise magnitudes, shape (N,)."""
+        return np.sqrt(self.dot(self))
+
+    def normalize(self) -> "Vector3Array":
+        """Normalize every vector; zero vectors stay zero."""
+        mag = self.magnitude()
+        inv = np.divide(1.0, mag, out=np.zeros_like(mag), where=mag > 0)
+        return Vector3Array(self.data * inv[:, None])
+
+    def __repr__(self) -> str:
+        return f"Vector3Array(count={len(self)})"
+
+
+class QuaternionArray:
+    """Structure-of-arrays storage for N quaternions in (x, y, z, w) order."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data=None, count: int = 0):
+        if data is None:
+            data = np.zeros((count, 4), dtype=np.float32)
+            data[:, 3] = 1.0
+        self.data = np.asarray(data, dtype=np.float32).reshape(-1, 4)
+
+    @staticmethod
+    def from_quaternions(quaternions) -> "QuaternionArray":
+        """Pack a sequence of Quaternion into an array."""
+        return QuaternionArray([(q.x, q.y, q.z, q.w) for q in quaternions])
+
+    @staticmethod
+    def from_euler_angles(pitch, yaw, roll) -> "QuaternionArray":
+        """Create quaternions from N Euler angle triples (in radians)."""
+        pitch, yaw, roll = (np.asarray(a, dtype=np.float32) * 0.5 for a in (pitch, yaw, roll))
+        cy, sy = np.cos(yaw), np.sin(yaw)
+        cp, sp = np.cos(pitch), np.sin(pitch)
+        cr, sr = np.cos(roll), np.sin(roll)
+
+        data = np.empty(np.broadcast(pitch, yaw, roll).shape + (4,), dtype=np.float32)
+        data[..., 0] = sr * cp * cy - cr * sp * sy
+        data[..., 1] = cr * sp * cy + sr * cp * sy
+        data[..., 2] = cr * cp * sy - sr * sp * cy
+        data[..., 3] = cr * cp * cy + sr * sp * sy
+        return QuaternionArray(data)
+
+    def to_quaternions(self):
+        """Unpack into a list of Quaternion."""
+        return [Quaternion(*row) for row in self.data.tolist()]
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Quaternion(*self.data[index].tolist())
+        return QuaternionArray(self.data[index])
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(value, Quaternion):
+            value = (value.x, value.y, value.z, value.w)
+        elif isinstance(value, QuaternionArray):
+            value = value.data
+        self.data[index] = value
+
+    def dot(self, other: "QuaternionArray") -> np.ndarray:
+        """Element-wise 4D dot products, shape (N,)."""
+        return np.einsum("ij,ij->i", self.data, other.data)
+
+    def normalize(self) -> "QuaternionArray":
+        """Normalize every quaternion; zero quaternions become identity."""
+        mag = np.sqrt(self.dot(self))
+        result = np.empty_like(self.data)
+        valid = mag > 0
+        result[valid] = self.data[valid] / mag[valid, None]
+        result[~valid] = (0.0, 0.0, 0.0, 1.0)
+        return QuaternionArray(result)
+
+    def multiply(self, other: "QuaternionArray") -> "QuaternionArray":
+        """Element-wise Hamilton product (self * other)."""
+        x1, y1, z1, w1 = self.data.T
+        x2, y2, z2, w2 = other.data.T
+        return QuaternionArray(np.stack([
+            w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+            w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+            w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+            w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+        ], axis=1))
+
+    def rotate(self, vectors: Vector3Array) -> Vector3Array:
+        """Rotate N vectors by the matching quaternions."""
+        q = self.data[:, :3]
+        w = self.data[:, 3:4]
+        v = vectors.data
+        t = 2.0 * np.cross(q, v)
+        return Vector3Array(v + w * t + np.cross(q, t))
+
+    def slerp(self, other: "QuaternionArray", t) -> "QuaternionArray":
+        """Spherical interpolation towards `other` by one or N factors."""
+        a = self.data
+        b = other.data
+        d = self.dot(other)
+        # Take the short way around
+        b = np.where(d[:, None] < 0.0, -b, b)
+        d = np.abs(d)
+        t = np.broadcast_to(np.asarray(t, dtype=np.float32), d.shape)
+
+        theta0 = np.arccos(np.clip(d, -1.0, 1.0))
+        sin0 = np.sin(theta0)
+        near = d > 0.9995  # fall back to lerp when nearly parallel
+        safe_sin0 = np.where(near, 1.0, sin0)
+        s1 = np.where(near, t, np.sin(theta0 * t) / safe_sin0)
+        s0 = np.where(near, 1.0 - t, np.cos(theta0 * t) - d * s1)
+        return QuaternionArray(a * s0[:, None] + b * s1[:, None]).normalize()
+
+    def __repr__(self) -> str:
+        return f"QuaternionArray(count={len(self)})"
+
+
+def _as_components(value):
+    """Coerce Vector3 / Vector3Array / sequences to something NumPy broadcasts."""
+    if isinstance(value, Vector3Array):
+        return value.data
+    if isinstance(value, Vector3):
+        return (value.x, value.y, value.z)
+    return np.asarray(value, dtype=np.float32)
+
+
+def _as_scalars(value):
+    """Coerce one scalar or N per-element scalars for broadcasting over (N, 3)."""
+    if isinstance(value, (int, float)):
+        return value
+    value = np.asarray(value, dtype=np.float32)
+    return value[:, None] if value.ndim == 1 else value
+
+
 class Matrix4:
-    """4x4 Matrix for 3D transformations."""
+    """4x4 Matrix for 3D transformations.
+
+    Constructors accept an optional `out` matrix; when given, the result is
+    written into its buffer and `out` is returned instead of allocating.
+    """
+
+    __slots__ = ("data",)
 
     def __init__(self, data: np.ndarray = None):
         if data is None:
             self.data = np.identity(4, dtype=np.float32)
+        elif isinstance(data, np.ndarray) and data.dtype == np.float32:
+            # Wrap float32 buffers (e.g. store or pool views) without copying
+            self.data = data
         else:
-            self.data = data.astype(np.float32)
+            self.data = np.asarray(data, dtype=np.float32)
+
+    @staticmethod
+    def _target(out: "Matrix4" = None) -> "Matrix4":
+        """Return `out` reset to identity, or a new identity matrix."""
+        if out is None:
+            return Matrix4()
+        out.data[:] = _IDENTITY
+        return out
 
     @staticmethod
-    def identity() -> "Matrix4":
+    def identity(out: "Matrix4" = None) -> "Matrix4":
         """Create identity matrix."""
-        return Matrix4()
+        return Matrix4._target(out)
 
     @staticmethod
-    def translation(x: float, y: float, z: float) -> "Matrix4":
+    def translation(x: float, y: float, z: float, out: "Matrix4" = None) -> "Matrix4":
         """Create translation matrix."""
-        mat = np.identity(4, dtype=np.float32)
+        result = Matrix4._target(out)
+        mat = result.data
         mat[0, 3] = x
         mat[1, 3] = y
         mat[2, 3] = z
-        return Matrix4(mat)
+        return result
 
     @staticmethod
-    def scale(x: float, y: float, z: float) -> "Matrix4":
+    def scale(x: float, y: float, z: float, out: "Matrix4" = None) -> "Matrix4":
         """Create scale matrix."""
-        mat = np.identity(4, dtype=np.float32)
+        result = Matrix4._target(out)
+        mat = result.data
         mat[0, 0] = x
         mat[1, 1] = y
         mat[2, 2] = z
-        return Matrix4(mat)
+        return result
 
     @staticmethod
-    def rotation_x(angle: float) -> "Matrix4":
+    def rotation_x(angle: float, out: "Matrix4" = None) -> "Matrix4":
         """Create rotation matrix around X axis."""
-        c, s = np.cos(angle), np.sin(angle)
-        mat = np.identity(4, dtype=np.float32)
+        c, s = math.cos(angle), math.sin(angle)
+        result = Matrix4._target(out)
+        mat = result.data
         mat[1, 1] = c
         mat[1, 2] = -s
         mat[2, 1] = s
         mat[2, 2] = c
-        return Matrix4(mat)
+        return result
 
     @staticmethod
-    def rotation_y(angle: float) -> "Matrix4":
+    def rotation_y(angle: float, out: "Matrix4" = None) -> "Matrix4":
         """Create rotation matrix around Y axis."""
-        c, s = np.cos(angle), np.sin(angle)
-        mat = np.identity(4, dtype=np.float32)
+        c, s = math.cos(angle), math.sin(angle)
+        result = Matrix4._target(out)
+        mat = result.data
         mat[0, 0] = c
         mat[0, 2] = s
         mat[2, 0] = -s
         mat[2, 2] = c
-        return Matrix4(mat)
+        return result
 
     @staticmethod
-    def rotation_z(angle: float) -> "Matrix4":
+    def rotation_z(angle: float, out: "Matrix4" = None) -> "Matrix4":
         """Create rotation matrix around Z axis."""
-        c, s = np.cos(angle), np.sin(angle)
-        mat = np.identity(4, dtype=np.float32)
+        c, s = math.cos(angle), math.sin(angle)
+        result = Matrix4._target(out)
+        mat = result.data
         mat[0, 0] = c
         mat[0, 1] = -s
         mat[1, 0] = s
         mat[1, 1] = c
-        return Matrix4(mat)
+        return result
 
     @staticmethod
-    def perspective(fov: float, aspect: float, near: float, far: float) -> "Matrix4":
+    def perspective(fov: float, aspect: float, near: float, far: float, out: "Matrix4" = None) -> "Matrix4":
         """Create perspective projection matrix."""
-        f = 1.0 / np.tan(fov / 2.0)
-        mat = np.zeros((4, 4), dtype=np.float32)
+        f = 1.0 / math.tan(fov / 2.0)
+        result = out if out is not None else Matrix4(np.empty((4, 4), dtype=np.float32))
+        mat = result.data
+        mat[:] = 0.0
         mat[0, 0] = f / aspect
         mat[1, 1] = f
         mat[2, 2] = (far + near) / (near - far)
         mat[2, 3] = (2 * far * near) / (near - far)
         mat[3, 2] = -1.0
-        return Matrix4(mat)
+        return result
 
     @staticmethod
-    def orthographic(left: float, right: float, bottom: float, top: float, near: float, far: float) -> "Matrix4":
+    def orthographic(
+        left: float, right: float, bottom: float, top: float, near: float, far: float, out: "Matrix4" = None
+    ) -> "Matrix4":
         """Create orthographic projection matrix."""
-        mat = np.identity(4, dtype=np.float32)
+        result = Matrix4._target(out)
+        mat = result.data
         mat[0, 0] = 2.0 / (right - left)
         mat[1, 1] = 2.0 / (top - bottom)
         mat[2, 2] = -2.0 / (far - near)
         mat[0, 3] = -(right + left) / (right - left)
         mat[1, 3] = -(top + bottom) / (top - bottom)
         mat[2, 3] = -(far + near) / (far - near)
-        return Matrix4(mat)
+        return result
 
     @staticmethod
-    def look_at(eye: Vector3, center: Vector3, up: Vector3) -> "Matrix4":
+    def look_at(eye: Vector3, center: Vector3, up: Vector3, out: "Matrix4" = None) -> "Matrix4":
         """Create look at matrix."""
         f = (center - eye).normalize()
         s = f.cross(up).normalize()
         u = s.cross(f)
 
-        mat = np.identity(4, dtype=np.float32)
+        result = Matrix4._target(out)
+        mat = result.data
         mat[0, 0] = s.x
         mat[1, 0] = s.y
         mat[2, 0] = s.z
@@ -213,11 +460,53 @@ class Matrix4:
         mat[1, 3] = -u.dot(eye)
         mat[2, 3] = f.dot(eye)
 
-        return Matrix4(mat)
+        return result
+
+    @staticmethod
+    def from_quaternion(q: Quaternion, out: "Matrix4" = None) -> "Matrix4":
+        """Create rotation matrix from a quaternion."""
+        result = Matrix4._target(out)
+        result.data[:3, :3] = quaternions_to_matrices(np.array(q.to_tuple(), dtype=np.float32))
+        return result
+
+    @staticmethod
+    def compose(position: Vector3, rotation: Quaternion, scale: Vector3, out: "Matrix4" = None) -> "Matrix4":
+        """Create a T * R * S matrix in a single pass."""
+        result = out if out is not None else Matrix4(np.empty((4, 4), dtype=np.float32))
+        compose_trs(
+            np.array([position.to_tuple()], dtype=np.float32),
+            np.array([rotation.to_tuple()], dtype=np.float32),
+            np.array([scale.to_tuple()], dtype=np.float32),
+            out=result.data[None],
+        )
+        return result
+
+    @staticmethod
+    def multiply(a: "Matrix4", b: "Matrix4", out: "Matrix4" = None) -> "Matrix4":
+        """Compute a * b, writing into `out` when given (may alias a or b)."""
+        if out is None:
+            return Matrix4(np.matmul(a.data, b.data))
+        np.matmul(a.data, b.data, out=out.data)
+        return out
+
+    def copy_from(self, other: "Matrix4") -> "Matrix4":
+        """Copy another matrix into this buffer."""
+        self.data[:] = other.data
+        return self
+
+    def copy(self) -> "Matrix4":
+        """Return an independent copy."""
+        return Matrix4(self.data.copy())
 
     def __mul__(self, other):
         if isinstance(other, Matrix4):
-            return Matrix4(np.dot(self.data, other.data))
+            return Matrix4(np.matmul(self.data, other.data))
+        return NotImplemented
+
+    def __imul__(self, other):
+        if isinstance(other, Matrix4):
+            np.matmul(self.data, other.data, out=self.data)
+            return self
         return NotImplemented
 
     def to_numpy(self) -> np.ndarray:
@@ -226,3 +515,128 @@ class Matrix4:
 
     def __repr__(self) -> str:
         return f"Matrix4:\n{self.data}"
+
+
+class MatrixPool:
+    """Per-frame scratch pool of 4x4 matrices.
+
+    `acquire()` hands out matrices backed by preallocated blocks; `reset()` at the
+    start of a frame recycles all of them. Matrices must not be kept across
+    resets.
+    """
+
+    def __init__(self, block_size: int = 64):
+        self.block_size = block_size
+        self._blocks = [np.empty((block_size, 4, 4), dtype=np.float32)]
+        self._matrices = [Matrix4(m) for m in self._blocks[0]]
+        self._next = 0
+
+    def acquire(self, identity: bool = False) -> Matrix4:
+        """Borrow a scratch matrix until the next reset."""
+        if self._next == len(self._matrices):
+            block = np.empty((self.block_size, 4, 4), dtype=np.float32)
+            self._blocks.append(block)
+            self._matrices.extend(Matrix4(m) for m in block)
+        matrix = self._matrices[self._next]
+        self._next += 1
+        if identity:
+            matrix.data[:] = _IDENTITY
+        return matrix
+
+    def reset(self) -> None:
+        """Recycle every matrix handed out since the last reset."""
+        self._next = 0
+
+    @property
+    def in_use(self) -> int:
+        """Number of matrices handed out since the last reset."""
+        return self._next
+
+
+def quaternions_to_matrices(rotations: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """Convert N (x, y, z, w) quaternions to N 3x3 rotation matrices."""
+    rotations = np.asarray(rotations, dtype=np.float32)
+    if out is None:
+        out = np.empty(rotations.shape[:-1] + (3, 3), dtype=np.float32)
+
+    x, y, z, w = np.moveaxis(rotations, -1, 0)
+    # Scaling by 2 / |q|^2 keeps the result a rotation for unnormalized input
+    norm = x * x + y * y + z * z + w * w
+    s = np.divide(2.0, norm, out=np.zeros_like(norm), where=norm > 0)
+    xs, ys, zs = x * s, y * s, z * s
+    wx, wy, wz = w * xs, w * ys, w * zs
+    xx, xy, xz = x * xs, x * ys, x * zs
+    yy, yz, zz = y * ys, y * zs, z * zs
+
+    out[..., 0, 0] = 1.0 - (yy + zz)
+    out[..., 0, 1] = xy - wz
+    out[..., 0, 2] = xz + wy
+    out[..., 1, 0] = xy + wz
+    out[..., 1, 1] = 1.0 - (xx + zz)
+    out[..., 1, 2] = yz - wx
+    out[..., 2, 0] = xz - wy
+    out[..., 2, 1] = yz + wx
+    out[..., 2, 2] = 1.0 - (xx + yy)
+    return out
+
+
+def normal_matrices(bases: np.ndarray) -> np.ndarray:
+    """Normal matrices of 3x3 bases (..., 3, 3), safe for singular ones.
+
+    Returns the cofactor matrix, which is the inverse-transpose scaled by the
+    determinant, with the sign flipped for mirrored bases. Directions match
+    the inverse-transpose; callers normalize the transformed normals. A
+    zero-scale basis gives finite (possibly zero) normals instead of raising.
+    """
+    bases = np.asarray(bases, dtype=np.float32)
+    a, b, c = bases[..., :, 0], bases[..., :, 1], bases[..., :, 2]
+    cofactor = np.stack((np.cross(b, c), np.cross(c, a), np.cross(a, b)), axis=-1)
+    det = np.einsum("...i,...i->...", a, cofactor[..., :, 0])
+    return np.where(det[..., None, None] < 0, -cofactor, cofactor)
+
+
+def compose_trs(
+    positions: np.ndarray,
+    rotations: np.ndarray,
+    scales: np.ndarray,
+    out: np.ndarray = None,
+    inverse_out: np.ndarray = None,
+    normal_out: np.ndarray = None,
+) -> np.ndarray:
+    """Compose N translation/rotation/scale triples into N 4x4 matrices.
+
+    Writes T * R * S straight into the 4x4 layout without intermediate matrix
+    products. When `inverse_out` (N x 4 x 4) or `normal_out` (N x 3 x 3) are
+    given, the inverse and normal matrices are filled from the same rotation
+    data.
+    """
+    positions = np.asarray(positions, dtype=np.float32)
+    scales = np.asarray(scales, dtype=np.float32)
+    n = len(positions)
+    if out is None:
+        out = np.empty((n, 4, 4), dtype=np.float32)
+
+    rot = quaternions_to_matrices(rotations)
+
+    # Columns of R scaled by S
+    out[:, :3, :3] = rot * scales[:, None, :]
+    out[:, :3, 3] = positions
+    out[:, 3, :3] = 0.0
+    out[:, 3, 3] = 1.0
+
+    if inverse_out is not None or normal_out is not None:
+        inv_scales = np.divide(1.0, scales, out=np.zeros_like(scales), where=scales != 0)
+
+        if inverse_out is not None:
+            # (T R S)^-1 = S^-1 R^T T^-1
+            inv_rs = np.swapaxes(rot, 1, 2) * inv_scales[:, :, None]
+            inverse_out[:, :3, :3] = inv_rs
+            inverse_out[:, :3, 3] = -np.einsum("nij,nj->ni", inv_rs, positions)
+            inverse_out[:, 3, :3] = 0.0
+            inverse_out[:, 3, 3] = 1.0
+
+        if normal_out is not None:
+            # transpose(inverse(R S)) = R S^-1
+            normal_out[:] = rot * inv_scales[:, None, :]
+
+    return out
@@ -0,0 +1,26 @@
+"""Shared pytest setup: make the in-tree `fortini_engine` package importable."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fortini_engine.assets.manager import Mesh  # noqa: E402
+from fortini_engine.core.game_object import GameObject  # noqa: E402
+
+
+@pytest.fixture
+def cube_object():
+    """Factory for a unit cube GameObject at `position` with `scale`."""
+    def make(position=(0.0, 0.0, 0.0), scale=(1.0, 1.0, 1.0), name="Cube", static=False):
+        obj = GameObject(name)
+        obj.mesh = Mesh("Cube")
+        obj.mesh.add_cube(1.0)
+        obj.mesh.calculate_normals()
+        obj.static = static
+        obj.transform.set_position(*position)
+        obj.transform.set_scale(*scale)
+        return obj
+    return make
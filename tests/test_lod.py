@@ -0,0 +1,56 @@
+"""Tests for screen-size LOD selection."""
+
+import numpy as np
+from fortini_engine.assets.manager import Mesh
+from fortini_engine.core.camera import PerspectiveCamera
+from fortini_engine.core.game_object import GameObject
+from fortini_engine.rendering.lod import LODSelector
+
+
+def _setup(distances):
+    mesh = Mesh("Sphere")
+    mesh.add_sphere(1.0)
+    mesh.generate_lods(3)
+    objects = []
+    for distance in distances:
+        obj = GameObject()
+        obj.mesh = mesh
+        obj.transform.set_position(0.0, 0.0, -distance)
+        objects.append(obj)
+    camera = PerspectiveCamera(aspect=1.0)
+    projection = camera.get_projection_matrix().to_numpy()
+    view_projection = projection @ camera.get_view_matrix().to_numpy()
+    matrices = np.array([obj.transform.world_matrix for obj in objects], dtype=np.float32)
+    return mesh, objects, matrices, view_projection, projection[1, 1]
+
+
+def test_farther_objects_get_coarser_levels():
+    mesh, objects, matrices, view_projection, scale = _setup([3.0, 30.0, 300.0])
+    selector = LODSelector()
+    meshes = selector.select(objects, matrices, range(3), view_projection, scale)
+    assert meshes[0] is mesh
+    assert [obj.lod_level for obj in objects] == sorted(obj.lod_level for obj in objects)
+    assert objects[2].lod_level == len(mesh.lods)
+    assert meshes[2] is mesh.lods[-1]
+    assert selector.reduced == sum(1 for obj in objects if obj.lod_level > 0)
+
+
+def test_only_selected_indices_are_updated():
+    mesh, objects, matrices, view_projection, scale = _setup([300.0, 300.0])
+    meshes = LODSelector().select(objects, matrices, [1], view_projection, scale)
+    assert meshes[0] is mesh and objects[0].lod_level == 0
+    assert meshes[1] is mesh.lods[-1]
+
+
+def test_hysteresis_keeps_the_current_level_near_a_threshold():
+    mesh, objects, matrices, view_projection, scale = _setup([10.0])
+    selector = LODSelector(hysteresis=0.5)
+    size = mesh.get_bounds()[2] * scale / 10.0
+    # Put the first threshold just above the object's size: a plain comparison would switch
+    mesh.lod_screen_sizes[0] = size * 1.1
+    objects[0].lod_level = 0
+    selector.select(objects, matrices, [0], view_projection, scale)
+    assert objects[0].lod_level == 0
+    mesh.lod_screen_sizes[0] = size * 2.0
+    selector.select(objects, matrices, [0], view_projection, scale)
+    assert objects[0].lod_level == 1
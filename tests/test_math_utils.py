@@ -0,0 +1,70 @@
+"""Tests for the batched matrix helpers in utils.math_utils."""
+
+import math
+import numpy as np
+from fortini_engine.utils.math_utils import compose_trs, normal_matrices, quaternions_to_matrices
+
+
+def _random_quaternions(rng, count):
+    quaternions = rng.normal(size=(count, 4)).astype(np.float32)
+    return quaternions / np.linalg.norm(quaternions, axis=1, keepdims=True)
+
+
+def test_quaternion_rotates_about_its_axis():
+    half = math.radians(90.0) * 0.5
+    about_z = np.array([0.0, 0.0, math.sin(half), math.cos(half)], dtype=np.float32)
+    rotation = quaternions_to_matrices(about_z)
+    np.testing.assert_allclose(rotation @ (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), atol=1e-6)
+
+
+def test_compose_trs_matches_separate_products():
+    rng = np.random.default_rng(11)
+    positions = rng.uniform(-10.0, 10.0, (16, 3)).astype(np.float32)
+    rotations = _random_quaternions(rng, 16)
+    scales = rng.uniform(0.1, 3.0, (16, 3)).astype(np.float32)
+
+    matrices = compose_trs(positions, rotations, scales)
+    for i in range(16):
+        expected = np.eye(4)
+        expected[:3, :3] = quaternions_to_matrices(rotations[i]) @ np.diag(scales[i])
+        expected[:3, 3] = positions[i]
+        np.testing.assert_allclose(matrices[i], expected, atol=1e-5)
+
+
+def test_compose_trs_inverse_and_normal_matrices():
+    rng = np.random.default_rng(5)
+    positions = rng.uniform(-10.0, 10.0, (16, 3)).astype(np.float32)
+    rotations = _random_quaternions(rng, 16)
+    scales = rng.uniform(0.1, 3.0, (16, 3)).astype(np.float32)
+    inverse = np.empty((16, 4, 4), dtype=np.float32)
+    normal = np.empty((16, 3, 3), dtype=np.float32)
+
+    matrices = compose_trs(positions, rotations, scales, inverse_out=inverse, normal_out=normal)
+    np.testing.assert_allclose(inverse @ matrices, np.broadcast_to(np.eye(4), (16, 4, 4)), atol=1e-4)
+    np.testing.assert_allclose(normal, np.linalg.inv(matrices[:, :3, :3]).transpose(0, 2, 1), rtol=1e-4, atol=1e-4)
+
+
+def test_compose_trs_zero_scale_stays_finite():
+    inverse = np.empty((1, 4, 4), dtype=np.float32)
+    normal = np.empty((1, 3, 3), dtype=np.float32)
+    compose_trs(np.zeros((1, 3)), np.array([[0.0, 0.0, 0.0, 1.0]]), np.array([[0.0, 1.0, 1.0]]),
+                inverse_out=inverse, normal_out=normal)
+    assert np.isfinite(inverse).all() and np.isfinite(normal).all()
+
+
+def test_normal_matrices_follow_the_inverse_transpose():
+    rng = np.random.default_rng(2)
+    bases = rng.normal(size=(16, 3, 3)).astype(np.float32)
+    cofactors = normal_matrices(bases)
+    inverse_transposes = np.linalg.inv(bases).transpose(0, 2, 1)
+    normals = rng.normal(size=(16, 3)).astype(np.float32)
+    a = np.einsum("nij,nj->ni", cofactors, normals)
+    b = np.einsum("nij,nj->ni", inverse_transposes, normals)
+    # Same directions, positive scale
+    np.testing.assert_allclose(a / np.linalg.norm(a, axis=1, keepdims=True),
+                               b / np.linalg.norm(b, axis=1, keepdims=True), atol=1e-4)
+
+
+def test_normal_matrices_of_singular_bases_are_finite():
+    assert np.isfinite(normal_matrices(np.diag([0.0, 1.0, 1.0]))).all()
+    assert np.isfinite(normal_matrices(np.zeros((3, 3)))).all()
@@ -0,0 +1,85 @@
+"""Tests for vertex cache and vertex fetch optimization."""
+
+import numpy as np
+from fortini_engine.assets.manager import Mesh
+from fortini_engine.assets.optimize import (
+    compute_acmr, optimize_vertex_cache, optimize_vertex_fetch, narrow_indices,
+)
+
+
+def _grid(size):
+    """Flat size x size quad grid, triangles in row order."""
+    ys, xs = np.mgrid[0:size, 0:size]
+    vertices = np.stack([xs.ravel(), ys.ravel(), np.zeros(size * size)], axis=1).astype(np.float32)
+    quads = (ys[:-1, :-1] * size + xs[:-1, :-1]).ravel()
+    indices = np.stack([quads, quads + 1, quads + size, quads + 1, quads + size + 1, quads + size], axis=1)
+    return vertices, indices.ravel().astype(np.uint32)
+
+
+def _triangle_set(vertices, indices):
+    """Triangles as sorted tuples of corner positions, independent of order and numbering."""
+    corners = np.round(np.asarray(vertices)[np.asarray(indices, dtype=np.int64).reshape(-1, 3)], 5)
+    return sorted(tuple(sorted(map(tuple, triangle))) for triangle in corners.tolist())
+
+
+def test_acmr_bounds():
+    assert compute_acmr(np.array([0, 1, 2], dtype=np.uint32)) == 3.0
+    # Two triangles sharing an edge shade four vertices
+    assert compute_acmr(np.array([0, 1, 2, 2, 1, 3], dtype=np.uint32)) == 2.0
+    assert compute_acmr(np.array([], dtype=np.uint32)) == 0.0
+
+
+def test_cache_order_keeps_the_triangles_and_lowers_acmr():
+    vertices, indices = _grid(64)
+    optimized = optimize_vertex_cache(indices, len(vertices))
+    assert sorted(map(tuple, np.sort(optimized.reshape(-1, 3), axis=1).tolist())) == \
+        sorted(map(tuple, np.sort(indices.reshape(-1, 3), axis=1).tolist()))
+    assert compute_acmr(optimized) < 0.8 < compute_acmr(indices)
+
+
+def test_cache_order_keeps_winding():
+    vertices, indices = _grid(8)
+    optimized = optimize_vertex_cache(indices, len(vertices))
+    original = {tuple(np.roll(t, -int(np.argmin(t)))) for t in indices.reshape(-1, 3).tolist()}
+    reordered = {tuple(np.roll(t, -int(np.argmin(t)))) for t in optimized.reshape(-1, 3).tolist()}
+    assert original == reordered
+
+
+def test_fetch_order_numbers_vertices_by_first_use():
+    indices = np.array([5, 2, 7, 7, 2, 0], dtype=np.uint32)
+    remapped, order = optimize_vertex_fetch(indices, 8)
+    np.testing.assert_array_equal(remapped, [0, 1, 2, 2, 1, 3])
+    np.testing.assert_array_equal(order[:4], [5, 2, 7, 0])
+    assert sorted(order.tolist()) == list(range(8))
+
+
+def test_narrow_indices():
+    assert narrow_indices(np.arange(6, dtype=np.uint32), 65536).dtype == np.uint16
+    assert narrow_indices(np.arange(6, dtype=np.uint32), 65537).dtype == np.uint32
+
+
+def test_mesh_optimize_keeps_geometry_and_attributes():
+    vertices, indices = _grid(32)
+    mesh = Mesh("Grid")
+    mesh.vertices = vertices
+    mesh.indices = indices
+    mesh.normals = np.tile((0.0, 0.0, 1.0), (len(vertices), 1)).astype(np.float32)
+    mesh.uv_coords = (vertices[:, :2] / 31.0).astype(np.float32)
+    before_triangles = _triangle_set(vertices, indices)
+
+    before, after = mesh.optimize()
+    assert after < before
+    assert mesh.indices.dtype == np.uint16
+    assert _triangle_set(mesh.vertices, mesh.indices) == before_triangles
+    np.testing.assert_allclose(mesh.uv_coords, mesh.vertices[:, :2] / 31.0, atol=1e-6)
+    # Already optimized meshes are left alone
+    indices = mesh.indices
+    assert mesh.optimize() == (after, after)
+    assert mesh.indices is indices
+
+
+def test_generated_sphere_is_optimized():
+    mesh = Mesh("Sphere")
+    mesh.add_sphere(1.0, 64, 32)
+    assert mesh.indices.dtype == np.uint16
+    assert compute_acmr(mesh.indices) < 0.8
@@ -0,0 +1,76 @@
+"""Headless tests for CPU hierarchical-Z occlusion culling."""
+
+import numpy as np
+import pytest
+from fortini_engine.assets.manager import Mesh
+from fortini_engine.core.camera import PerspectiveCamera
+from fortini_engine.core.game_object import GameObject
+from fortini_engine.rendering.occlusion import OcclusionCuller
+
+
+def _matrices(objects):
+    return np.array([obj.transform.world_matrix for obj in objects], dtype=np.float32).reshape(-1, 4, 4)
+
+
+@pytest.fixture
+def view_projection():
+    camera = PerspectiveCamera(aspect=1.0)
+    camera.transform.set_position(0.0, 0.0, 10.0)
+    return camera.get_projection_matrix().to_numpy() @ camera.get_view_matrix().to_numpy()
+
+
+@pytest.fixture
+def wall(cube_object):
+    # 4 x 4 wall facing the camera at the origin
+    return cube_object((0.0, 0.0, 0.0), (4.0, 4.0, 0.2))
+
+
+def _cull(view_projection, occluders, objects):
+    culler = OcclusionCuller(128, 128)
+    return culler.cull(
+        view_projection, occluders, _matrices(occluders), objects, _matrices(objects), range(len(objects)),
+    )
+
+
+def test_wall_hides_boxes_behind_it(view_projection, wall, cube_object):
+    behind = [cube_object((0.0, 0.0, -5.0)), cube_object((1.0, 1.0, -2.0), (0.5, 0.5, 0.5))]
+    assert _cull(view_projection, [wall], behind) == []
+
+
+def test_objects_beside_or_in_front_of_the_wall_stay_visible(view_projection, wall, cube_object):
+    objects = [
+        cube_object((4.5, 0.0, -5.0)),    # beside the wall, behind its plane
+        cube_object((0.0, 0.0, 5.0)),     # in front of the wall
+        cube_object((0.0, 0.0, -5.0)),    # hidden
+        cube_object((2.0, 0.0, -5.0), (1.5, 1.0, 1.0)),  # pokes out past the wall's edge
+    ]
+    assert _cull(view_projection, [wall], objects) == [0, 1, 3]
+
+
+def test_without_occluders_everything_is_visible(view_projection, cube_object):
+    objects = [cube_object((0.0, 0.0, -5.0)), cube_object((3.0, 0.0, 0.0))]
+    assert _cull(view_projection, [], objects) == [0, 1]
+
+
+def test_empty_object_list(view_projection, wall):
+    assert _cull(view_projection, [wall], []) == []
+
+
+def test_occluder_without_geometry_hides_nothing(view_projection, cube_object):
+    empty = GameObject()
+    empty.mesh = Mesh("Empty")
+    objects = [cube_object((0.0, 0.0, -5.0))]
+    assert _cull(view_projection, [empty], objects) == [0]
+
+
+def test_objects_crossing_the_near_plane_are_kept(view_projection, wall, cube_object):
+    around_camera = [cube_object((0.0, 0.0, 10.0))]
+    assert _cull(view_projection, [wall], around_camera) == [0]
+
+
+def test_results_are_deterministic(view_projection, wall, cube_object):
+    rng = np.random.default_rng(7)
+    objects = [cube_object(rng.uniform((-6.0, -6.0, -8.0), (6.0, 6.0, 4.0))) for _ in range(50)]
+    first = _cull(view_projection, [wall], objects)
+    assert first == _cull(view_projection, [wall], objects)
+    assert 0 < len(first) < len(objects)
@@ -0,0 +1,58 @@
+"""Tests for sort-key ordering in the render queue."""
+
+import gc
+from fortini_engine.rendering.render_queue import PASS_OPAQUE, PASS_TRANSPARENT, RenderQueue, SortIdRegistry, is_transparent
+from fortini_engine.assets.manager import Material
+
+
+class _Resource:
+    pass
+
+
+def test_sort_ids_are_stable_and_unique():
+    registry = SortIdRegistry(8)
+    resources = [_Resource() for _ in range(10)]
+    ids = [registry.get(resource) for resource in resources]
+    assert len(set(ids)) == 10 and 0 not in ids
+    assert [registry.get(resource) for resource in resources] == ids
+    assert registry.get(None) == 0
+
+
+def test_sort_ids_of_collected_objects_are_reused():
+    registry = SortIdRegistry(3)
+    resources = [_Resource() for _ in range(6)]
+    ids = [registry.get(resource) for resource in resources]
+    freed = ids[2]
+    del resources[2]
+    gc.collect()
+    assert registry.get(_Resource()) == freed
+
+
+def test_exhausted_sort_ids_never_alias_live_objects():
+    registry = SortIdRegistry(3)
+    resources = [_Resource() for _ in range(10)]
+    ids = [registry.get(resource) for resource in resources]
+    assert len(set(ids[:6])) == 6
+    assert set(ids[6:]) == {registry.mask}
+    assert registry.mask not in ids[:6]
+
+
+def test_opaque_draws_group_by_state_then_transparent_back_to_front():
+    queue = RenderQueue()
+    shader_a, shader_b, material = _Resource(), _Resource(), _Resource()
+    queue.add(PASS_TRANSPARENT, shader_a, material, None, 5.0, "glass near")
+    queue.add(PASS_OPAQUE, shader_b, material, None, 1.0, "b")
+    queue.add(PASS_TRANSPARENT, shader_a, material, None, 50.0, "glass far")
+    queue.add(PASS_OPAQUE, shader_a, material, None, 9.0, "a far")
+    queue.add(PASS_OPAQUE, shader_a, material, None, 2.0, "a near")
+    assert queue.sorted() == ["a near", "a far", "b", "glass far", "glass near"]
+
+
+def test_only_translucent_materials_are_transparent():
+    material = Material()
+    assert not is_transparent(None)
+    assert not is_transparent(material)
+    material.color = [1.0, 0.0, 0.0]
+    assert not is_transparent(material)
+    material.color = [1.0, 0.0, 0.0, 0.5]
+    assert is_transparent(material)
@@ -0,0 +1,72 @@
+"""Tests for quadric-error mesh simplification and generated LODs."""
+
+import numpy as np
+from fortini_engine.assets.manager import Mesh
+from fortini_engine.assets.simplify import simplify
+
+
+def _grid(size):
+    """Flat size x size quad grid in the xy plane."""
+    ys, xs = np.mgrid[0:size, 0:size]
+    vertices = np.stack([xs.ravel(), ys.ravel(), np.zeros(size * size)], axis=1).astype(np.float32)
+    quads = (ys[:-1, :-1] * size + xs[:-1, :-1]).ravel()
+    indices = np.stack([quads, quads + 1, quads + size, quads + 1, quads + size + 1, quads + size], axis=1)
+    return vertices, indices.ravel().astype(np.uint32)
+
+
+def _sphere():
+    mesh = Mesh("Sphere")
+    mesh.add_sphere(1.0, 32, 16)
+    return mesh
+
+
+def test_reaches_the_target_triangle_count():
+    mesh = _sphere()
+    triangles = len(mesh.indices) // 3
+    vertices, indices, _normals, _uvs, error = simplify(mesh.vertices, mesh.indices, triangles // 4)
+    assert len(indices) // 3 <= triangles // 4
+    assert indices.max() < len(vertices)
+    assert error > 0.0
+
+
+def test_stays_close_to_the_surface():
+    mesh = _sphere()
+    vertices, _indices, _normals, _uvs, _error = simplify(mesh.vertices, mesh.indices, len(mesh.indices) // 6)
+    radii = np.linalg.norm(vertices, axis=1)
+    assert np.all(np.abs(radii - 1.0) < 0.1)
+
+
+def test_flat_surface_collapses_without_error_and_keeps_its_border():
+    vertices, indices = _grid(9)
+    simplified, faces, _normals, _uvs, error = simplify(vertices, indices, 2)
+    assert error < 1e-5
+    assert np.allclose(simplified[:, 2], 0.0)
+    np.testing.assert_allclose(simplified.min(axis=0)[:2], (0.0, 0.0))
+    np.testing.assert_allclose(simplified.max(axis=0)[:2], (8.0, 8.0))
+    assert len(faces) // 3 < len(indices) // 3
+
+
+def test_max_error_stops_reduction():
+    mesh = _sphere()
+    _vertices, indices, _normals, _uvs, error = simplify(mesh.vertices, mesh.indices, 4, max_error=0.01)
+    assert error <= 0.01
+    assert len(indices) // 3 > 4
+
+
+def test_attributes_follow_the_kept_vertices():
+    vertices, indices = _grid(5)
+    normals = np.tile((0.0, 0.0, 1.0), (len(vertices), 1)).astype(np.float32)
+    uvs = (vertices[:, :2] / 4.0).astype(np.float32)
+    simplified, _faces, new_normals, new_uvs, _error = simplify(vertices, indices, 8, normals=normals, uvs=uvs)
+    assert len(new_normals) == len(new_uvs) == len(simplified)
+    np.testing.assert_allclose(new_normals, np.tile((0.0, 0.0, 1.0), (len(simplified), 1)), atol=1e-6)
+
+
+def test_generate_lods_reduces_each_level():
+    mesh = _sphere()
+    mesh.generate_lods(3)
+    counts = [len(mesh.indices)] + [len(lod.indices) for lod in mesh.lods]
+    assert len(mesh.lods) >= 1
+    assert all(a > b for a, b in zip(counts, counts[1:]))
+    assert mesh.get_lod(0) is mesh
+    assert mesh.get_lod(99) is mesh.lods[-1]
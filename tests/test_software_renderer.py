@@ -0,0 +1,63 @@
+"""Headless tests for the NumPy software renderer."""
+
+import numpy as np
+import pytest
+from fortini_engine.assets.manager import Material
+from fortini_engine.core.camera import PerspectiveCamera
+from fortini_engine.core.scene import Scene
+from fortini_engine.rendering.software_renderer import SoftwareRenderer
+
+
+@pytest.fixture
+def scene_with_cubes(cube_object):
+    """Factory for a scene with one cube per scale, lined up along x in front of the camera."""
+    def make(*scales):
+        scene = Scene()
+        camera = PerspectiveCamera(aspect=1.0)
+        camera.transform.set_position(0.0, 0.0, 6.0)
+        scene.add_object(camera)
+        for i, scale in enumerate(scales):
+            scene.add_object(cube_object((2.0 * i - 1.0, 0.0, 0.0), scale, name=f"Cube{i}"))
+        return scene, camera
+    return make
+
+
+def test_renders_visible_geometry(scene_with_cubes):
+    scene, camera = scene_with_cubes((1.0, 1.0, 1.0))
+    cube = scene.find_object("Cube0")
+    cube.transform.set_position(0.0, 0.0, 0.0)
+    cube.material = Material("Red")
+    cube.material.color = [1.0, 0.0, 0.0, 1.0]
+    renderer = SoftwareRenderer(64, 64)
+    renderer.render(scene, camera)
+    image = renderer.get_image()
+    assert image.shape == (64, 64, 4)
+    assert renderer.stats.triangles > 0
+
+    clear = (np.array(renderer.clear_color) * 255.0 + 0.5).astype(np.uint8)
+    red, green, blue, _ = image[32, 32].astype(int)
+    assert (image[32, 32] != clear).any()
+    assert red > 100 and green == 0 and blue == 0
+
+
+def test_zero_scale_objects_render_as_nothing(scene_with_cubes):
+    renderer = SoftwareRenderer(64, 64)
+    scene, camera = scene_with_cubes((1.0, 1.0, 1.0))
+    renderer.render(scene, camera)
+    reference = renderer.get_image().copy()
+
+    scene, camera = scene_with_cubes((1.0, 1.0, 1.0), (0.0, 1.0, 1.0))
+    renderer.render(scene, camera)
+    np.testing.assert_array_equal(renderer.get_image(), reference)
+
+
+def test_transparent_objects_blend_every_covered_face(scene_with_cubes):
+    scene, camera = scene_with_cubes((1.0, 1.0, 1.0))
+    cube = scene.find_object("Cube0")
+    cube.transform.set_position(0.0, 0.0, 0.0)
+    cube.material = Material("Smoke")
+    cube.material.color = [0.0, 0.0, 0.0, 0.5]
+    renderer = SoftwareRenderer(64, 64)
+    renderer.render(scene, camera)
+    # Front and back faces each halve the clear color, as GL blending does
+    np.testing.assert_allclose(renderer.color_buffer[32, 32, :3], 0.025, atol=1e-6)
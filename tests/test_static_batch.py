@@ -0,0 +1,39 @@
+"""Tests for static batching of non-moving objects."""
+
+import numpy as np
+from fortini_engine.rendering.static_batch import StaticBatcher
+
+
+def _matrices(objects):
+    return np.array([obj.transform.world_matrix for obj in objects], dtype=np.float32)
+
+
+def test_members_are_baked_into_world_space(cube_object):
+    objects = [cube_object((0.0, 0.0, 0.0), static=True), cube_object((10.0, 0.0, 0.0), static=True)]
+    batches = StaticBatcher().update(objects, _matrices(objects))
+    assert len(batches) == 1
+    mesh = batches[0].mesh
+    assert len(mesh.vertices) == 16 and len(mesh.indices) == 72
+    np.testing.assert_allclose(mesh.vertices[8:].mean(axis=0), (10.0, 0.0, 0.0), atol=1e-6)
+    np.testing.assert_allclose(np.linalg.norm(mesh.normals, axis=1), 1.0, atol=1e-5)
+
+
+def test_moving_a_member_rebakes_only_its_slice(cube_object):
+    objects = [cube_object((0.0, 0.0, 0.0), static=True), cube_object((10.0, 0.0, 0.0), static=True)]
+    batcher = StaticBatcher()
+    batch = batcher.update(objects, _matrices(objects))[0]
+    first = batch.mesh.vertices[:8].copy()
+
+    objects[1].transform.set_position(20.0, 0.0, 0.0)
+    changed = []
+    batcher.update(objects, _matrices(objects), lambda mesh, start, count: changed.append((start, count)))
+    assert changed == [(8, 8)]
+    np.testing.assert_array_equal(batch.mesh.vertices[:8], first)
+    np.testing.assert_allclose(batch.mesh.vertices[8:].mean(axis=0), (20.0, 0.0, 0.0), atol=1e-6)
+
+
+def test_zero_scale_member_does_not_abort_the_batch(cube_object):
+    objects = [cube_object((0.0, 0.0, 0.0), static=True), cube_object((10.0, 0.0, 0.0), (0.0, 1.0, 1.0), static=True)]
+    mesh = StaticBatcher().update(objects, _matrices(objects))[0].mesh
+    assert np.isfinite(mesh.normals).all()
+    np.testing.assert_allclose(np.linalg.norm(mesh.normals[:8], axis=1), 1.0, atol=1e-5)
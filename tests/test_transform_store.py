@@ -0,0 +1,116 @@
+"""Tests for the batched TransformStore and the Transform views over it."""
+
+import numpy as np
+from fortini_engine.core.game_object import GameObject
+from fortini_engine.core.scene import Scene
+from fortini_engine.core.transform import Transform
+from fortini_engine.core.transform_store import TransformStore
+
+
+def _translation(x, y, z):
+    matrix = np.eye(4, dtype=np.float32)
+    matrix[:3, 3] = (x, y, z)
+    return matrix
+
+
+def test_world_matrix_chains_parent_and_child():
+    store = TransformStore()
+    parent = Transform(store=store)
+    child = Transform(parent, store=store)
+    parent.set_position(1.0, 2.0, 3.0)
+    parent.set_scale(2.0, 2.0, 2.0)
+    child.set_position(1.0, 0.0, 0.0)
+
+    np.testing.assert_allclose(child.world_matrix[:3, 3], (3.0, 2.0, 3.0), atol=1e-6)
+    np.testing.assert_allclose(child.world_matrix, parent.world_matrix @ _translation(1.0, 0.0, 0.0), atol=1e-6)
+
+
+def test_inverse_world_matrices_invert_world_matrices():
+    store = TransformStore()
+    rng = np.random.default_rng(3)
+    transforms = [Transform(store=store)]
+    for _ in range(20):
+        transforms.append(Transform(transforms[rng.integers(len(transforms))], store=store))
+    for transform in transforms:
+        transform.set_position(*rng.uniform(-5.0, 5.0, 3))
+        transform.rotate(*rng.uniform(-180.0, 180.0, 3))
+        transform.set_scale(*rng.uniform(0.5, 2.0, 3))
+
+    for transform in transforms:
+        np.testing.assert_allclose(transform.inverse_world_matrix @ transform.world_matrix, np.eye(4), atol=1e-4)
+
+
+def test_moving_a_parent_updates_its_descendants():
+    store = TransformStore()
+    root = Transform(store=store)
+    middle = Transform(root, store=store)
+    leaf = Transform(middle, store=store)
+    leaf.set_position(0.0, 1.0, 0.0)
+    np.testing.assert_allclose(leaf.world_matrix[:3, 3], (0.0, 1.0, 0.0), atol=1e-6)
+
+    root.set_position(5.0, 0.0, 0.0)
+    np.testing.assert_allclose(leaf.world_matrix[:3, 3], (5.0, 1.0, 0.0), atol=1e-6)
+
+
+def test_batched_writes_match_per_transform_setters():
+    store = TransformStore()
+    transforms = [Transform(store=store) for _ in range(8)]
+    offsets = np.arange(24, dtype=np.float32).reshape(8, 3)
+    store.translate([t.index for t in transforms], offsets)
+    for transform, offset in zip(transforms, offsets):
+        np.testing.assert_allclose(transform.world_matrix[:3, 3], offset)
+
+
+def test_freed_slots_are_reused():
+    store = TransformStore()
+    transform = Transform(store=store)
+    index = transform.index
+    del transform
+    assert Transform(store=store).index == index
+
+
+def test_adding_a_child_keeps_it_following_a_parent_outside_the_scene():
+    scene = Scene()
+    parent = GameObject("Parent")
+    child = GameObject("Child")
+    parent.add_child(child)
+    parent.transform.set_position(5.0, 0.0, 0.0)
+    child.transform.set_position(1.0, 0.0, 0.0)
+
+    scene.add_object(child)
+    assert child.transform.parent is parent.transform
+    assert child.transform.store is scene.transforms
+
+    parent.transform.set_position(7.0, 0.0, 0.0)
+    np.testing.assert_allclose(child.transform.world_matrix[:3, 3], (8.0, 0.0, 0.0), atol=1e-6)
+
+
+def test_removing_a_parent_takes_its_subtree_out_of_the_scene():
+    scene = Scene()
+    parent, child, grandchild = GameObject("Parent"), GameObject("Child"), GameObject("Grandchild")
+    scene.add_object(parent)
+    scene.add_object(child, parent=parent)
+    scene.add_object(grandchild, parent=child)
+    parent.transform.set_position(1.0, 2.0, 3.0)
+
+    scene.remove_object(parent)
+    assert scene.objects == []
+    assert all(obj.transform.store is not scene.transforms for obj in (parent, child, grandchild))
+    np.testing.assert_allclose(grandchild.transform.world_matrix[:3, 3], (1.0, 2.0, 3.0), atol=1e-6)
+
+
+def test_component_writes_through_views_mark_the_transform_dirty():
+    store = TransformStore()
+    parent = Transform(store=store)
+    child = Transform(parent, store=store)
+    np.testing.assert_allclose(child.world_matrix, np.eye(4), atol=1e-6)
+
+    parent.position.x = 2.0
+    child.scale.y = 3.0
+    np.testing.assert_allclose(child.world_matrix[:3, 3], (2.0, 0.0, 0.0), atol=1e-6)
+    np.testing.assert_allclose(child.world_matrix[1, 1], 3.0, atol=1e-6)
+
+    rotation = parent.rotation
+    rotation.y, rotation.w = 1.0, 0.0  # half turn about y
+    np.testing.assert_allclose(child.world_matrix[:3, 0], (-1.0, 0.0, 0.0), atol=1e-6)
+    assert parent.position.to_tuple() == (2.0, 0.0, 0.0)